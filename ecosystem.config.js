@@ -1,8 +1,21 @@
 module.exports = {
   apps: [
     {
-      name: "whisper-hotkey",
-      script: "3_HoldtoTalk-Whisper.py",
+      // Mantém um único modelo Whisper para todos os scripts de voz
+      name: "transcription-server",
+      script: "0_transcription_server.py",
+      interpreter: "python",
+      args: "--model base",
+      cwd: "C:/Users/Lofrey/test/scripts_ativos/",
+      watch: false,
+      autorestart: true
+    },
+    {
+      // Launcher F8, Agente F12 e Push-to-Talk F9 em um único processo: um
+      // hook de teclado e uma thread de notificações para todos. Cada plugin
+      // carrega no primeiro uso e reinicia sozinho se falhar
+      name: "hotkey-supervisor",
+      script: "5_supervisor.py",
       interpreter: "python",
       cwd: "C:/Users/Lofrey/test/scripts_ativos/",
       watch: false,
@@ -0,0 +1,27 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "openai-whisper",
+#     "numpy",
+# ]
+# ///
+
+"""
+Servidor de Transcrição Compartilhado
+=====================================
+
+Mantém um único modelo Whisper carregado e atende os scripts de hotkey
+(Agente Pessoal F12, Push-to-Talk F9) via localhost. Deve ser iniciado antes
+deles (ver ecosystem.config.js).
+
+Uso:
+    python 0_transcription_server.py --model base
+    python 0_transcription_server.py --backend whisper-int8 --model small  # int8, mais rápido na CPU
+    python 0_transcription_server.py --model-dir D:/pesos                  # pesos locais (.pt)
+    python 0_transcription_server.py --stub      # sem pesos, para testes
+"""
+
+from hotkey_core.transcription_server import main
+
+if __name__ == "__main__":
+    main()
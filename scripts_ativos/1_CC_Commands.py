@@ -21,14 +21,17 @@ Autor: Automation System
 Versão: 1.2.0
 """
 
+import argparse
+import logging
 import os
+import queue
 import sys
-import subprocess
 import threading
 import time
 
-# Configura UTF-8 para stdout/stderr no Windows
-if sys.platform == 'win32':
+# Configura UTF-8 para stdout/stderr no Windows (só uma vez: o supervisor
+# reimporta o script a cada reinício do plugin)
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
@@ -36,163 +39,376 @@ if sys.platform == 'win32':
 import keyboard
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+import tkinter.font as tkfont
 from pathlib import Path
-from typing import List, Optional
-
-try:
-    from plyer import notification
-    HAS_NOTIFICATION = True
-except ImportError:
-    HAS_NOTIFICATION = False
+from typing import Callable, List, Optional
+
+from hotkey_core import metrics
+from hotkey_core.command_catalog import CommandCatalog
+from hotkey_core.command_preview import CommandPreview, PreviewCache, PreviewLoader
+from hotkey_core.command_search import CommandFilter, FrecencyStore
+from hotkey_core.event_log import DEFAULT_LOG_DIR, log_event, setup_event_log, shutdown_event_log
+from hotkey_core.notifications import NotificationDispatcher, default_sink
+from hotkey_core.process_launcher import ProcessLauncher, Session, claude_argv, default_backend
+from hotkey_core.process_pool import WarmProcessPool
+
+# Raízes de slash commands, da maior para a menor precedência: projeto,
+# usuário e pastas compartilhadas do time (CC_TEAM_COMMANDS_DIR, separadas
+# por os.pathsep). Subpastas viram namespace: frontend/build.md → /frontend:build
+DEFAULT_COMMANDS_DIR = r"C:\Users\Lofrey\test\.claude\commands"
+USER_COMMANDS_DIR = Path.home() / ".claude" / "commands"
+TEAM_COMMANDS_DIRS = [Path(p) for p in os.environ.get("CC_TEAM_COMMANDS_DIR", "").split(os.pathsep) if p]
+
+# Estado persistente do launcher (catálogo de commands salvo entre execuções)
+STATE_DIR = Path.home() / ".cc_command_launcher"
+CATALOG_FILE = STATE_DIR / "catalog.json"
+FRECENCY_FILE = STATE_DIR / "frecency.json"  # Frequência/recência de execução
+CATALOG_WATCH_INTERVAL = 2.0  # Segundos entre verificações do mtime do diretório
+PREVIEW_CACHE_SIZE = 256  # Pré-visualizações mantidas em memória (LRU)
+UI_POLL_MS = 15  # Intervalo com que a thread de UI atende a fila de pedidos
+HOTKEY = 'f8'
+
+# Sessões do Claude Code: onde abrem (CC_TERMINAL: windows, linux, headless ou
+# um emulador como kitty; vazio = o da plataforma) e quantas ao mesmo tempo
+TERMINAL_BACKEND = os.environ.get("CC_TERMINAL") or None
+MAX_CONCURRENT_SESSIONS = 4
+
+# Pool opcional de "claude -p" pré-aquecidos (CC_CLAUDE_POOL = quantos manter
+# prontos; 0 = desligado). Sessões do pool não têm janela: a resposta vai
+# para um log em SESSION_LOG_DIR
+CLAUDE_POOL_SIZE = int(os.environ.get("CC_CLAUDE_POOL", "0"))
+CLAUDE_POOL_IDLE_TTL = 600  # Segundos sem uso até encerrar os processos ociosos
+SESSION_LOG_DIR = STATE_DIR / "sessions"
+
+# Log de eventos (JSON lines, rotacionado); consulta: python -m hotkey_core.event_log commands
+LOG_DIR = DEFAULT_LOG_DIR
+log = logging.getLogger("commands")
+
+# Métricas (ligadas com --stats, --metrics-file ou --metrics-port)
+M_HOTKEY = metrics.counter("launcher_hotkey_total", "F8 pressionado")
+M_SHOW = metrics.histogram("launcher_show_seconds", "F8 até o seletor visível")
+M_EXECUTE = metrics.counter("launcher_execute_total", "Commands executados, por resultado")
+M_SESSAO = metrics.histogram("claude_session_seconds", "Duração das sessões do Claude Code",
+                             buckets=(1, 10, 30, 60, 300, 900, 1800, 3600, 7200))
+
+# Notificações: "plyer" (toast do sistema), "console" ou "none"; vazio = plyer
+# se instalado. Entregues por uma thread própria, nunca na hotkey/UI
+NOTIFICATION_SINK = os.environ.get("CC_NOTIFICATIONS", "")
+NOTIFICATION_MIN_INTERVAL = 1.0  # Segundos entre toasts (mensagens no meio se fundem)
+
+notifier = NotificationDispatcher(
+    default_sink(NOTIFICATION_SINK, app_name="Claude Code"),
+    min_interval=NOTIFICATION_MIN_INTERVAL,
+)
 
 
 def show_notification(title: str, message: str, duration: int = 3):
     """
-    Exibe notificação visual no Windows.
+    Agenda notificação visual (retorna na hora; ver ``NotificationDispatcher``).
 
     Args:
         title: Título da notificação
         message: Mensagem a exibir
         duration: Duração em segundos
     """
-    if HAS_NOTIFICATION:
-        try:
-            notification.notify(
-                title=title,
-                message=message,
-                app_name="Claude Code",
-                timeout=duration
-            )
-        except Exception:
-            pass  # Fallback silencioso se notificação falhar
+    notifier.notify(title, message, duration)
+
+
+class VirtualListbox:
+    """
+    Listbox que só insere as linhas visíveis de uma lista grande.
+
+    A lista completa fica em ``items``; a listbox do Tk recebe apenas a
+    janela ``items[offset:offset + rows]``, e a scrollbar é controlada
+    manualmente a partir do offset.
+    """
+
+    def __init__(self, parent, font=("Consolas", 10), on_change=None, **kwargs):
+        self.on_change = on_change  # Chamado com o item selecionado quando a seleção muda
+        self.last_notified: Optional[str] = None
+        self.items: List[str] = []
+        self.offset = 0
+        self.selected = 0
+        self.rows = 1
+        self._linha = tkfont.Font(font=font).metrics("linespace") + 1
+
+        self.listbox = tk.Listbox(parent, font=font, selectmode=tk.SINGLE,
+                                  exportselection=False, activestyle='dotbox', **kwargs)
+        self.scrollbar = ttk.Scrollbar(parent, command=self._on_scroll)
+
+        self.listbox.bind('<Configure>', self._on_resize)
+        self.listbox.bind('<<ListboxSelect>>', self._on_select)
+        self.listbox.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.listbox.bind('<Button-4>', lambda e: self.scroll(-1))
+        self.listbox.bind('<Button-5>', lambda e: self.scroll(1))
+
+    def set_items(self, items: List[str]) -> None:
+        """Troca a lista inteira e volta ao topo."""
+        self.items = items
+        self.offset = 0
+        self.selected = 0
+        self.render()
+
+    def selected_item(self) -> Optional[str]:
+        if not self.items:
+            return None
+        return self.items[self.selected]
+
+    def index_at(self, y: int) -> int:
+        """Índice absoluto do item na coordenada y da listbox."""
+        return self.offset + self.listbox.nearest(y)
+
+    def move_selection(self, delta: int) -> None:
+        """Move a seleção (setas/PageUp/PageDown) mantendo-a visível."""
+        if not self.items:
+            return
+        self.selected = max(0, min(len(self.items) - 1, self.selected + delta))
+        if self.selected < self.offset:
+            self.offset = self.selected
+        elif self.selected >= self.offset + self.rows:
+            self.offset = self.selected - self.rows + 1
+        self.render()
+
+    def bind_navigation(self, widget) -> None:
+        """Setas e PageUp/PageDown no widget movem a seleção da lista completa."""
+        for tecla, delta in (('<Up>', lambda: -1), ('<Down>', lambda: 1),
+                             ('<Prior>', lambda: -self.rows), ('<Next>', lambda: self.rows)):
+            # "break" impede a navegação padrão da Listbox (que só vê as linhas visíveis)
+            widget.bind(tecla, lambda e, d=delta: (self.move_selection(d()), "break")[1])
+
+    def scroll(self, linhas: int) -> None:
+        maximo = max(0, len(self.items) - self.rows)
+        self.offset = max(0, min(maximo, self.offset + linhas))
+        self.render()
+
+    def render(self) -> None:
+        """Redesenha só as linhas visíveis."""
+        visiveis = self.items[self.offset:self.offset + self.rows]
+        self.listbox.delete(0, tk.END)
+        self._notificar()
+        if visiveis:
+            self.listbox.insert(tk.END, *[f"/{cmd}" for cmd in visiveis])
+        linha = self.selected - self.offset
+        if 0 <= linha < len(visiveis):
+            self.listbox.selection_set(linha)
+            self.listbox.activate(linha)
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _on_scroll(self, acao, valor, unidade=None) -> None:
+        if acao == "moveto":
+            self.offset = int(float(valor) * len(self.items))
+            self.scroll(0)
+        elif acao == "scroll":
+            self.scroll(int(valor) * (self.rows if unidade == "pages" else 1))
+
+    def _on_resize(self, event) -> None:
+        rows = max(1, event.height // self._linha)
+        if rows != self.rows:
+            self.rows = rows
+            self.scroll(0)
+
+    def _on_select(self, event) -> None:
+        selecao = self.listbox.curselection()
+        if selecao:
+            self.selected = self.offset + selecao[0]
+            self._notificar()
+
+    def _notificar(self) -> None:
+        item = self.selected_item()
+        if self.on_change and item != self.last_notified:
+            self.last_notified = item
+            self.on_change(item)
 
 
 class CommandLauncher:
     """Gerenciador principal do launcher de comandos Claude Code."""
 
-    def __init__(self, default_commands_dir: str = r"C:\Users\Lofrey\test\.claude\commands"):
+    def __init__(self, default_commands_dir: str = DEFAULT_COMMANDS_DIR,
+                 extra_roots: Optional[List[Path]] = None):
         self.default_commands_dir = Path(default_commands_dir)
         self.current_commands_dir = self.default_commands_dir
-        self.commands_cache: List[str] = []
+        if extra_roots is None:
+            extra_roots = [USER_COMMANDS_DIR] + TEAM_COMMANDS_DIRS
+        roots = [self.current_commands_dir, *extra_roots]  # O catálogo descarta as repetidas
+        # Catálogo em cache: só varre de novo as raízes cujos diretórios mudaram
+        self.catalog = CommandCatalog(roots, cache_file=CATALOG_FILE)
+        self.commands_cache: List[str] = self.catalog.commands()
         self.ui_window: Optional[tk.Tk] = None
         self.is_ui_open: bool = False
         self.dir_label: Optional[ttk.Label] = None
+        self.command_list: Optional[VirtualListbox] = None
+        self.filter_var: Optional[tk.StringVar] = None
+        self.filter_entry: Optional[ttk.Entry] = None
+        # Filtro fuzzy incremental, ranqueado por frecência das execuções
+        self.frecency = FrecencyStore(FRECENCY_FILE)
+        self.command_filter = CommandFilter(self.commands_cache, self.frecency)
+        # Sessões do Claude Code lançadas em segundo plano (o F8/Enter não espera o processo)
+        self.claude_pool: Optional[WarmProcessPool] = None
+        if CLAUDE_POOL_SIZE > 0:
+            self.claude_pool = WarmProcessPool(
+                claude_argv("-p"), size=CLAUDE_POOL_SIZE, cwd=os.getcwd(),
+                idle_ttl=CLAUDE_POOL_IDLE_TTL, log_dir=SESSION_LOG_DIR,
+            )
+        self.process_launcher = ProcessLauncher(
+            default_backend(TERMINAL_BACKEND),
+            max_concurrent=MAX_CONCURRENT_SESSIONS,
+            on_exit=self.on_session_exit,
+            pool=self.claude_pool,
+        )
+        # Pré-visualização lida em segundo plano (a thread de UI nunca lê arquivos)
+        self.preview_cache = PreviewCache(maxsize=PREVIEW_CACHE_SIZE)
+        self.preview_loader: Optional[PreviewLoader] = None
+        self.preview_text: Optional[tk.Text] = None
+        # Janela única, criada uma vez na thread de UI e só mostrada/escondida.
+        # Outras threads (hotkey) nunca tocam no Tk: enviam pedidos pela fila
+        self.ui_queue: "queue.Queue[tuple]" = queue.Queue()
+        self.ui_thread: Optional[threading.Thread] = None
+        self.ui_ready = threading.Event()
+        self.show_latencies_ms: List[float] = []  # Hotkey → janela visível
 
     def scan_commands_directory(self) -> List[str]:
         """
-        Escaneia diretório de commands e retorna lista de arquivos .md ou .txt.
+        Retorna a lista de commands (.md, .txt ou sem extensão) de todas as raízes.
+
+        Usa o catálogo em cache; um diretório só é listado de novo se mudou.
+        Commands de subpastas vêm com namespace ("frontend:build").
 
         Returns:
             Lista de nomes de arquivos de comando encontrados
         """
-        commands = []
-
-        if not self.current_commands_dir.exists():
-            print(f"⚠ Diretório não encontrado: {self.current_commands_dir}", flush=True)
-            return commands
-
-        # Busca arquivos de comando (.md, .txt, ou sem extensão)
-        try:
-            for file_path in self.current_commands_dir.iterdir():
-                if file_path.is_file() and file_path.suffix in ['.md', '.txt', '']:
-                    commands.append(file_path.stem)  # Nome sem extensão
-        except PermissionError as e:
-            print(f"⚠ Sem permissão para acessar diretório: {e}", flush=True)
-
-        return sorted(commands)
+        return self.catalog.commands()
 
     def execute_command(self, command_name: str) -> None:
         """
-        Executa o Claude Code CLI com o comando selecionado.
+        Abre o Claude Code CLI com o comando selecionado.
+
+        O processo é lançado em segundo plano (sem shell, argv em lista); o
+        fim da sessão é informado por ``on_session_exit``.
 
         Args:
             command_name: Nome do slash command (sem o prefixo /)
         """
-        try:
-            print()
-            print("=" * 60, flush=True)
-            print(f"[EXECUTANDO] Comando: /{command_name}", flush=True)
-            print("=" * 60, flush=True)
-
-            # Notificação visual
-            show_notification(
-                "Claude Code",
-                f"Executando comando: /{command_name}",
-                duration=2
-            )
-
-            # Comando para abrir nova janela do terminal e executar Claude Code
-            # Usa 'claude' com flag --dangerously-skip-permissions para execução direta
-            cmd = f'start "Claude Code - {command_name}" cmd /k claude --dangerously-skip-permissions /{command_name}'
-
-            # Executa no diretório de trabalho atual
-            subprocess.run(
-                cmd,
-                shell=True,
-                cwd=os.getcwd(),
-                check=True
-            )
-
-            print(f"✓ Comando '/{command_name}' enviado ao Claude Code", flush=True)
-            print("=" * 60, flush=True)
-            print()
+        titulo = f"Claude Code - {command_name}"
+        if self.claude_pool:
+            session = self.process_launcher.launch_warm(f"/{command_name}", title=titulo, cwd=os.getcwd())
+        else:
+            session = self.process_launcher.launch(claude_argv(f"/{command_name}"), title=titulo, cwd=os.getcwd())
+        if session is None:
+            M_EXECUTE.inc(result="limite")
+            ativas = len(self.process_launcher.running())
+            log_event(log, "execute_rejected", f"✗ {ativas} sessões do Claude Code já abertas "
+                      f"(limite {MAX_CONCURRENT_SESSIONS})", logging.WARNING, command=command_name)
+            show_notification("Claude Code", "Limite de sessões abertas atingido")
+            return
 
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Erro ao executar comando: {e}", flush=True)
-            show_notification("Erro", f"Falha ao executar comando: {e}")
-        except FileNotFoundError:
-            print("✗ Erro: Claude Code CLI não encontrado. Verifique se está instalado.", flush=True)
-            show_notification("Erro", "Claude Code CLI não encontrado")
-        except Exception as e:
-            print(f"✗ Erro inesperado: {e}", flush=True)
-            show_notification("Erro", f"Erro: {e}")
+        M_EXECUTE.inc(result="pool" if self.claude_pool else "ok")
+        show_notification("Claude Code", f"Executando comando: /{command_name}", duration=2)
+        self.frecency.record(command_name)
+        self.command_filter.refresh_frecency()
+
+        log_event(log, "execute", f"[EXECUTANDO] /{command_name} (sessão #{session.id}, {session.backend})",
+                  command=command_name, session=session.id, backend=session.backend, warm=session.warm)
+
+    def on_session_exit(self, session: Session) -> None:
+        """Chamado na thread da sessão quando o Claude Code termina ou não abre."""
+        if session.status == "failed":
+            M_EXECUTE.inc(result="falhou")
+            log_event(log, "session_failed", f"✗ Erro ao executar comando: {session.error}",
+                      logging.ERROR, session=session.id, title=session.title)
+            show_notification("Erro", f"Falha ao executar comando: {session.error}")
+            return
+        M_SESSAO.observe(session.duration)
+        saida = f" — saída em {session.log_path}" if session.log_path else ""
+        log_event(log, "session_exit", f"[SESSÃO #{session.id}] {session.title} encerrada "
+                  f"(código {session.returncode}, {session.duration:.0f}s){saida}",
+                  session=session.id, pid=session.pid, returncode=session.returncode,
+                  seconds=round(session.duration, 3))
 
     def change_commands_directory(self) -> None:
         """Abre diálogo para selecionar novo diretório de commands."""
         new_dir = filedialog.askdirectory(
             title="Selecione diretório de slash commands",
-            initialdir=str(self.current_commands_dir)
+            initialdir=str(self.current_commands_dir),
+            parent=self.ui_window
         )
 
         if new_dir:
             self.current_commands_dir = Path(new_dir)
-            self.refresh_commands_list()
-            # Atualiza o label do diretório
+            # Atualiza o label do diretório; a lista chega quando a varredura terminar
             if self.dir_label:
-                self.dir_label.config(text=f"Diretório: {self.current_commands_dir}")
-            print(f"✓ Diretório alterado para: {self.current_commands_dir}", flush=True)
+                self.dir_label.config(text=f"Diretório: {self.current_commands_dir} (listando...)")
+            novo = self.current_commands_dir
+            self._scan_in_background(lambda: self.catalog.set_directory(novo))
+            log_event(log, "directory_changed", f"✓ Diretório alterado para: {self.current_commands_dir}",
+                      directory=str(self.current_commands_dir))
+
+    def print_scan_report(self) -> None:
+        """Mostra quantos commands cada raiz tem e o tempo das que foram varridas agora."""
+        for raiz, total, segundos in self.catalog.scan_report():
+            if segundos is None:
+                log_event(log, "scan", f"  • {raiz}: {total} commands (catálogo salvo)",
+                          root=str(raiz), commands=total, cached=True)
+            else:
+                log_event(log, "scan", f"  • {raiz}: {total} commands ({segundos * 1000:.1f}ms)",
+                          root=str(raiz), commands=total, ms=round(segundos * 1000, 1))
 
     def refresh_commands_list(self) -> None:
-        """Atualiza lista de comandos na UI."""
-        self.commands_cache = self.scan_commands_directory()
+        """Atualiza lista de comandos na UI (força nova listagem de todas as raízes)."""
+        self._scan_in_background(lambda: self.catalog.refresh(force=True)[0])
 
-        if hasattr(self, 'command_listbox') and self.command_listbox:
-            self.command_listbox.delete(0, tk.END)
-
-            for cmd in self.commands_cache:
-                self.command_listbox.insert(tk.END, f"/{cmd}")
-
-            if self.commands_cache:
-                self.command_listbox.selection_set(0)
+    def _scan_in_background(self, varrer: Callable[[], List[str]]) -> None:
+        """
+        Varre fora da thread de UI (raízes em rede podem levar segundos) e
+        devolve a lista pela fila de UI.
+        """
+        def rodar():
+            try:
+                commands = varrer()
+            except OSError as e:
+                log_event(log, "scan_failed", f"✗ Erro ao listar commands: {e}", logging.ERROR)
+                return
+            self.print_scan_report()
+            self.ui_queue.put(("commands", commands))
+
+        threading.Thread(target=rodar, name="command-rescan", daemon=True).start()
+
+    def _populate_listbox(self, commands: List[str], force: bool = False) -> None:
+        """Atualiza a lista de commands e reaplica o filtro digitado."""
+        if force or commands != self.commands_cache:
+            self.command_filter.set_commands(commands)
+        self.commands_cache = commands
+        self.apply_filter()
+
+    def apply_filter(self, *args) -> None:
+        """Filtra a lista pelo texto digitado (chamado a cada tecla)."""
+        if not self.command_list:
+            return
+        consulta = self.filter_var.get() if self.filter_var else ""
+        with metrics.span("launcher_filter"):
+            self.command_list.set_items(self.command_filter.filter(consulta))
 
     def on_double_click(self, event) -> None:
         """Manuseia duplo clique na lista de comandos."""
+        if self.command_list:
+            self.command_list.selected = self.command_list.index_at(event.y)
         self.on_execute_command()
 
     def on_execute_command(self) -> None:
         """Executa comando selecionado e fecha UI."""
-        if not hasattr(self, 'command_listbox') or not self.command_listbox:
+        if not self.command_list:
             return
 
-        selection = self.command_listbox.curselection()
+        command_name = self.command_list.selected_item()
 
-        if not selection:
-            messagebox.showwarning("Aviso", "Selecione um comando primeiro.")
+        if not command_name:
+            messagebox.showwarning("Aviso", "Nenhum comando corresponde ao filtro.", parent=self.ui_window)
             return
 
-        index = selection[0]  # curselection retorna uma tupla, pegamos o primeiro elemento
-        command_name = self.commands_cache[index]
-
         # Fecha UI antes de executar
         self.close_ui()
 
@@ -200,54 +416,180 @@ class CommandLauncher:
         self.execute_command(command_name)
 
     def close_ui(self) -> None:
-        """Fecha a janela UI de forma segura."""
-        if self.ui_window:
+        """Esconde a janela (ela continua viva para o próximo F8). Roda na thread de UI."""
+        if not self.is_ui_open or not self.ui_window:
+            return
+
+        self.ui_window.withdraw()
+        self.is_ui_open = False
+        log_event(log, "ui_closed", "[UI FECHADA] Aguardando próximo trigger (F8)...")
+
+        # Notificação de fechamento
+        show_notification(
+            "Claude Code",
+            "Seletor fechado. Pressione F8 para reabrir.",
+            duration=2
+        )
+
+    # ---------- thread de UI ----------
+
+    def start_ui_thread(self, timeout: float = 10.0) -> None:
+        """Cria a thread de UI com a janela escondida e espera ela ficar pronta."""
+        if self.ui_thread and self.ui_thread.is_alive():
+            return
+        self.ui_ready.clear()
+        self.ui_thread = threading.Thread(target=self._ui_main, name="launcher-ui", daemon=True)
+        self.ui_thread.start()
+        self.ui_ready.wait(timeout)
+
+    def show_ui(self) -> None:
+        """Pede para mostrar o seletor (seguro a partir de qualquer thread)."""
+        if not self.ui_thread or not self.ui_thread.is_alive():
+            self.start_ui_thread()
+        self.ui_queue.put(("show", time.perf_counter()))
+
+    def hide_ui(self) -> None:
+        """Pede para esconder o seletor (seguro a partir de qualquer thread)."""
+        self.ui_queue.put(("hide", None))
+
+    def stop_ui(self) -> None:
+        """Encerra a thread de UI."""
+        if self.ui_thread and self.ui_thread.is_alive():
+            self.ui_queue.put(("quit", None))
+            self.ui_thread.join(timeout=5)
+
+    def _ui_main(self) -> None:
+        """Corpo da thread de UI: cria a janela uma vez e roda o mainloop."""
+        self.preview_loader = PreviewLoader(
+            self.preview_cache,
+            lambda path, preview: self.ui_queue.put(("preview", (path, preview)))
+        )
+        try:
+            self._build_ui()
+        except tk.TclError as e:
+            # Sem display (ex.: sessão remota): o resto do launcher continua de pé
+            print(f"Aviso: interface indisponível: {e}", flush=True)
+            self.preview_loader.close()
+            self.ui_ready.set()
+            return
+        self.ui_ready.set()
+        self.ui_window.after(UI_POLL_MS, self._process_ui_queue)
+        self.ui_window.mainloop()
+        self.ui_window = None
+        self.is_ui_open = False
+
+    def _process_ui_queue(self) -> None:
+        """Atende os pedidos das outras threads (roda na thread de UI)."""
+        while True:
             try:
+                acao, dado = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            if acao == "show":
+                self._show(dado)
+            elif acao == "hide":
+                self.close_ui()
+            elif acao == "preview":
+                self._render_preview(*dado)
+            elif acao == "commands":
+                self._populate_listbox(dado, force=True)
+                if self.dir_label:
+                    self.dir_label.config(text=f"Diretório: {self.current_commands_dir}")
+            elif acao == "quit":
+                self.preview_loader.close()
                 self.ui_window.destroy()
-            except tk.TclError:
-                pass
-            finally:
-                self.ui_window = None
-                self.is_ui_open = False
-                print()
-                print("[UI FECHADA] Aguardando próximo trigger (F8)...", flush=True)
-                print("-" * 60, flush=True)
-
-                # Notificação de fechamento
-                show_notification(
-                    "Claude Code",
-                    "Seletor fechado. Pressione F8 para reabrir.",
-                    duration=2
-                )
+                return
+        self.ui_window.after(UI_POLL_MS, self._process_ui_queue)
+
+    def on_selection_changed(self, command_name: Optional[str]) -> None:
+        """Pede a pré-visualização do command selecionado (roda na thread de UI)."""
+        entrada = self.catalog.get(command_name) if command_name else None
+        if entrada is None:
+            self._set_preview_text("")
+            return
+        # Mostra na hora o que já está em memória; o loader confirma pelo mtime
+        conhecido = self.preview_cache.peek(entrada.path)
+        if conhecido is not None:
+            self._render_preview(entrada.path, conhecido)
+        else:
+            self._set_preview_text(f"/{command_name}\n\nCarregando...")
+        self.preview_loader.request(entrada.path)
+
+    def _render_preview(self, path: str, preview: CommandPreview) -> None:
+        """Desenha a pré-visualização se ela ainda é do command selecionado."""
+        entrada = self.catalog.get(self.command_list.selected_item() or "")
+        if entrada is None or entrada.path != path:
+            return  # Seleção mudou enquanto o arquivo era lido
+
+        if preview.error:
+            self._set_preview_text(f"/{entrada.name}\n\n⚠ {preview.error}")
+            return
 
-    def show_ui(self) -> None:
-        """Exibe interface UI de seleção de comandos."""
-        # Evita abrir múltiplas janelas
+        partes = [f"/{entrada.name}", f"{entrada.root}", ""]
+        if preview.description:
+            partes += [preview.description, ""]
+        extras = [f"{k}: {v}" for k, v in preview.frontmatter.items() if k != "description"]
+        if extras:
+            partes += extras + [""]
+        partes += preview.lines
+        if preview.truncated:
+            partes.append("…")
+        self._set_preview_text("\n".join(partes), destaque=bool(preview.description))
+
+    def _set_preview_text(self, texto: str, destaque: bool = False) -> None:
+        if not self.preview_text:
+            return
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.delete("1.0", tk.END)
+        self.preview_text.insert("1.0", texto)
+        self.preview_text.tag_add("titulo", "1.0", "1.end")
+        self.preview_text.tag_add("raiz", "2.0", "2.end")
+        if destaque:
+            self.preview_text.tag_add("descricao", "4.0", "4.end")
+        self.preview_text.config(state=tk.DISABLED)
+
+    def _show(self, requested_at: float) -> None:
+        """Mostra a janela já construída com a lista atual de commands."""
         if self.is_ui_open:
-            if self.ui_window:
-                try:
-                    self.ui_window.lift()
-                    self.ui_window.focus_force()
-                except tk.TclError:
-                    self.is_ui_open = False
+            # Já visível: só traz para frente
+            self.ui_window.lift()
+            self.ui_window.focus_force()
             return
 
         self.is_ui_open = True
-
-        # Atualiza cache de comandos
-        self.commands_cache = self.scan_commands_directory()
-
+        # Campo de filtro limpo a cada abertura (a lista volta ao ranking de frecência)
+        self.command_list.last_notified = None  # Revalida a pré-visualização pelo mtime
+        self.filter_var.set("")
+        self._populate_listbox(self.scan_commands_directory())
+
+        self.ui_window.deiconify()
+        self.ui_window.lift()
+        self.ui_window.attributes('-topmost', True)
+        self.ui_window.attributes('-topmost', False)
+        self.ui_window.focus_force()
+        self.filter_entry.focus_set()
+        self.ui_window.update_idletasks()
+
+        latencia = (time.perf_counter() - requested_at) * 1000
+        self.show_latencies_ms.append(latencia)
+        M_SHOW.observe(latencia / 1000)
+        log_event(log, "ui_shown", f"[UI] Seletor visível em {latencia:.1f}ms", ms=round(latencia, 1))
+
+    def _build_ui(self) -> None:
+        """Cria a janela e todos os widgets (uma única vez, escondida)."""
         # Cria janela principal
         self.ui_window = tk.Tk()
+        self.ui_window.withdraw()
         self.ui_window.title("Claude Code - Command Launcher")
-        self.ui_window.geometry("500x400")
+        self.ui_window.geometry("820x440")
         self.ui_window.resizable(True, True)
 
-        # Callback para quando janela é fechada
+        # Fechar a janela só a esconde
         self.ui_window.protocol("WM_DELETE_WINDOW", self.close_ui)
 
         # Centraliza janela na tela
         self.ui_window.eval('tk::PlaceWindow . center')
+        self.ui_window.withdraw()  # PlaceWindow mostra a janela
 
         # Frame principal
         main_frame = ttk.Frame(self.ui_window, padding="10")
@@ -257,7 +599,7 @@ class CommandLauncher:
         self.ui_window.columnconfigure(0, weight=1)
         self.ui_window.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
-        main_frame.rowconfigure(2, weight=1)  # Row da lista expande
+        main_frame.rowconfigure(3, weight=1)  # Row da lista expande
 
         # Título (row 0)
         title_label = ttk.Label(
@@ -276,42 +618,49 @@ class CommandLauncher:
         )
         self.dir_label.grid(row=1, column=0, pady=(0, 10), sticky=tk.W)
 
-        # Lista de comandos (row 2)
+        # Filtro fuzzy (row 2): estreita a lista a cada tecla
+        self.filter_var = tk.StringVar()
+        self.filter_entry = ttk.Entry(main_frame, textvariable=self.filter_var, font=("Consolas", 11))
+        self.filter_entry.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 6))
+        self.filter_var.trace_add("write", self.apply_filter)
+
+        # Lista de comandos (row 3), virtualizada
         list_frame = ttk.Frame(main_frame)
-        list_frame.grid(row=2, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
+        list_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         list_frame.columnconfigure(0, weight=1)
         list_frame.rowconfigure(0, weight=1)
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.command_list = VirtualListbox(list_frame, on_change=self.on_selection_changed)
+        self.command_list.listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.command_list.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
 
-        # Listbox
-        self.command_listbox = tk.Listbox(
+        # Painel de pré-visualização à direita da lista
+        list_frame.columnconfigure(2, weight=1)
+        self.preview_text = tk.Text(
             list_frame,
-            font=("Consolas", 10),
-            yscrollcommand=scrollbar.set,
-            selectmode=tk.SINGLE,
-            activestyle='dotbox'
+            font=("Consolas", 9),
+            wrap=tk.WORD,
+            width=48,
+            state=tk.DISABLED,
+            relief=tk.FLAT,
+            background="#f7f7f7",
+            padx=8,
+            pady=6
         )
-        self.command_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.config(command=self.command_listbox.yview)
-
-        # Popula lista
-        for cmd in self.commands_cache:
-            self.command_listbox.insert(tk.END, f"/{cmd}")
+        self.preview_text.grid(row=0, column=2, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(10, 0))
+        self.preview_text.tag_configure("titulo", font=("Consolas", 10, "bold"))
+        self.preview_text.tag_configure("raiz", foreground="gray")
+        self.preview_text.tag_configure("descricao", font=("Segoe UI", 9, "italic"))
 
-        # Seleciona primeiro item
-        if self.commands_cache:
-            self.command_listbox.selection_set(0)
-            self.command_listbox.focus_set()
+        # Popula lista (forçado: a lista acabou de ser criada)
+        self._populate_listbox(self.commands_cache, force=True)
 
         # Evento de duplo clique
-        self.command_listbox.bind('<Double-Button-1>', self.on_double_click)
+        self.command_list.listbox.bind('<Double-Button-1>', self.on_double_click)
 
         # Frame de botões (row 3)
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=3, column=0, pady=(0, 10))
+        button_frame.grid(row=4, column=0, pady=(0, 10))
 
         # Botão mudar diretório
         change_dir_btn = ttk.Button(
@@ -337,31 +686,75 @@ class CommandLauncher:
         )
         execute_btn.grid(row=0, column=2)
 
-        # Label de instruções (row 4)
+        # Label de instruções (row 5)
         info_label = ttk.Label(
             main_frame,
-            text="Pressione ENTER ou duplo clique para executar • ESC para cancelar",
+            text="Digite para filtrar • ↑↓ para navegar • ENTER executa • ESC cancela",
             font=("Segoe UI", 8),
             foreground="gray"
         )
-        info_label.grid(row=4, column=0, pady=(5, 0))
+        info_label.grid(row=5, column=0, pady=(5, 0))
 
         # Bind de teclas
         self.ui_window.bind('<Return>', lambda e: self.on_execute_command())
         self.ui_window.bind('<Escape>', lambda e: self.close_ui())
+        self.command_list.bind_navigation(self.filter_entry)
+        self.command_list.bind_navigation(self.command_list.listbox)
 
-        # Foco na listbox
-        self.command_listbox.focus_set()
 
-        # Loop principal da UI
-        self.ui_window.mainloop()
+def iniciar_launcher() -> CommandLauncher:
+    """Cria o launcher, indexa os commands e deixa a janela pronta (escondida)."""
+    launcher = CommandLauncher()
+    # O construtor já validou o catálogo salvo pelos mtimes: só as raízes
+    # que mudaram foram varridas, e só elas têm tempo no relatório
+    print(f"✓ {len(launcher.commands_cache)} commands em {len(launcher.catalog.roots)} raízes:", flush=True)
+    launcher.print_scan_report()
+    launcher.catalog.start_watcher(CATALOG_WATCH_INTERVAL)
+    launcher.start_ui_thread()  # Janela criada agora, escondida até o F8
+    if launcher.claude_pool:
+        launcher.claude_pool.start()
+        print(f"✓ {CLAUDE_POOL_SIZE} sessões do Claude Code pré-aquecidas em {os.getcwd()}", flush=True)
+    return launcher
+
+
+def encerrar_launcher(launcher: CommandLauncher) -> None:
+    """Para o watcher, a janela e o pool (sessões abertas continuam rodando)."""
+    launcher.catalog.stop_watcher()
+    launcher.stop_ui()
+    launcher.frecency.close()  # Grava as execuções ainda pendentes
+    if launcher.claude_pool:
+        launcher.claude_pool.close()
+
+
+def criar_callback_hotkey(launcher: CommandLauncher):
+    """Callback do F8 (executa na thread do hook: só enfileira, nunca bloqueia)."""
+    def on_f8_pressed():
+        """Callback executado quando F8 é pressionado."""
+        # Só enfileira o pedido: quem mexe no Tk é a thread de UI
+        launcher.show_ui()
+        M_HOTKEY.inc()
+        log_event(log, "hotkey", "[ATIVADO] Abrindo seletor de comandos...")
 
-        # Garante que o estado seja resetado após fechar
-        self.is_ui_open = False
+        # Notificação visual
+        show_notification(
+            "Claude Code",
+            "Seletor de comandos aberto!",
+            duration=2
+        )
 
+    return on_f8_pressed
 
-def main():
+
+def main(argv=None):
     """Função principal - inicia o sistema de hotkey."""
+    parser = argparse.ArgumentParser(description="Launcher de slash commands do Claude Code (F8)")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics.configure(args)
+
+    # Eventos vão para o console e para LOG_DIR/commands.jsonl, escritos por
+    # uma thread própria (a hotkey e a UI só enfileiram)
+    setup_event_log("commands", LOG_DIR, console=True)
     print("=" * 60, flush=True)
     print("Claude Code Command Launcher - Hotkey F8", flush=True)
     print("=" * 60, flush=True)
@@ -383,30 +776,10 @@ def main():
     )
 
     # Inicia launcher
-    launcher = CommandLauncher()
-
-    # Callback do hotkey (executa em thread separada para não bloquear)
-    def on_f8_pressed():
-        """Callback executado quando F8 é pressionado."""
-        print()
-        print("=" * 60, flush=True)
-        print("[ATIVADO] Abrindo seletor de comandos...", flush=True)
-        print("=" * 60, flush=True)
-
-        # Notificação visual
-        show_notification(
-            "Claude Code",
-            "Seletor de comandos aberto!",
-            duration=2
-        )
-
-        # Tkinter deve rodar na thread principal, então agendamos via after
-        # Mas como keyboard roda em thread separada, usamos threading
-        ui_thread = threading.Thread(target=launcher.show_ui, daemon=True)
-        ui_thread.start()
+    launcher = iniciar_launcher()
 
-    # Registra hotkey global
-    keyboard.add_hotkey('f8', on_f8_pressed, suppress=False)
+    # Registra hotkey global (callback executa em thread separada para não bloquear)
+    keyboard.add_hotkey(HOTKEY, criar_callback_hotkey(launcher), suppress=False)
 
     print()
     print("Aguardando trigger (F8)...", flush=True)
@@ -418,8 +791,40 @@ def main():
     except KeyboardInterrupt:
         print("\n✓ Script encerrado pelo usuário", flush=True)
         keyboard.unhook_all()
+        encerrar_launcher(launcher)
+        notifier.close()
+        shutdown_event_log()
+        metrics.finish(args)
+        if launcher.show_latencies_ms:
+            tempos = sorted(launcher.show_latencies_ms)
+            print(f"✓ F8 → janela visível: mediana {tempos[len(tempos) // 2]:.1f}ms "
+                  f"em {len(tempos)} aberturas", flush=True)
         sys.exit(0)
 
 
+def plugin_main(ctx) -> None:
+    """
+    Roda o launcher como plugin do supervisor (``5_supervisor.py``).
+
+    O F8 vem do hub de teclado compartilhado e as notificações vão para o
+    dispatcher do supervisor; métricas e fechamento dos logs ficam com ele.
+    """
+    global notifier
+    notifier.close()
+    notifier = ctx.notifier
+
+    setup_event_log("commands", LOG_DIR, console=True)
+    launcher = iniciar_launcher()
+    on_f8_pressed = criar_callback_hotkey(launcher)
+    ctx.keys.subscribe(HOTKEY, on_f8_pressed, lambda: None)
+    ctx.mark_ready()
+    if ctx.started_by_hotkey:
+        on_f8_pressed()  # O F8 que carregou o plugin também abre o seletor
+    try:
+        ctx.stopping.wait()
+    finally:
+        encerrar_launcher(launcher)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
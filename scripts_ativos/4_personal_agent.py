@@ -18,20 +18,79 @@ Funcionalidades:
 - Integração com Claude Code com contexto automático
 """
 
-import keyboard
+import time
+
+STARTED_AT = time.perf_counter()  # Referência para medir o tempo de startup
+
 import sounddevice as sd
-import whisper
 import numpy as np
-import subprocess
-import os
+import argparse
 import json
+import os
 from pathlib import Path
 from datetime import datetime
 
+from hotkey_core import metrics
+from hotkey_core.audio_capture import AudioBufferPool
+from hotkey_core.event_log import log_event, setup_event_log
+from hotkey_core.intent_router import IntentRouter, normalize_command
+from hotkey_core.key_state import KeyWatcher
+from hotkey_core.model_loader import BackgroundModelLoader
+from hotkey_core.name_resolver import ProjectNameResolver
+from hotkey_core.note_search import NoteSearchIndex
+from hotkey_core.pipeline import Pipeline, Utterance
+from hotkey_core.process_launcher import ProcessLauncher, claude_argv, default_backend
+from hotkey_core.process_pool import WarmProcessPool
+from hotkey_core.project_index import ProjectIndex
+from hotkey_core.project_store import append_text
+from hotkey_core.streaming import StreamingTranscriber
+from hotkey_core.transcriber import DEFAULT_BACKEND, DEFAULT_MODEL, DEFAULT_MODEL_DIR, load_transcriber
+from hotkey_core.transcription_server import TranscriptionClient
+from hotkey_core.vad import trim_silence
+
 # ==================== CONFIGURAÇÃO ====================
 HOTKEY = 'f12'
-MODEL_TYPE = 'base'
+# Transcrição local: backend (whisper, whisper-int8 = quantizado, mais rápido
+# na CPU, ou stub) e tamanho do modelo; padrões de HOTKEY_TRANSCRIBER e
+# HOTKEY_WHISPER_MODEL. Pesos lidos de MODEL_DIR, sem download
+TRANSCRIBER_BACKEND = DEFAULT_BACKEND
+MODEL_TYPE = DEFAULT_MODEL
+MODEL_DIR = DEFAULT_MODEL_DIR
 SAMPLE_RATE = 16000
+MAX_RECORDING_SECONDS = 120  # Encerra a gravação se a tecla ficar presa
+
+# Streaming: transcreve janelas sobrepostas enquanto a tecla está pressionada
+STREAMING = True
+STREAM_WINDOW_SECONDS = 5.0
+STREAM_OVERLAP_SECONDS = 1.0
+
+# Corta silêncio antes do Whisper e ignora gravações sem fala
+VAD = True
+
+# Servidor de transcrição compartilhado (0_transcription_server.py); se não
+# estiver no ar, o modelo é carregado localmente
+USE_TRANSCRIPTION_SERVER = True
+TRANSCRIPTION_HOST = "127.0.0.1"
+TRANSCRIPTION_PORT = 8765
+
+# Nomes de projeto falados: acima da confiança automática o nome é corrigido
+# direto; entre a mínima e a automática o agente pede confirmação ("sim")
+NOME_CONFIANCA_AUTOMATICA = 0.85
+NOME_CONFIANCA_MINIMA = 0.5
+
+# Pipeline: falas gravadas enquanto outra é transcrita aguardam na fila
+PIPELINE_MAX_PENDING = 3
+
+# Sessões do Claude Code: onde abrem (CC_TERMINAL: windows, linux, headless ou
+# um emulador como kitty; vazio = o da plataforma) e quantas ao mesmo tempo
+TERMINAL_BACKEND = os.environ.get("CC_TERMINAL") or None
+MAX_CONCURRENT_SESSIONS = 4
+
+# Pool opcional de "claude -p" pré-aquecidos (CC_CLAUDE_POOL = quantos manter
+# prontos; 0 = desligado). Sessões do pool não têm janela: a resposta vai
+# para um log em SESSION_LOG_DIR
+CLAUDE_POOL_SIZE = int(os.environ.get("CC_CLAUDE_POOL", "0"))
+CLAUDE_POOL_IDLE_TTL = 600  # Segundos sem uso até encerrar os processos ociosos
 
 # Diretórios
 BASE_DIR = Path.home() / "Agente_Pessoal"
@@ -39,77 +98,196 @@ PROJETOS_DIR = BASE_DIR / "projetos"
 MEMORY_DIR = BASE_DIR / ".claude" / "memory"
 AGENT_MEMORY_DIR = MEMORY_DIR / "agent_memory"
 PROJECTS_METADATA_DIR = MEMORY_DIR / "projects"
+INTENTS_FILE = BASE_DIR / "intents.json"  # Comandos de voz extras (opcional)
+SESSION_LOG_DIR = BASE_DIR / "sessoes"  # Respostas das sessões do pool do Claude
 
 # Criar estrutura de diretórios
 for dir_path in [PROJETOS_DIR, AGENT_MEMORY_DIR, PROJECTS_METADATA_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
+
+# Histórico de ações do agente: JSON lines rotacionado e comprimido
+# (consulta: python -m hotkey_core.event_log agent_log --dir <AGENT_MEMORY_DIR>)
+agent_log = setup_event_log("agent_log", AGENT_MEMORY_DIR)
+# Índice SQLite com metadados e histórico de ações de todos os projetos
+project_index = ProjectIndex(MEMORY_DIR / "projects.db")
+# Índice full-text das notas (FTS5 no mesmo banco), atualizado a cada nota
+note_search = NoteSearchIndex(MEMORY_DIR / "projects.db")
+# Índice de trigramas/fonético para corrigir nomes de projeto mal transcritos
+name_resolver = ProjectNameResolver()
 # =====================================================
 
-print(f"Carregando IA Whisper (modelo {MODEL_TYPE})...")
-model = whisper.load_model(MODEL_TYPE)
-print(f"\n>>> SISTEMA PRONTO!")
-print(f">>> Segure [{HOTKEY.upper()}] para falar com o Agente Pessoal")
+# Métricas (ligadas com --stats, --metrics-file ou --metrics-port)
+M_GRAVACAO = metrics.histogram("voice_recording_seconds", "Duração do áudio gravado")
+M_SOLTAR_TEXTO = metrics.histogram("voice_release_to_text_seconds", "Soltar a tecla até o texto pronto")
+M_TOTAL = metrics.histogram("voice_release_to_dispatch_seconds", "Soltar a tecla até o comando executado")
+M_COMANDOS = metrics.counter("voice_commands_total", "Comandos despachados por intenção")
+M_DESCARTES = metrics.counter("voice_dropped_total", "Falas descartadas, por motivo")
+
+# Buffers de captura: um fica alocado; cada fala pendente a mais ocupa outro,
+# criado só enquanto o pipeline está atrasado
+buffer_pool = AudioBufferPool(PIPELINE_MAX_PENDING + 1, MAX_RECORDING_SECONDS, SAMPLE_RATE)
+
+def carregar_modelo():
+    """Carrega o backend de transcrição configurado (executado em background)."""
+    return load_transcriber(TRANSCRIBER_BACKEND, MODEL_TYPE, MODEL_DIR)
+
+def aquecer_modelo(modelo):
+    """Decodifica um segundo de silêncio para aquecer o modelo."""
+    modelo.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="pt")
+
+# Backend de transcrição, definido por iniciar_modelo() no startup
+model = None
+
+def modelo_local():
+    """Começa a carregar o modelo local em background (sem servidor ou se ele cair)."""
+    print(f"Carregando IA Whisper (modelo {MODEL_TYPE}, {TRANSCRIBER_BACKEND}) em background...")
+    return BackgroundModelLoader(carregar_modelo, aquecer_modelo, started_at=STARTED_AT)
+
+def iniciar_modelo():
+    """Conecta ao servidor de transcrição ou carrega o modelo local em background."""
+    global model
+
+    if USE_TRANSCRIPTION_SERVER:
+        # Se o servidor cair depois, o cliente passa a usar o modelo local
+        cliente = TranscriptionClient(TRANSCRIPTION_HOST, TRANSCRIPTION_PORT, fallback=modelo_local)
+        if cliente.ping():
+            print(f"Usando servidor de transcrição em {TRANSCRIPTION_HOST}:{TRANSCRIPTION_PORT}")
+            model = cliente
+            return
+        print("Aviso: servidor de transcrição não encontrado, carregando modelo local.")
+
+    # O modelo carrega em background; gravações feitas antes disso aguardam na fila
+    model = modelo_local()
 
 # ==================== SISTEMA DE PROJETOS ====================
 
-def criar_projeto(nome_projeto):
+# Ação aguardando "sim"/"não" do usuário: (pergunta, função que executa a ação)
+confirmacao_pendente = None
+RESPOSTAS_SIM = {"sim", "confirmar", "confirmo", "isso", "pode"}
+RESPOSTAS_NAO = {"não", "nao", "cancelar", "cancela"}
+
+def pedir_confirmacao(pergunta, acao):
+    """Guarda uma ação para ser executada se o próximo comando for 'sim'."""
+    global confirmacao_pendente
+    confirmacao_pendente = (pergunta, acao)
+
+def carregar_nomes_projetos():
+    """Popula o índice de nomes com os projetos existentes."""
+    for nome in project_index.list_projects():
+        name_resolver.add(nome)
+
+def resolver_nome_projeto(nome_falado, ao_confirmar):
+    """
+    Resolve um nome de projeto falado para um projeto existente.
+
+    Args:
+        nome_falado: Nome como saiu da transcrição
+        ao_confirmar: Função chamada com o nome sugerido se o usuário confirmar
+
+    Returns:
+        (nome, None) se resolvido, ou (None, mensagem para o usuário)
+    """
+    if (PROJETOS_DIR / nome_falado).is_dir():
+        return nome_falado, None
+
+    match = name_resolver.resolve(nome_falado)
+    if match and match.score >= NOME_CONFIANCA_AUTOMATICA:
+        print(f"[Agente]: '{nome_falado}' entendido como '{match.name}' ({match.score:.0%}).")
+        return match.name, None
+
+    if match and match.score >= NOME_CONFIANCA_MINIMA:
+        pedir_confirmacao(f"Você quis dizer '{match.name}'?", lambda: ao_confirmar(match.name))
+        return None, (f"Projeto '{nome_falado}' não encontrado. Você quis dizer "
+                      f"'{match.name}'? Diga 'sim' para confirmar.")
+
+    return None, f"Projeto '{nome_falado}' não encontrado."
+
+def criar_projeto(nome_projeto, forcar=False):
     """Cria um novo projeto com sua estrutura de arquivos."""
     projeto_dir = PROJETOS_DIR / nome_projeto
 
     if projeto_dir.exists():
         return f"Projeto '{nome_projeto}' já existe."
 
+    # Evita duplicar um projeto existente por erro de transcrição
+    if not forcar:
+        match = name_resolver.resolve(nome_projeto)
+        if match and match.score >= NOME_CONFIANCA_MINIMA:
+            pedir_confirmacao(
+                f"Criar '{nome_projeto}' mesmo assim?",
+                lambda: criar_projeto(nome_projeto, forcar=True)
+            )
+            return (f"Já existe um projeto parecido: '{match.name}' ({match.score:.0%}). "
+                    f"Diga 'sim' para criar '{nome_projeto}' mesmo assim.")
+
     projeto_dir.mkdir(exist_ok=True)
 
     # Arquivo principal do projeto
     projeto_file = projeto_dir / f"{nome_projeto}.md"
-    projeto_file.write_text(f"# Projeto: {nome_projeto}\n\nCriado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n")
+    projeto_file.write_text(
+        f"# Projeto: {nome_projeto}\n\nCriado em: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n\n",
+        encoding="utf-8"
+    )
 
     # Metadados do projeto
-    metadata = {
-        "nome": nome_projeto,
-        "criado_em": datetime.now().isoformat(),
-        "atualizado_em": datetime.now().isoformat(),
-        "arquivos": [str(projeto_file)],
-        "acoes_historico": []
-    }
-
-    metadata_file = PROJECTS_METADATA_DIR / f"{nome_projeto}.json"
-    metadata_file.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
+    project_index.create_project(nome_projeto, datetime.now().isoformat(), [str(projeto_file)])
+    name_resolver.add(nome_projeto)
 
     return f"Projeto '{nome_projeto}' criado com sucesso."
 
+def renomear_projeto(nome_antigo, nome_novo):
+    """Renomeia um projeto (pasta, arquivo de notas e índices)."""
+    nome_resolvido, mensagem = resolver_nome_projeto(
+        nome_antigo, lambda nome: renomear_projeto(nome, nome_novo)
+    )
+    if nome_resolvido is None:
+        return mensagem
+
+    novo_dir = PROJETOS_DIR / nome_novo
+    if novo_dir.exists():
+        return f"Projeto '{nome_novo}' já existe."
+
+    (PROJETOS_DIR / nome_resolvido).rename(novo_dir)
+    arquivo_antigo = novo_dir / f"{nome_resolvido}.md"
+    novo_file = novo_dir / f"{nome_novo}.md"
+    if arquivo_antigo.exists():
+        arquivo_antigo.rename(novo_file)
+
+    project_index.rename_project(nome_resolvido, nome_novo, [str(novo_file)])
+    note_search.rename_project(nome_resolvido, nome_novo, novo_file)
+    name_resolver.rename(nome_resolvido, nome_novo)
+
+    return f"Projeto '{nome_resolvido}' renomeado para '{nome_novo}'."
+
 def adicionar_info_projeto(nome_projeto, informacao):
     """Adiciona informação a um projeto existente."""
-    projeto_dir = PROJETOS_DIR / nome_projeto
-
-    if not projeto_dir.exists():
-        return f"Projeto '{nome_projeto}' não encontrado."
+    nome_projeto, mensagem = resolver_nome_projeto(
+        nome_projeto, lambda nome: adicionar_info_projeto(nome, informacao)
+    )
+    if nome_projeto is None:
+        return mensagem
 
+    projeto_dir = PROJETOS_DIR / nome_projeto
     projeto_file = projeto_dir / f"{nome_projeto}.md"
 
-    # Adiciona nova entrada com timestamp
+    # Acrescenta nova entrada com timestamp (append + fsync, sem reler o arquivo)
     timestamp = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
-    novo_conteudo = projeto_file.read_text() + f"\n## {timestamp}\n{informacao}\n"
-    projeto_file.write_text(novo_conteudo)
+    append_text(projeto_file, f"\n## {timestamp}\n{informacao}\n")
+    note_search.sync_file(nome_projeto, projeto_file)
 
     # Atualiza metadados
-    metadata_file = PROJECTS_METADATA_DIR / f"{nome_projeto}.json"
-    if metadata_file.exists():
-        metadata = json.loads(metadata_file.read_text())
-        metadata["atualizado_em"] = datetime.now().isoformat()
-        metadata["acoes_historico"].append({
-            "acao": "adicionar_info",
-            "timestamp": datetime.now().isoformat(),
-            "detalhes": informacao[:100] + "..." if len(informacao) > 100 else informacao
-        })
-        metadata_file.write_text(json.dumps(metadata, indent=2, ensure_ascii=False))
+    project_index.record_action(
+        nome_projeto,
+        "adicionar_info",
+        datetime.now().isoformat(),
+        informacao[:100] + "..." if len(informacao) > 100 else informacao
+    )
 
     return f"Informação adicionada ao projeto '{nome_projeto}'."
 
 def listar_projetos():
     """Lista todos os projetos disponíveis."""
-    projetos = [d.name for d in PROJETOS_DIR.iterdir() if d.is_dir()]
+    projetos = project_index.list_projects()
 
     if not projetos:
         return "Você não tem nenhum projeto ainda."
@@ -119,87 +297,156 @@ def listar_projetos():
 
 def consultar_projeto(nome_projeto):
     """Consulta informações de um projeto específico."""
-    projeto_dir = PROJETOS_DIR / nome_projeto
-
-    if not projeto_dir.exists():
-        return f"Projeto '{nome_projeto}' não encontrado."
+    nome_projeto, mensagem = resolver_nome_projeto(nome_projeto, consultar_projeto)
+    if nome_projeto is None:
+        return mensagem
 
+    projeto_dir = PROJETOS_DIR / nome_projeto
     projeto_file = projeto_dir / f"{nome_projeto}.md"
-    conteudo = projeto_file.read_text()
+    conteudo = projeto_file.read_text(encoding="utf-8", errors="replace")
 
     return f"=== {nome_projeto} ===\n{conteudo}"
 
-def salvar_acao_agente(acao, detalhes):
-    """Salva histórico de ações do agente."""
-    timestamp = datetime.now().isoformat()
-    log_entry = f"[{timestamp}] {acao}: {detalhes}\n"
+def buscar_notas(consulta, limite=10):
+    """Busca notas em todos os projetos e retorna os trechos mais relevantes."""
+    inicio = time.perf_counter()
+    resultados = note_search.search(consulta, limit=limite)
+    duracao_ms = (time.perf_counter() - inicio) * 1000
+
+    if not resultados:
+        return f"Nenhuma nota encontrada para '{consulta}'."
 
-    log_file = AGENT_MEMORY_DIR / "agent_log.txt"
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(log_entry)
+    linhas = [f"{len(resultados)} resultado(s) para '{consulta}' ({duracao_ms:.1f} ms):"]
+    for r in resultados:
+        linhas.append(f"• [{r['projeto']}] {r['timestamp']}: {r['snippet']}")
+    return "\n".join(linhas)
+
+def salvar_acao_agente(acao, detalhes):
+    """Salva histórico de ações do agente (só enfileira; a escrita é em outra thread)."""
+    log_event(agent_log, acao.lower(), detalhes, acao=acao)
 
 # ==================== PROCESSADOR DE COMANDOS ====================
 
+router = IntentRouter()
+
+def separar_projeto(alvo):
+    """
+    Separa "nome do projeto + informação" em um comando de adicionar.
+
+    Nomes de projeto podem ter várias palavras ("site pessoal"): testa os
+    prefixos da frase contra o índice de nomes e fica com o mais parecido
+    (a confirmação de nomes aproximados fica com ``resolver_nome_projeto``).
+    Sem nenhum parecido, a primeira palavra é o nome.
+
+    Returns:
+        (nome_projeto, informacao)
+    """
+    palavras = alvo.split(" ")
+    melhor = (0.0, 1)
+    for n in range(1, min(len(palavras) - 1, 6) + 1):
+        match = name_resolver.resolve(" ".join(palavras[:n]))
+        if match and (match.score, n) > melhor:
+            melhor = (match.score, n)
+    score, n = melhor
+    if score < NOME_CONFIANCA_MINIMA:
+        n = 1
+    return " ".join(palavras[:n]), " ".join(palavras[n:])
+
+def projeto_conhecido(slots):
+    """Guard: o slot 'projeto' corresponde a algum projeto existente."""
+    match = name_resolver.resolve(slots["projeto"])
+    return match is not None and match.score >= NOME_CONFIANCA_MINIMA
+
+@router.intent("criar_projeto", "criar [um] [novo] projeto {projeto}")
+def _cmd_criar_projeto(slots):
+    nome_projeto = slots["projeto"]
+    resultado = criar_projeto(nome_projeto)
+    salvar_acao_agente("CRIAR_PROJETO", nome_projeto)
+    print(f"\n[Agente]: {resultado}")
+
+@router.intent("adicionar_info", "adicionar (ao projeto|no projeto|ao|à|a|no|na) {alvo}")
+def _cmd_adicionar_info(slots):
+    nome_projeto, informacao = separar_projeto(slots["alvo"])
+    if not informacao:
+        print("\n[Agente]: Diga 'adicionar ao projeto [nome] [informação]'.")
+        return
+    resultado = adicionar_info_projeto(nome_projeto, informacao)
+    salvar_acao_agente("ADICIONAR_INFO", f"{nome_projeto}: {informacao[:50]}...")
+    print(f"\n[Agente]: {resultado}")
+
+@router.intent("renomear_projeto", "renomear [o] projeto {antigo} para {novo}")
+def _cmd_renomear_projeto(slots):
+    resultado = renomear_projeto(slots["antigo"], slots["novo"])
+    salvar_acao_agente("RENOMEAR_PROJETO", f"{slots['antigo']} -> {slots['novo']}")
+    print(f"\n[Agente]: {resultado}")
+
+@router.intent("listar_projetos", "(meus|listar) projetos", "quais são [os] meus projetos")
+def _cmd_listar_projetos(slots):
+    print(f"\n[Agente]: {listar_projetos()}")
+
+@router.intent("buscar_notas", "(buscar|procurar|pesquisar) [por] {consulta}")
+def _cmd_buscar_notas(slots):
+    consulta = slots["consulta"]
+    resultado = buscar_notas(consulta)
+    salvar_acao_agente("BUSCAR", consulta)
+    print(f"\n[Agente]:\n{resultado}")
+
+@router.intent("consultar_projeto", "sobre [o] projeto {projeto}")
+def _cmd_consultar_projeto(slots):
+    print(f"\n[Agente]:\n{consultar_projeto(slots['projeto'])}")
+
+# "sobre X" só é consulta se X for um projeto; senão vai para o Claude
+router.register("consultar_projeto_curto", ["sobre [(o|a)] {projeto}"],
+                _cmd_consultar_projeto, guard=projeto_conhecido)
+
+# Sem padrões próprios: serve de ação para intenções do intents.json
+router.register("claude_code", [], lambda slots: abrir_claude_com_contexto(slots["prompt"]))
+
 def processar_comando(texto):
     """Processa o comando de voz e executa a ação apropriada."""
 
-    # Comandos de gerenciamento de projetos
-    texto_lower = texto.lower()
+    global confirmacao_pendente
 
-    # Criar projeto
-    if texto_lower.startswith("criar projeto "):
-        nome_projeto = texto_lower.replace("criar projeto ", "").strip()
-        resultado = criar_projeto(nome_projeto)
-        salvar_acao_agente("CRIAR_PROJETO", nome_projeto)
-        print(f"\n[Agente]: {resultado}")
-        return
-
-    # Adicionar ao projeto
-    if texto_lower.startswith("adicionar ao projeto ") or texto_lower.startswith("adicionar a "):
-        partes = texto_lower.replace("adicionar ao projeto ", "").replace("adicionar a ", "").split(" ", 1)
-        if len(partes) >= 2:
-            nome_projeto = partes[0]
-            informacao = partes[1]
-            resultado = adicionar_info_projeto(nome_projeto, informacao)
-            salvar_acao_agente("ADICIONAR_INFO", f"{nome_projeto}: {informacao[:50]}...")
-            print(f"\n[Agente]: {resultado}")
+    # Resposta a uma confirmação pendente ("Você quis dizer...?")
+    if confirmacao_pendente:
+        pergunta, acao = confirmacao_pendente
+        confirmacao_pendente = None
+        resposta = normalize_command(texto)
+        if resposta in RESPOSTAS_SIM:
+            print(f"\n[Agente]: {acao()}")
             return
+        if resposta in RESPOSTAS_NAO:
+            print("\n[Agente]: Ok, cancelado.")
+            return
+        # Qualquer outro comando descarta a confirmação e segue normalmente
 
-    # Listar projetos
-    if texto_lower in ["meus projetos", "listar projetos", "quais são meus projetos"]:
-        resultado = listar_projetos()
-        print(f"\n[Agente]: {resultado}")
-        return
-
-    # Consultar projeto
-    if texto_lower.startswith("sobre o projeto ") or texto_lower.startswith("sobre "):
-        nome_projeto = texto_lower.replace("sobre o projeto ", "").replace("sobre ", "").strip()
-        resultado = consultar_projeto(nome_projeto)
-        print(f"\n[Agente]:\n{resultado}")
+    # Comandos de gerenciamento de projetos (e intenções do intents.json)
+    resultado = router.match(texto)
+    if resultado:
+        M_COMANDOS.inc(intent=resultado.name)
+        resultado.intent.handler(resultado.slots)
         return
 
     # Se não for um comando de projeto, abrir Claude Code com contexto
+    M_COMANDOS.inc(intent="claude_code")
     abrir_claude_com_contexto(texto)
 
 def obter_contexto_projetos():
     """Obtém resumo de todos os projetos para contexto do Claude."""
-    projetos = [d.name for d in PROJETOS_DIR.iterdir() if d.is_dir()]
+    projetos = project_index.summaries()
 
     if not projetos:
         return ""
 
     contexto = "\n\n=== CONTEXTO DOS SEUS PROJETOS ===\n"
 
-    for nome_projeto in projetos:
-        metadata_file = PROJECTS_METADATA_DIR / f"{nome_projeto}.json"
-        if metadata_file.exists():
-            metadata = json.loads(metadata_file.read_text())
-            contexto += f"\nProjeto: {nome_projeto}"
-            criado_em = metadata.get('criado_em', 'N/A')
-            atualizado_em = metadata.get('atualizado_em', 'N/A')
-            contexto += f"\nCriado em: {criado_em[:10] if criado_em != 'N/A' else 'N/A'}"
-            contexto += f"\nÚltima atualização: {atualizado_em[:10] if atualizado_em != 'N/A' else 'N/A'}"
-            contexto += f"\nAções registradas: {len(metadata.get('acoes_historico', []))}\n"
+    for projeto in projetos:
+        criado_em = projeto['criado_em'] or 'N/A'
+        atualizado_em = projeto['atualizado_em'] or 'N/A'
+        contexto += f"\nProjeto: {projeto['nome']}"
+        contexto += f"\nCriado em: {criado_em[:10] if criado_em != 'N/A' else 'N/A'}"
+        contexto += f"\nÚltima atualização: {atualizado_em[:10] if atualizado_em != 'N/A' else 'N/A'}"
+        contexto += f"\nAções registradas: {projeto['acoes_count']}\n"
 
     return contexto
 
@@ -213,67 +460,250 @@ def abrir_claude_com_contexto(texto):
     print("[Executando] Abrindo Claude Code...")
     salvar_acao_agente("CLAUDE_CODE", texto)
 
-    # Comando para abrir nova janela do Claude
-    full_command = f'start cmd /k "claude --dangerously-skip-permissions \"{prompt_completo}\""'
-    subprocess.run(full_command, shell=True)
+    # O prompt vai como um único argumento (sem shell): aspas e símbolos no
+    # texto falado não quebram o comando; o lançamento não bloqueia o pipeline
+    if claude_pool:
+        session = process_launcher.launch_warm(prompt_completo, title="Claude Code - Agente")
+    else:
+        session = process_launcher.launch(claude_argv(prompt_completo), title="Claude Code - Agente")
+    if session is None:
+        print(f"Aviso: {MAX_CONCURRENT_SESSIONS} sessões do Claude Code já abertas, comando ignorado.")
+
+def ao_encerrar_sessao(session):
+    """Informa quando uma sessão do Claude Code termina (ou não consegue abrir)."""
+    if session.status == "failed":
+        print(f"Erro ao abrir Claude Code: {session.error}")
+    else:
+        print(f"[Claude Code] Sessão #{session.id} encerrada (código {session.returncode}).")
+        if session.log_path:
+            print(f"  Resposta em {session.log_path}")
+
+claude_pool = WarmProcessPool(
+    claude_argv("-p"), size=CLAUDE_POOL_SIZE, cwd=os.getcwd(),
+    idle_ttl=CLAUDE_POOL_IDLE_TTL, log_dir=SESSION_LOG_DIR,
+) if CLAUDE_POOL_SIZE > 0 else None
+process_launcher = ProcessLauncher(
+    default_backend(TERMINAL_BACKEND),
+    max_concurrent=MAX_CONCURRENT_SESSIONS,
+    on_exit=ao_encerrar_sessao,
+    pool=claude_pool,
+)
 
 # ==================== CAPTURA DE ÁUDIO ====================
 
-def record_and_trigger():
-    """Grava áudio enquanto a tecla está pressionada e processa o comando."""
-    import time
-    recording = []
+def record_and_trigger(watcher, pipeline):
+    """Grava áudio enquanto a tecla está pressionada e entrega a fala ao pipeline."""
+    ring = buffer_pool.acquire(timeout=0.5)
+    if ring is None:
+        print("Aviso: ainda processando as falas anteriores, gravação ignorada.")
+        return
+
+    utt = Utterance(ring=ring)
+    callback = ring.callback
 
-    def callback(indata, frames, time, status):
-        recording.append(indata.copy())
+    if STREAMING:
+        utt.streamer = StreamingTranscriber(
+            model.transcribe,
+            sample_rate=SAMPLE_RATE,
+            window_seconds=STREAM_WINDOW_SECONDS,
+            overlap_seconds=STREAM_OVERLAP_SECONDS,
+            language="pt",
+            ring=ring,
+            vad=VAD,
+        )
+        callback = utt.streamer.callback
 
-    print("\n[Ouvindo...] Solte F12 para enviar.")
+    print(f"\n[Ouvindo #{utt.id}...] Solte F12 para enviar.")
 
     # Inicia stream de áudio
     with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, callback=callback):
         # Pequeno delay para o stream estabilizar antes de começar a capturar
         time.sleep(0.15)
 
-        # Continua gravando enquanto a tecla estiver pressionada
-        while keyboard.is_pressed(HOTKEY):
-            pass
-
-    print("[Processando...] Transcrevendo áudio...")
+        # Continua gravando até a tecla ser solta (espera bloqueante, sem busy-wait)
+        if not watcher.wait_release():
+            print(f"Aviso: gravação encerrada após {MAX_RECORDING_SECONDS}s.")
 
-    if not recording:
-        print("Erro: Nenhum áudio capturado.")
+    if watcher.cancelled:
+        print(f"[Parando] Fala #{utt.id} descartada.")
+        descartar_gravacao(utt)
         return
-
-    audio_data = np.concatenate(recording).flatten().astype(np.float32)
-
-    # Transcrição com Whisper em português
-    result = model.transcribe(audio_data, language="pt")
-    text = result["text"].strip()
-
-    if text:
-        print(f"[Transcrição]: \"{text}\"")
-        processar_comando(text)
+    utt.mark("recorded")
+    M_GRAVACAO.observe(ring.seconds)
+    if not pipeline.submit(utt):
+        M_DESCARTES.inc(reason="fila_cheia")
+        print(f"Aviso: fila cheia, fala #{utt.id} descartada.")
+        descartar_gravacao(utt)
+
+def descartar_gravacao(utt):
+    """Devolve o buffer de uma fala que não vai para o pipeline."""
+    ring = utt.ring
+    if utt.streamer:
+        # Sem esperar o worker: o buffer volta ao pool quando ele parar de lê-lo
+        utt.streamer.cancel(on_done=lambda: buffer_pool.release(ring))
     else:
+        buffer_pool.release(ring)
+
+def transcrever_fala(utt):
+    """Estágio de transcrição do pipeline: devolve a fala com o texto ou None."""
+    try:
+        print(f"[Processando #{utt.id}...] Transcrevendo áudio...")
+
+        if utt.streamer:
+            # Só a última janela ainda precisa ser decodificada
+            with metrics.span("voice_transcribe", mode="stream"):
+                text = utt.streamer.finish()
+            if VAD:
+                print(f"[VAD] {utt.streamer.vad_removed_seconds:.1f}s de silêncio ignorados.")
+        else:
+            if not len(utt.ring):
+                print("Erro: Nenhum áudio capturado.")
+                return None
+
+            # View contígua do ring buffer, sem cópia
+            audio_data = utt.ring.view()
+
+            if VAD:
+                vad = trim_silence(audio_data, SAMPLE_RATE)
+                if vad.is_silent:
+                    M_DESCARTES.inc(reason="silencio")
+                    print("Aviso: Nenhuma fala detectada.")
+                    return None
+                print(f"[VAD] {vad.removed_seconds:.1f}s de silêncio removidos "
+                      f"({vad.original_seconds:.1f}s -> {vad.kept_seconds:.1f}s).")
+                audio_data = vad.audio
+
+            # Transcrição com Whisper em português
+            with metrics.span("voice_transcribe", mode="batch"):
+                result = model.transcribe(audio_data, language="pt")
+            text = result["text"].strip()
+    finally:
+        buffer_pool.release(utt.ring)
+        utt.ring = None
+
+    if not text:
         print("Aviso: Não entendi o que você disse.")
+        return None
+
+    utt.text = text
+    return utt
+
+def despachar_fala(utt):
+    """Estágio de despacho do pipeline: executa o comando transcrito."""
+    print(f"[Transcrição #{utt.id}]: \"{utt.text}\"")
+    with metrics.span("voice_dispatch"):
+        processar_comando(utt.text)
+    utt.mark("dispatched")
+    M_SOLTAR_TEXTO.observe(utt.elapsed("recorded", "transcrever"))
+    M_TOTAL.observe(utt.elapsed("recorded", "dispatched"))
+    print(f"[Latência #{utt.id}] soltar->texto {utt.elapsed('recorded', 'transcrever'):.2f}s, "
+          f"total {utt.elapsed('recorded', 'dispatched'):.2f}s")
+    return utt
 
 # ==================== LOOP PRINCIPAL ====================
 
-def main():
+def preparar_agente():
+    """Aquece o pool do Claude e sincroniza índices, nomes e comandos extras."""
+    if claude_pool:
+        claude_pool.start()  # Aquece o Claude enquanto o Whisper carrega
+
+    # Importa (uma única vez) os metadados JSON antigos para o índice SQLite
+    migrados = project_index.migrate_from_json(PROJECTS_METADATA_DIR)
+    if migrados:
+        print(f"[Projetos] {migrados} projetos migrados para o índice SQLite.")
+    # Pastas criadas fora do agente desde a última execução
+    novos = project_index.sync_folders(PROJETOS_DIR)
+    if novos:
+        print(f"[Projetos] {novos} pastas novas registradas no índice.")
+
+    carregar_nomes_projetos()
+
+    try:
+        extras = router.load_config(INTENTS_FILE)
+        if extras:
+            print(f"[Comandos] {extras} comandos extras carregados de {INTENTS_FILE.name}.")
+    except (ValueError, KeyError, json.JSONDecodeError) as e:
+        print(f"Aviso: {INTENTS_FILE.name} ignorado: {e}")
+
+    # Indexa notas acrescentadas fora do agente (só o trecho novo de cada arquivo)
+    novas_notas = note_search.sync_all(PROJETOS_DIR)
+    if novas_notas:
+        print(f"[Busca] {novas_notas} notas indexadas.")
+
+def criar_pipeline():
+    """Pipeline transcrever → despachar, com as falas pendentes limitadas."""
+    return Pipeline(
+        [("transcrever", transcrever_fala), ("despachar", despachar_fala)],
+        maxsize=PIPELINE_MAX_PENDING,
+    )
+
+def main(argv=None):
     """Loop principal do agente."""
+    parser = argparse.ArgumentParser(description="Agente pessoal ativado por voz")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics.configure(args)
+
     print("\n" + "="*50)
     print("     AGENTE PESSOAL - SISTEMA ATIVO")
     print("="*50)
     print("\nComandos disponíveis:")
     print("  - Criar projeto [nome]")
     print("  - Adicionar ao projeto [nome] [informacao]")
+    print("  - Renomear projeto [nome] para [novo nome]")
     print("  - Meus projetos")
     print("  - Sobre o projeto [nome]")
+    print("  - Buscar [termos] (em todas as notas)")
     print("  - [Qualquer outro comando] -> Abre Claude Code")
     print("\n" + "="*50 + "\n")
 
-    while True:
-        keyboard.wait(HOTKEY)
-        record_and_trigger()
+    iniciar_modelo()
+    preparar_agente()
+    watcher = KeyWatcher(HOTKEY, max_hold_seconds=MAX_RECORDING_SECONDS)
+    pipeline = criar_pipeline()
+
+    print(f">>> SISTEMA PRONTO! (hotkey armada em {time.perf_counter() - STARTED_AT:.2f}s)")
+    print(f">>> Segure [{HOTKEY.upper()}] para falar com o Agente Pessoal")
+
+    try:
+        while True:
+            watcher.wait_press()
+            record_and_trigger(watcher, pipeline)
+            # Se a gravação expirou com a tecla presa, espera soltar antes de rearmar
+            watcher.wait_idle()
+    finally:
+        metrics.finish(args)
+
+def plugin_main(ctx):
+    """
+    Roda o agente como plugin do supervisor (5_supervisor.py).
+
+    Usa o hub de teclado e o backend de transcrição compartilhados; para
+    quando ``ctx.stopping`` é sinalizado (sessões abertas continuam rodando).
+    """
+    global model
+    model = ctx.transcriber
+    ctx.transcriber.get()  # Começa a carregar/conectar já, não na primeira fala
+    preparar_agente()
+    watcher = KeyWatcher(HOTKEY, source=ctx.keys, max_hold_seconds=MAX_RECORDING_SECONDS)
+    ctx.on_stop(watcher.cancel)  # Parar no meio de uma gravação não espera a tecla
+    pipeline = criar_pipeline()
+    ctx.mark_ready()
+
+    try:
+        while not ctx.stopping.is_set():
+            # Espera com timeout para perceber o pedido de parada
+            if not watcher.wait_press(timeout=0.5):
+                continue
+            record_and_trigger(watcher, pipeline)
+            watcher.wait_idle()
+    finally:
+        watcher.close()
+        pipeline.close(timeout=5)
+        if claude_pool:
+            claude_pool.close()
+        project_index.close()
+        note_search.close()
 
 if __name__ == "__main__":
     try:
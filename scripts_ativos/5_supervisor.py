@@ -0,0 +1,39 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "keyboard",
+#     "sounddevice",
+#     "openai-whisper",
+#     "numpy",
+#     "plyer",  # Opcional - para notificações visuais no Windows
+# ]
+# ///
+
+"""
+Supervisor dos Scripts de Hotkey
+================================
+
+Roda o launcher de commands (F8), o Agente Pessoal (F12) e o Push-to-Talk
+(F9) como plugins de um único processo: um hook de teclado, uma thread de
+notificações e um backend de transcrição para todos. Cada plugin só é
+carregado no primeiro uso e pode ser reiniciado sem derrubar os outros
+(digite ``restart agent`` no terminal).
+
+Uso:
+    python 5_supervisor.py                       # plugins carregados sob demanda
+    python 5_supervisor.py --eager --stub        # tudo já no início, sem Whisper
+    python 5_supervisor.py --plugins launcher,agent
+"""
+
+import sys
+
+# Configura UTF-8 para stdout/stderr no Windows (uma vez, para todos os plugins)
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+from hotkey_core.supervisor import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Verificação: memória do pool de buffers de captura.
+
+Cada ``AudioRingBuffer`` guarda ``2 × max_seconds`` de áudio espelhado (com
+120 s a 16 kHz, ~15 MB). Simula o pipeline do agente pessoal e confere
+quantos buffers ficam alocados:
+
+    idle    → em repouso só o buffer quente existe
+    backlog → falas pendentes criam buffers até o limite do pool
+    drain   → quando o pipeline esvazia, os extras são liberados
+
+Também mede o custo de ``acquire`` com o buffer quente e criando um novo.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/audio_capture.py --max-seconds 120
+"""
+
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.audio_capture import AudioBufferPool
+
+SAMPLE_RATE = 16000
+
+
+def medir_acquire(pool: AudioBufferPool, n: int, segurar: int) -> list:
+    """Tempo de ``acquire`` com ``segurar`` buffers já em uso."""
+    tempos, bloco = [], np.zeros(SAMPLE_RATE, dtype=np.float32)
+    for _ in range(n):
+        em_uso = [pool.acquire() for _ in range(segurar)]
+        t0 = time.perf_counter()
+        ring = pool.acquire()
+        tempos.append(time.perf_counter() - t0)
+        ring.write(bloco)  # Toca nas páginas, como a gravação faria
+        for r in em_uso + [ring]:
+            pool.release(r)
+    return tempos
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Memória do pool de buffers de captura")
+    parser.add_argument("--max-seconds", type=float, default=120.0, help="MAX_RECORDING_SECONDS do agente")
+    parser.add_argument("--pending", type=int, default=3, help="PIPELINE_MAX_PENDING do agente")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    tamanho = args.pending + 1
+    pool = AudioBufferPool(tamanho, args.max_seconds, SAMPLE_RATE)
+    mb_buffer = 2 * int(args.max_seconds * SAMPLE_RATE) * 4 / 2**20
+    resultados = {"buffer_mb": round(mb_buffer, 1), "pool_size": tamanho}
+
+    # Repouso: só o buffer quente
+    resultados["idle_allocated"] = pool.allocated
+    if pool.allocated != 1:
+        falhas.append(f"idle: {pool.allocated} buffers alocados em repouso, esperado 1")
+
+    # Pipeline atrasado: cada fala pendente retira um buffer até o limite
+    em_uso = [pool.acquire(timeout=0) for _ in range(tamanho)]
+    resultados["backlog_allocated"] = pool.allocated
+    if None in em_uso or pool.allocated != tamanho:
+        falhas.append(f"backlog: {pool.allocated} buffers com {tamanho} falas pendentes")
+    if len({id(r) for r in em_uso}) != tamanho:
+        falhas.append("backlog: o mesmo buffer foi entregue a duas falas")
+    if pool.acquire(timeout=0.05) is not None:
+        falhas.append("backlog: acquire passou do limite do pool")
+
+    # No limite, quem espera recebe o primeiro buffer devolvido
+    devolvido = em_uso.pop()
+    threading.Timer(0.05, pool.release, args=(devolvido,)).start()
+    esperado = pool.acquire(timeout=2)
+    if esperado is not devolvido:
+        falhas.append("backlog: acquire no limite não recebeu o buffer devolvido")
+    em_uso.append(esperado)
+
+    # Pipeline esvaziou: só o buffer quente continua alocado
+    for ring in em_uso:
+        pool.release(ring)
+    resultados["drain_allocated"] = pool.allocated
+    if pool.allocated != 1 or pool.available != tamanho:
+        falhas.append(f"drain: {pool.allocated} buffers alocados após esvaziar "
+                      f"({pool.available} disponíveis), esperado 1 ({tamanho})")
+
+    resultados["acquire_warm"] = percentiles(medir_acquire(pool, args.iterations, 0))
+    resultados["acquire_new"] = percentiles(medir_acquire(pool, args.iterations, 1))
+    if pool.allocated != 1:
+        falhas.append(f"acquire: {pool.allocated} buffers alocados após as medições, esperado 1")
+
+    print(f"buffer de {args.max_seconds:.0f}s: {mb_buffer:.1f} MB  "
+          f"alocados: repouso={resultados['idle_allocated']} "
+          f"atrasado={resultados['backlog_allocated']} esvaziado={resultados['drain_allocated']}")
+    for nome in ("acquire_warm", "acquire_new"):
+        r = resultados[nome]
+        print(f"{nome:<13} p50={r['p50_ms']:.3f}ms p95={r['p95_ms']:.3f}ms")
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"audio_capture_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "audio_capture", resultados, max_seconds=args.max_seconds, pending=args.pending)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
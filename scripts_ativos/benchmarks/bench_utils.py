@@ -0,0 +1,148 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+- Carrega os scripts numerados (ex.: ``4_personal_agent.py``) como módulos,
+  com o HOME redirecionado para um diretório temporário e o microfone stubado
+- Lê/gera fixtures WAV mono 16 kHz
+- Calcula percentis e WER e grava os resultados em JSON para comparação entre versões
+"""
+
+import importlib.util
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import types
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+def load_script(filename: str, home_dir: Path, module_name: str) -> types.ModuleType:
+    """
+    Importa um script de ``scripts_ativos`` como módulo, sem tocar no HOME real.
+
+    O ``sounddevice`` é substituído por um stub: os benchmarks reproduzem
+    fixtures e nunca abrem o microfone.
+    """
+    os.environ["HOME"] = str(home_dir)
+    os.environ["USERPROFILE"] = str(home_dir)
+
+    stub = types.ModuleType("sounddevice")
+
+    def _sem_microfone(*args, **kwargs):
+        raise RuntimeError("Microfone indisponível no benchmark")
+
+    stub.InputStream = _sem_microfone
+    sys.modules["sounddevice"] = stub
+
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def read_wav(path: Path) -> np.ndarray:
+    """Lê um WAV PCM 16-bit mono 16 kHz como float32 em [-1, 1]."""
+    with wave.open(str(path), "rb") as w:
+        if w.getnchannels() != 1 or w.getsampwidth() != 2 or w.getframerate() != 16000:
+            raise ValueError(f"{path}: esperado WAV mono 16-bit 16 kHz")
+        dados = w.readframes(w.getnframes())
+    return np.frombuffer(dados, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def write_wav(path: Path, audio: np.ndarray, sample_rate: int = 16000) -> None:
+    """Grava áudio float32 como WAV PCM 16-bit mono."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm.tobytes())
+
+
+def synthetic_clip(seconds: float, sample_rate: int = 16000, seed: int = 0) -> np.ndarray:
+    """
+    Gera um clipe sintético: silêncio com ruído, "fala" (tons modulados) e silêncio.
+
+    Não é fala real, mas exercita VAD e decode com a duração desejada.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sample_rate)
+    audio = rng.normal(0, 0.002, n).astype(np.float32)
+    ini, fim = int(0.1 * n), int(0.9 * n)
+    t = np.arange(fim - ini) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    audio[ini:fim] += (0.2 * envelope * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+    return audio
+
+
+def percentiles(valores: List[float]) -> Dict[str, float]:
+    """Retorna p50/p95/média/máximo (em milissegundos) de uma lista em segundos."""
+    ms = np.asarray(valores, dtype=np.float64) * 1000.0
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "max_ms": round(float(ms.max()), 3),
+        "n": int(ms.size),
+    }
+
+
+def normalize_words(texto: str) -> List[str]:
+    """Palavras em minúsculas e sem pontuação (acentos contam como diferença)."""
+    return re.findall(r"\w+", texto.lower())
+
+
+def word_errors(referencia: str, hipotese: str) -> Tuple[int, int]:
+    """
+    Distância de edição em palavras (substituições + inserções + remoções).
+
+    Returns:
+        (erros, palavras na referência); WER = erros / palavras, somando o
+        corpus inteiro antes de dividir
+    """
+    ref, hip = normalize_words(referencia), normalize_words(hipotese)
+    anterior = list(range(len(hip) + 1))
+    for i, palavra in enumerate(ref, 1):
+        atual = [i] + [0] * len(hip)
+        for j, outra in enumerate(hip, 1):
+            atual[j] = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + (palavra != outra))
+        anterior = atual
+    return anterior[-1], len(ref)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecida"
+
+
+def write_results(path: Path, benchmark: str, results, **meta) -> None:
+    """Grava os resultados em JSON com metadados da máquina e da revisão."""
+    documento = {
+        "benchmark": benchmark,
+        "created_at": datetime.now().isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **meta,
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"✓ Resultados salvos em {path}")
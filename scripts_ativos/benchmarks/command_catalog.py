@@ -0,0 +1,233 @@
+"""
+Benchmark: catálogo de slash commands do ``1_CC_Commands.py``.
+
+Cria N arquivos de comando em um diretório temporário e mede o custo de
+obter a lista a cada F8:
+
+    iterdir    → listagem antiga (``iterdir()`` + ``is_file()`` por entrada)
+    cold_scan  → ``CommandCatalog.refresh(force=True)`` (``os.scandir``)
+    cached     → ``commands()`` com o diretório inalterado (um ``stat``)
+    watching   → ``commands()`` com o vigia ativo (nenhum acesso ao disco)
+    restart    → novo ``CommandCatalog`` lendo o catálogo salvo em JSON
+
+Também confere a invalidação: arquivo criado/removido aparece na lista, o
+catálogo salvo sobrevive a um "restart" e troca de diretório não reaproveita
+a lista antiga. Com várias raízes (projeto, usuário, time) e subpastas,
+confere namespaces, precedência entre raízes e mede a varredura sequencial
+(1 thread) contra a paralela, com o tempo de cada raiz.
+
+Em disco local cada listagem leva microssegundos e o pool não ganha nada
+(``workers_1`` ≈ ``workers_8``). Ele existe para drives de rede, onde cada
+diretório espera a ida e volta ao servidor: ``slow_workers_*`` repete a
+comparação com ``--latency-ms`` de espera por diretório listado.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/command_catalog.py --files 5000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core import command_catalog
+from hotkey_core.command_catalog import CommandCatalog
+
+
+def listagem_antiga(diretorio: Path):
+    return sorted(p.stem for p in diretorio.iterdir() if p.is_file() and p.suffix in [".md", ".txt", ""])
+
+
+def medir(fn, repeat: int):
+    tempos = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - t0)
+    return percentiles(tempos)
+
+
+def gerar(diretorio: Path, n: int) -> None:
+    diretorio.mkdir(parents=True)
+    for i in range(n):
+        ext = (".md", ".txt", "", ".json")[i % 4]  # .json deve ser ignorado
+        (diretorio / f"cmd-{i:05d}{ext}").write_text(f"comando {i}", encoding="utf-8")
+    (diretorio / "subpasta").mkdir()
+
+
+def esperar_mtime_mudar() -> None:
+    # Sistemas de arquivo com mtime grosso (FAT: 2s, alguns ext4: 4ms)
+    time.sleep(0.02)
+
+
+def verificar(raiz: Path, n: int) -> dict:
+    """Checagens de invalidação; retorna {nome: ok}."""
+    diretorio = raiz / "commands"
+    cache = raiz / "catalog.json"
+    checks = {}
+
+    catalogo = CommandCatalog(diretorio, cache_file=cache)
+    lista = catalogo.commands()
+    checks["scan_matches_iterdir"] = lista == listagem_antiga(diretorio)
+    checks["ignores_other_suffixes_and_dirs"] = len(lista) == n - n // 4 and "subpasta" not in lista
+
+    scans = catalogo.scans
+    catalogo.commands()
+    checks["unchanged_dir_not_rescanned"] = catalogo.scans == scans
+
+    esperar_mtime_mudar()
+    (diretorio / "novo-comando.md").write_text("novo", encoding="utf-8")
+    checks["new_file_detected"] = "novo-comando" in catalogo.commands()
+
+    esperar_mtime_mudar()
+    (diretorio / "novo-comando.md").unlink()
+    checks["removed_file_detected"] = "novo-comando" not in catalogo.commands()
+
+    reiniciado = CommandCatalog(diretorio, cache_file=cache)
+    checks["restart_uses_saved_catalog"] = reiniciado.commands() == catalogo.commands() and reiniciado.scans == 0
+
+    outro = raiz / "outros"
+    outro.mkdir()
+    (outro / "so-este.md").write_text("x", encoding="utf-8")
+    checks["set_directory_rescans"] = reiniciado.set_directory(outro) == ["so-este"]
+    checks["saved_catalog_ignored_for_other_dir"] = CommandCatalog(outro, cache_file=cache).scans == 0 and \
+        CommandCatalog(diretorio, cache_file=cache).commands() == catalogo.commands()
+
+    reiniciado.start_watcher(interval=0.05)
+    esperar_mtime_mudar()
+    (outro / "vigiado.md").write_text("x", encoding="utf-8")
+    time.sleep(0.3)
+    checks["watcher_picks_up_changes"] = "vigiado" in reiniciado.commands()
+    reiniciado.stop_watcher()
+    return checks
+
+
+def gerar_raizes(raiz: Path, n: int):
+    """Três raízes com subpastas; "deploy" existe no projeto e no usuário."""
+    projeto, usuario, time_ = raiz / "projeto", raiz / "usuario", raiz / "time"
+    for base, prefixo in ((projeto, "proj"), (usuario, "user"), (time_, "team")):
+        for i in range(n):
+            ns = base / f"ns{i % 10}" / ("sub" if i % 3 == 0 else "")
+            ns.mkdir(parents=True, exist_ok=True)
+            (ns / f"{prefixo}-{i:05d}.md").write_text("x", encoding="utf-8")
+    (projeto / "deploy.md").write_text("projeto", encoding="utf-8")
+    (usuario / "deploy.md").write_text("usuario", encoding="utf-8")
+    (usuario / ".git").mkdir()
+    (usuario / ".git" / "oculto.md").write_text("x", encoding="utf-8")
+    return [projeto, usuario, time_, raiz / "nao-existe"]
+
+
+def verificar_raizes(raizes, n: int) -> dict:
+    checks = {}
+    catalogo = CommandCatalog(raizes)
+    nomes = catalogo.commands()
+    checks["multi_root_count"] = len(nomes) == 3 * n + 1
+    checks["nested_namespace"] = "ns0:sub:proj-00000" in nomes and "ns1:proj-00001" in nomes
+    deploy = catalogo.get("deploy")
+    checks["first_root_wins"] = deploy is not None and deploy.root == str(raizes[0])
+    checks["hidden_dirs_skipped"] = not any("oculto" in nome for nome in nomes)
+
+    scans = catalogo.scans
+    esperar_mtime_mudar()
+    (raizes[1] / "ns3" / "novo-aninhado.md").write_text("x", encoding="utf-8")
+    nomes = catalogo.commands()
+    checks["nested_change_detected"] = "ns3:novo-aninhado" in nomes and catalogo.scans == scans + 1
+    checks["only_changed_root_rescanned"] = set(catalogo.last_scan_seconds) == {str(raizes[1])}
+    catalogo.commands()
+    checks["unchanged_roots_report_no_scan"] = all(seg is None for _, _, seg in catalogo.scan_report())
+
+    # Pasta escolhida que já é a raiz do usuário (com outra grafia): sobe, sem duplicar
+    nomes = catalogo.set_directory(raizes[1] / "ns0" / "..")
+    checks["set_directory_dedups_roots"] = len(catalogo.roots) == len(raizes) - 1 and \
+        catalogo.get("deploy").root == str(raizes[1] / "ns0" / "..") and \
+        nomes == CommandCatalog(raizes[1:]).commands()
+    return checks
+
+
+def com_latencia(segundos: float):
+    """Troca a listagem de diretório por uma que espera ``segundos`` antes (drive de rede)."""
+    original = command_catalog._scan_dir
+
+    def lento(path, suffixes):
+        time.sleep(segundos)
+        return original(path, suffixes)
+
+    command_catalog._scan_dir = lento
+    return lambda: setattr(command_catalog, "_scan_dir", original)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do catálogo de commands")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="Espera por diretório na varredura simulada de drive de rede")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raiz = Path(tmp)
+        diretorio = raiz / "commands"
+        print(f"Gerando {args.files} arquivos de comando...")
+        gerar(diretorio, args.files)
+
+        checks = verificar(raiz, args.files)
+        for nome, ok in checks.items():
+            print(f"  {'✓' if ok else '✗'} {nome}")
+
+        raizes = gerar_raizes(raiz / "multi", args.files // 3)
+        for nome, ok in verificar_raizes(raizes, args.files // 3).items():
+            checks[nome] = ok
+            print(f"  {'✓' if ok else '✗'} {nome}")
+
+        varredura = {}
+        for workers in (1, 8):
+            catalogo = CommandCatalog(raizes, max_workers=workers)
+            varredura[f"workers_{workers}"] = medir(lambda: catalogo.refresh(force=True), args.repeat)
+        por_raiz = {raiz_: round(seg * 1000, 3) for raiz_, _, seg in catalogo.scan_report()}
+        restaurar = com_latencia(args.latency_ms / 1000)
+        try:
+            for workers in (1, 8):
+                catalogo = CommandCatalog(raizes, max_workers=workers)
+                varredura[f"slow_workers_{workers}"] = medir(lambda: catalogo.refresh(force=True),
+                                                             max(1, args.repeat // 4))
+        finally:
+            restaurar()
+        ganho = varredura["slow_workers_1"]["p50_ms"] / varredura["slow_workers_8"]["p50_ms"]
+        checks["pool_helps_on_slow_drive"] = ganho >= 2
+
+        cache = raiz / "bench_catalog.json"
+        catalogo = CommandCatalog(diretorio, cache_file=cache)
+        resultados = {
+            "iterdir": medir(lambda: listagem_antiga(diretorio), args.repeat),
+            "cold_scan": medir(lambda: catalogo.refresh(force=True), args.repeat),
+            "cached": medir(catalogo.commands, args.repeat),
+            "restart": medir(lambda: CommandCatalog(diretorio, cache_file=cache).commands(), args.repeat),
+        }
+        catalogo.start_watcher(interval=60)
+        resultados["watching"] = medir(catalogo.commands, args.repeat)
+        catalogo.stop_watcher()
+
+    resultados.update(varredura)
+    for nome, r in resultados.items():
+        print(f"{nome:<10} p50={r['p50_ms']:8.3f}ms  p95={r['p95_ms']:8.3f}ms")
+    print(f"Com {args.latency_ms:g}ms por diretório: 8 threads {ganho:.1f}x mais rápido que 1")
+    resultados["per_root_ms"] = por_raiz
+    for raiz_, ms in por_raiz.items():
+        print(f"  raiz {Path(raiz_).name:<10} {ms:8.3f}ms")
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"command_catalog_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "command_catalog", {"timings": resultados, "checks": checks}, files=args.files,
+                  latency_ms=args.latency_ms)
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,146 @@
+"""
+Benchmark: filtro fuzzy do launcher de commands.
+
+Gera N nomes de slash commands sintéticos e simula o usuário digitando
+consultas tecla a tecla (inclusive apagando com backspace), medindo a
+latência de cada tecla:
+
+    incremental → ``CommandFilter`` (reaproveita o estado da tecla anterior)
+    do_zero     → novo ``CommandFilter`` a cada tecla (sem reaproveitamento)
+
+A meta é ficar abaixo de um frame (16,7 ms a 60 Hz) com 10k commands. O
+tempo medido inclui a ordenação completa; a lista virtualizada da UI só
+insere as linhas visíveis depois.
+
+Também mede ``FrecencyStore.record`` com arquivo (roda na thread de UI a
+cada execução): não pode esperar o disco, execuções seguidas saem em uma
+gravação só e ``close`` grava o que estava pendente.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/command_filter.py --commands 10000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.command_search import CommandFilter, FrecencyStore
+
+FRAME_MS = 1000 / 60
+
+PARTES = ["review", "pr", "commit", "test", "deploy", "fix", "refactor", "docs", "release", "lint",
+          "build", "api", "db", "migrate", "bench", "issue", "plan", "debug", "explain", "update"]
+CONSULTAS = ["review-pr", "cmt", "deploy api", "rfctr", "db:migrate", "x"]
+
+
+def gerar_commands(n: int, rng: random.Random):
+    nomes = set()
+    while len(nomes) < n:
+        partes = rng.sample(PARTES, rng.randint(1, 3))
+        sep = rng.choice(["-", "_", ":"])
+        nomes.add(sep.join(partes) + (f"-{rng.randint(1, 99)}" if rng.random() < 0.5 else ""))
+    return sorted(nomes)
+
+
+def sequencia_teclas(consulta: str):
+    """Digita a consulta, apaga 3 teclas e redigita."""
+    estados = [consulta[:i] for i in range(1, len(consulta) + 1)]
+    volta = max(1, len(consulta) - 3)
+    estados += [consulta[:i] for i in range(len(consulta) - 1, volta - 1, -1)]
+    estados += [consulta[:i] for i in range(volta + 1, len(consulta) + 1)]
+    return estados
+
+
+def verificar_gravacao(commands, rng) -> tuple:
+    """``record`` com arquivo: latência na thread chamadora e gravações em lote."""
+    falhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        arquivo = Path(tmp) / "frecency.json"
+        loja = FrecencyStore(arquivo, save_delay=0.2)
+        tempos = []
+        for nome in rng.sample(commands, 20):
+            t0 = time.perf_counter()
+            loja.record(nome)
+            tempos.append(time.perf_counter() - t0)
+        if loja.saves:
+            falhas.append(f"{loja.saves} gravações dentro do record")
+        time.sleep(0.6)
+        if loja.saves != 1:
+            falhas.append(f"{loja.saves} gravações para 20 execuções seguidas, esperado 1")
+        loja.record(commands[0])
+        loja.close()
+        if FrecencyStore(arquivo).scores().keys() != loja.scores().keys():
+            falhas.append("close não gravou a execução pendente")
+    return falhas, percentiles(tempos)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do filtro fuzzy de commands")
+    parser.add_argument("--commands", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    commands = gerar_commands(args.commands, rng)
+
+    frecencia = FrecencyStore(None)
+    agora = time.time()
+    for nome in rng.sample(commands, min(200, len(commands))):
+        for _ in range(rng.randint(1, 20)):
+            frecencia.record(nome, now=agora - rng.uniform(0, 60 * 86400))
+
+    filtro = CommandFilter(commands, frecencia)
+    incremental, do_zero = [], []
+    for consulta in CONSULTAS:
+        filtro.filter("")  # Campo limpo ao abrir o seletor
+        for estado in sequencia_teclas(consulta):
+            t0 = time.perf_counter()
+            resultado = filtro.filter(estado)
+            incremental.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            referencia = CommandFilter(commands, frecencia).filter(estado)
+            do_zero.append(time.perf_counter() - t0)
+            assert resultado == referencia, estado
+
+    t0 = time.perf_counter()
+    filtro.filter("")
+    vazio = time.perf_counter() - t0
+
+    resultados = {
+        "incremental": percentiles(incremental),
+        "from_scratch": percentiles(do_zero),
+        "empty_query_ms": round(vazio * 1000, 3),
+    }
+    resultados["under_one_frame"] = resultados["incremental"]["max_ms"] < FRAME_MS
+    falhas, resultados["record"] = verificar_gravacao(commands, rng)
+    resultados["failures"] = falhas
+
+    for nome in ("incremental", "from_scratch"):
+        r = resultados[nome]
+        print(f"{nome:<13} p50={r['p50_ms']:7.3f}ms  p95={r['p95_ms']:7.3f}ms  max={r['max_ms']:7.3f}ms")
+    print(f"consulta vazia {resultados['empty_query_ms']:.3f}ms   "
+          f"abaixo de um frame ({FRAME_MS:.1f}ms): {'sim' if resultados['under_one_frame'] else 'NÃO'}")
+    print(f"record (com arquivo) p50={resultados['record']['p50_ms']:.3f}ms  "
+          f"max={resultados['record']['max_ms']:.3f}ms")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"command_filter_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "command_filter", resultados, commands=args.commands)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,141 @@
+"""
+Benchmark: pré-visualização de commands do launcher.
+
+Gera N arquivos de command (alguns com frontmatter, alguns enormes) e
+simula o usuário segurando a seta pela lista:
+
+    parse_small / parse_huge → ``parse_command_file`` em arquivo pequeno e
+                               em arquivo de vários MB (leitura limitada)
+    cache_hit                → ``PreviewCache.get`` com o arquivo inalterado
+    request                  → custo de ``PreviewLoader.request`` na thread
+                               de UI (deve ser desprezível: só enfileira)
+
+Também simula a navegação rápida (um pedido atrás do outro, com leitura de
+``--read-ms`` por arquivo, como num disco lento) e confere que o loader lê
+bem menos arquivos do que recebe pedidos (os intermediários são descartados)
+e que o último item selecionado é carregado.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/command_preview.py --files 2000
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.command_preview import PreviewCache, PreviewLoader, parse_command_file
+
+
+def gerar(diretorio: Path, n: int):
+    caminhos = []
+    for i in range(n):
+        caminho = diretorio / f"cmd-{i:05d}.md"
+        corpo = "\n".join(f"Passo {j}: faça algo útil com $ARGUMENTS" for j in range(40))
+        if i % 2 == 0:
+            caminho.write_text(f"---\ndescription: Command {i}\nallowed-tools: Bash(git:*)\n---\n\n{corpo}\n",
+                               encoding="utf-8")
+        else:
+            caminho.write_text(f"# Command {i}\n\n{corpo}\n", encoding="utf-8")
+        caminhos.append(str(caminho))
+    enorme = diretorio / "enorme.md"
+    enorme.write_text("---\ndescription: Arquivo grande\n---\n" + ("x" * 120 + "\n") * 50000, encoding="utf-8")
+    return caminhos, str(enorme)
+
+
+class CacheLento(PreviewCache):
+    """Cache cuja leitura demora ``atraso`` segundos (disco lento / rede)."""
+
+    def __init__(self, atraso: float, **kwargs):
+        super().__init__(**kwargs)
+        self.atraso = atraso
+
+    def get(self, path: str):
+        time.sleep(self.atraso)
+        return super().get(path)
+
+
+def medir(fn, repeat: int):
+    tempos = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - t0)
+    return percentiles(tempos)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da pré-visualização de commands")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--read-ms", type=float, default=2.0, help="Atraso de cada leitura na navegação")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        caminhos, enorme = gerar(Path(tmp), args.files)
+        cache = PreviewCache(maxsize=256)
+        cache.get(caminhos[0])
+
+        resultados = {
+            "parse_small": medir(lambda: parse_command_file(caminhos[0]), args.repeat),
+            "parse_huge": medir(lambda: parse_command_file(enorme), args.repeat),
+            "cache_hit": medir(lambda: cache.get(caminhos[0]), args.repeat),
+        }
+
+        # Seta pressionada: pedidos seguidos, mais rápidos que a leitura
+        lidos = []
+        fim = threading.Event()
+        ultimo = caminhos[-1]
+
+        def pronto(path, preview):
+            lidos.append(path)
+            if path == ultimo:
+                fim.set()
+
+        loader = PreviewLoader(CacheLento(args.read_ms / 1000, maxsize=256), pronto)
+        pedidos = []
+        for caminho in caminhos:
+            t0 = time.perf_counter()
+            loader.request(caminho)
+            pedidos.append(time.perf_counter() - t0)
+        fim.wait(5)
+        loader.close()
+
+        resultados["request"] = percentiles(pedidos)
+        resultados["navigation"] = {"requests": len(caminhos), "files_read": len(lidos),
+                                    "last_selected_loaded": lidos[-1] == ultimo if lidos else False}
+
+    falhas = []
+    nav = resultados["navigation"]
+    if not nav["last_selected_loaded"]:
+        falhas.append("o último item selecionado não foi carregado")
+    if nav["files_read"] >= nav["requests"]:
+        falhas.append(f"loader leu {nav['files_read']} arquivos para {nav['requests']} pedidos "
+                      "(pedidos intermediários deviam ser descartados)")
+
+    for nome in ("parse_small", "parse_huge", "cache_hit", "request"):
+        r = resultados[nome]
+        print(f"{nome:<12} p50={r['p50_ms']:8.4f}ms  p95={r['p95_ms']:8.4f}ms")
+    print(f"navegação: {nav['requests']} pedidos, {nav['files_read']} arquivos lidos, "
+          f"último item carregado: {'sim' if nav['last_selected_loaded'] else 'NÃO'}")
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"command_preview_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "command_preview", resultados, files=args.files, read_ms=args.read_ms)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,116 @@
+"""
+Benchmark: log de eventos em fila vs. abrir/escrever/fechar por ação.
+
+    open_append → o antigo ``salvar_acao_agente``: open('a') + write + close
+                  na thread que registra a ação
+    log_event   → ``log_event`` com o ``QueueHandler`` (só enfileira)
+
+Também verifica a rotação (disco limitado a ``backup_count`` arquivos .gz),
+que os eventos rotacionados continuam consultáveis e mede a consulta das
+últimas linhas de um log grande (lida do fim) contra a varredura completa.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/event_log.py --events 20000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.event_log import (
+    SUFFIX, log_event, query_events, rotated_files, setup_event_log, shutdown_event_log,
+)
+
+
+def medir(fn, n: int):
+    tempos = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn(i)
+        tempos.append(time.perf_counter() - t0)
+    return tempos
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do log de eventos")
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+    falhas = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        antigo = tmp / "agent_log.txt"
+
+        def open_append(i):
+            with open(antigo, "a", encoding="utf-8") as f:
+                f.write(f"[{datetime.now().isoformat()}] ADICIONAR_INFO: projeto {i}: nota...\n")
+
+        t_antigo = medir(open_append, args.events)
+
+        log = setup_event_log("bench", tmp)
+        t_novo = medir(lambda i: log_event(log, "adicionar_info", f"projeto {i}: nota...", acao="ADICIONAR_INFO"),
+                       args.events)
+        t0 = time.perf_counter()
+        shutdown_event_log("bench")
+        drenagem = time.perf_counter() - t0
+        eventos = (tmp / f"bench{SUFFIX}").read_text(encoding="utf-8").splitlines()
+        if len(eventos) != args.events or json.loads(eventos[-1])["msg"] != f"projeto {args.events - 1}: nota...":
+            falhas.append(f"eventos perdidos: {len(eventos)} de {args.events}")
+
+        # Rotação: 64 KB por arquivo, no máximo 3 rotacionados
+        log = setup_event_log("rotacao", tmp, max_bytes=64 * 1024, backup_count=3)
+        for i in range(5000):
+            log_event(log, "nota", f"evento {i}", i=i)
+        shutdown_event_log("rotacao")
+        atual = tmp / f"rotacao{SUFFIX}"
+        rotacionados = rotated_files(atual)
+        if len(rotacionados) != 3:
+            falhas.append(f"esperados 3 arquivos rotacionados, há {len(rotacionados)}")
+        if atual.stat().st_size > 64 * 1024:
+            falhas.append("arquivo atual passou do limite")
+        todos = query_events("rotacao", tmp, limit=10**6, rotated=True)
+        indices = [e["i"] for e in todos]
+        if not indices or indices != list(range(indices[0], 5000)):
+            falhas.append("eventos rotacionados fora de ordem ou com lacunas")
+
+        # Consulta: tail (lê do fim) vs. filtro (varre o arquivo)
+        t_tail = medir(lambda i: query_events("bench", tmp, limit=20), 50)
+        t_scan = medir(lambda i: query_events("bench", tmp, limit=20, event="adicionar_info"), 5)
+        if [e["msg"] for e in query_events("bench", tmp, limit=2)] != \
+                [f"projeto {args.events - 2}: nota...", f"projeto {args.events - 1}: nota..."]:
+            falhas.append("tail não retornou os últimos eventos")
+
+    resultados = {
+        "open_append": percentiles(t_antigo),
+        "log_event": percentiles(t_novo),
+        "drain_seconds": drenagem,
+        "tail_20": percentiles(t_tail),
+        "scan_filter": percentiles(t_scan),
+        "failures": falhas,
+    }
+    for nome in ("open_append", "log_event", "tail_20", "scan_filter"):
+        r = resultados[nome]
+        print(f"{nome:<12} p50={r['p50_ms']:8.4f}ms  p95={r['p95_ms']:8.4f}ms  max={r['max_ms']:8.3f}ms")
+    print(f"fila drenada em {drenagem:.2f}s no encerramento ({args.events} eventos)")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"event_log_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "event_log", resultados, events=args.events)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
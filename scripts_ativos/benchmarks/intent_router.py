@@ -0,0 +1,187 @@
+"""
+Benchmark: roteamento de comandos do agente pessoal.
+
+1. Precisão: roteia as transcrições de ``intent_corpus.json`` pelo roteador
+   do ``4_personal_agent.py`` e confere intenção e slots esperados
+   (``"intent": null`` = deve cair no Claude Code)
+2. Custo por chamada conforme o número de intenções cresce, comparando:
+
+       indexado → ``IntentRouter.match`` (índice pela primeira palavra)
+       cadeia   → um ``re.match`` por padrão, em ordem (equivalente à antiga
+                  cadeia de ``startswith``)
+
+3. ``load_config`` recusa slots fixos com ``{slot}`` que algum padrão não
+   captura (antes viravam KeyError no meio do ``match``)
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/intent_router.py --intents 10 100 1000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, load_script, percentiles, write_results
+
+from hotkey_core.intent_router import IntentRouter, normalize_command
+
+CORPUS = Path(__file__).resolve().parent / "intent_corpus.json"
+
+
+def avaliar(agente, corpus) -> dict:
+    """Roteia cada caso do corpus e compara com o esperado."""
+    erros = []
+    for caso in corpus["cases"]:
+        m = agente.router.match(caso["text"])
+        obtido = m.name if m else None
+        ok = obtido == caso["intent"]
+        if ok and "slots" in caso:
+            ok = m.slots == caso["slots"]
+        if ok and "split" in caso:
+            ok = list(agente.separar_projeto(m.slots["alvo"])) == caso["split"]
+        if not ok:
+            erros.append({"text": caso["text"], "esperado": caso["intent"], "obtido": obtido,
+                          "slots": m.slots if m else None})
+    total = len(corpus["cases"])
+    return {"cases": total, "accuracy": round((total - len(erros)) / total, 4), "errors": erros}
+
+
+def verificar_config(tmp: Path) -> list:
+    """Slots fixos do JSON: montados a partir dos capturados ou recusados no load."""
+    falhas = []
+    router = IntentRouter()
+    router.register("consultar", ["consultar {projeto}"], lambda slots: None)
+    config = tmp / "intents.json"
+
+    validas = [
+        {"name": "status_site", "patterns": ["status do {projeto}", "como vai o {projeto}"],
+         "action": "consultar", "slots": {"projeto": "{projeto} pessoal"}},
+        {"name": "status_fixo", "patterns": ["status geral"], "action": "consultar",
+         "slots": {"base": "site", "projeto": "{base} pessoal"}},
+    ]
+    config.write_text(json.dumps(validas), encoding="utf-8")
+    try:
+        router.load_config(config)
+    except ValueError as e:
+        falhas.append(f"config válida recusada: {e}")
+    else:
+        for texto, esperado in [("status do blog", "blog pessoal"), ("status geral", "site pessoal")]:
+            m = router.match(texto)
+            if m is None or m.slots.get("projeto") != esperado:
+                falhas.append(f"{texto!r}: slots {m.slots if m else None}, esperado projeto={esperado!r}")
+
+    invalidas = {
+        "falta_em_um_padrao": (["status do {projeto}", "status de tudo"], {"projeto": "{projeto} pessoal"}),
+        "slot_opcional": (["status [do {projeto}]"], {"projeto": "{projeto} pessoal"}),
+        "slot_desconhecido": (["status do {projeto}"], {"projeto": "{nome} pessoal"}),
+        "posicional": (["status do {projeto}"], {"projeto": "{0} pessoal"}),
+        "malformado": (["status do {projeto}"], {"projeto": "{projeto pessoal"}),
+        "nao_texto": (["status do {projeto}"], {"projeto": 3}),
+    }
+    for nome, (padroes, slots) in invalidas.items():
+        config.write_text(json.dumps([{"name": nome, "patterns": padroes, "action": "consultar",
+                                       "slots": slots}]), encoding="utf-8")
+        try:
+            router.load_config(config)
+            falhas.append(f"{nome}: slots {slots} aceitos para {padroes}")
+        except ValueError as e:
+            if nome not in str(e):
+                falhas.append(f"{nome}: erro não cita a intenção: {e}")
+        if nome in router:
+            falhas.append(f"{nome}: intenção registrada mesmo recusada")
+    return falhas
+
+
+def roteador_sintetico(base: IntentRouter, n: int) -> IntentRouter:
+    """Cópia do roteador do agente com ``n`` intenções sintéticas a mais."""
+    router = IntentRouter()
+    for intent in base._intents.values():
+        router.register(intent.name, intent.patterns, intent.handler, intent.guard, intent.priority)
+    for i in range(n):
+        router.register(f"sintetica_{i}", [f"executar rotina {i} [agora] {{alvo}}", f"atalho numero {i}"],
+                        lambda slots: None)
+    return router
+
+
+def cadeia(router: IntentRouter):
+    """Padrões compilados um a um, na mesma ordem do roteador."""
+    indice, curingas = router._compilar()
+    todos = {c[0]: c[2] for lista in [curingas, *indice.values()] for c in lista}
+    padroes = [todos[i] for i in sorted(todos)]
+
+    def match(texto):
+        texto = normalize_command(texto)
+        for padrao in padroes:
+            m = padrao.match(texto)
+            if m:
+                return m
+        return None
+    return match
+
+
+def medir(fn, textos, repeat: int):
+    tempos = []
+    for _ in range(repeat):
+        for texto in textos:
+            t0 = time.perf_counter()
+            fn(texto)
+            tempos.append(time.perf_counter() - t0)
+    return percentiles(tempos)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do roteador de intenções")
+    parser.add_argument("--intents", type=int, nargs="+", default=[0, 10, 100, 1000],
+                        help="Intenções sintéticas adicionadas às do agente")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    corpus = json.loads(CORPUS.read_text(encoding="utf-8"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        falhas = verificar_config(Path(tmp))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        agente = load_script("4_personal_agent.py", Path(tmp), "personal_agent_bench")
+        for nome in corpus["projects"]:
+            agente.criar_projeto(nome, forcar=True)
+
+        precisao = avaliar(agente, corpus)
+        print(f"Precisão: {precisao['accuracy']:.1%} ({precisao['cases']} casos)")
+        for erro in precisao["errors"]:
+            print(f"  ✗ {erro['text']!r}: esperado {erro['esperado']}, obtido {erro['obtido']} {erro['slots']}")
+
+        textos = [caso["text"] for caso in corpus["cases"]]
+        escala = {}
+        for n in args.intents:
+            router = roteador_sintetico(agente.router, n)
+            escala[str(n)] = {
+                "indexado": medir(router.match, textos, args.repeat),
+                "cadeia": medir(cadeia(router), textos, args.repeat),
+            }
+            r = escala[str(n)]
+            print(f"+{n:<5} intenções  indexado p50={r['indexado']['p50_ms']:.4f}ms   "
+                  f"cadeia p50={r['cadeia']['p50_ms']:.4f}ms")
+
+        agente.project_index.close()
+        agente.note_search.close()
+
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"intent_router_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "intent_router", {"accuracy": precisao, "scaling": escala, "failures": falhas})
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,104 @@
+"""
+Verificação: CPU parada enquanto a tecla está pressionada.
+
+Simula, sem teclado, um pressionamento longo (``SyntheticEventSource.hold``)
+e espera com ``KeyWatcher`` como os scripts de voz fazem. Mede o tempo de CPU
+do processo (``time.process_time``) durante a espera:
+
+    event → wait_press/wait_release (o que os scripts usam)
+    busy  → ``while is_pressed(): pass`` (o laço antigo; só com ``--busy``)
+
+Também confere que o tempo máximo de gravação encerra a espera com a tecla
+ainda presa e que a liberação é vista logo depois de acontecer.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/key_state.py --seconds 10
+    python benchmarks/key_state.py --seconds 3 --busy
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, write_results
+
+from hotkey_core.key_state import KeyWatcher, SyntheticEventSource
+
+KEY = "f12"
+
+
+def segurar(seconds: float, busy: bool) -> dict:
+    """Segura a tecla por ``seconds`` e mede CPU e atraso até a liberação ser vista."""
+    fonte = SyntheticEventSource()
+    watcher = KeyWatcher(KEY, source=fonte)
+    thread = fonte.hold(KEY, seconds)
+    watcher.wait_press()
+
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    if busy:
+        while fonte.is_pressed(KEY):
+            pass
+        solto = True
+    else:
+        solto = watcher.wait_release(seconds + 5)
+    cpu, parede = time.process_time() - cpu0, time.perf_counter() - t0
+    thread.join()
+    watcher.close()
+    return {
+        "released": solto,
+        "wall_s": round(parede, 3),
+        "cpu_s": round(cpu, 4),
+        "cpu_ratio": round(cpu / parede, 4) if parede else 0.0,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="CPU durante um pressionamento longo simulado")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duração do pressionamento")
+    parser.add_argument("--max-cpu", type=float, default=0.02,
+                        help="Fração máxima de CPU aceitável durante a espera")
+    parser.add_argument("--busy", action="store_true", help="Mede também o laço de busy-wait antigo")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    resultados = {"event": segurar(args.seconds, busy=False)}
+    if args.busy:
+        resultados["busy"] = segurar(args.seconds, busy=True)
+
+    evento = resultados["event"]
+    if not evento["released"]:
+        falhas.append("liberação da tecla não foi vista")
+    if evento["cpu_ratio"] > args.max_cpu:
+        falhas.append(f"espera consumiu {evento['cpu_ratio']:.1%} de CPU (limite {args.max_cpu:.1%})")
+    if evento["wall_s"] > args.seconds + 0.2:
+        falhas.append(f"liberação vista {evento['wall_s'] - args.seconds:.2f}s depois de acontecer")
+
+    # Tecla presa: o tempo máximo encerra a espera mesmo sem liberação
+    fonte = SyntheticEventSource()
+    watcher = KeyWatcher(KEY, source=fonte, max_hold_seconds=0.2)
+    fonte.press(KEY)
+    t0 = time.perf_counter()
+    if watcher.wait_release() or not 0.15 < time.perf_counter() - t0 < 1.0:
+        falhas.append("max_hold_seconds não encerrou a espera com a tecla presa")
+    watcher.close()
+
+    for nome, r in resultados.items():
+        print(f"{nome:<5} {r['wall_s']:6.2f}s segurando  CPU={r['cpu_s'] * 1000:8.1f}ms ({r['cpu_ratio']:.2%})")
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"key_state_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "key_state", resultados, seconds=args.seconds)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,124 @@
+"""
+Benchmark: custo da instrumentação e exportação das métricas.
+
+Mede, por operação, ``span``, ``observe`` e ``inc`` com as métricas
+desligadas (padrão dos scripts) e ligadas, contra um laço vazio, e
+verifica a exportação de ponta a ponta: servidor de transcrição stub com
+métricas ligadas, algumas requisições e a leitura de
+``/metrics`` por HTTP e do arquivo texto Prometheus.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/metrics.py --ops 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, write_results
+
+from hotkey_core import metrics
+from hotkey_core.model_loader import BackgroundModelLoader
+from hotkey_core.transcription_server import StubModel, TranscriptionClient, TranscriptionServer
+
+
+def custo_ns(fn, ops: int) -> float:
+    """Nanossegundos por chamada (melhor de 3)."""
+    melhor = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter_ns()
+        for _ in range(ops):
+            fn()
+        melhor = min(melhor, (time.perf_counter_ns() - t0) / ops)
+    return melhor
+
+
+def medir_operacoes(ops: int) -> dict:
+    resultados = {}
+    base = custo_ns(lambda: None, ops)
+    for ligado in (False, True):
+        registry = metrics.Registry(enabled=ligado)
+        hist = registry.histogram("bench_seconds")
+        cont = registry.counter("bench_total")
+
+        def com_span():
+            with registry.span("bench_span"):
+                pass
+
+        modo = "enabled" if ligado else "disabled"
+        resultados[modo] = {
+            "span_ns": custo_ns(com_span, ops) - base,
+            "observe_ns": custo_ns(lambda: hist.observe(0.01), ops) - base,
+            "inc_labels_ns": custo_ns(lambda: cont.inc(intent="criar_projeto"), ops) - base,
+        }
+    return resultados
+
+
+def verificar_exportacao(tmp: Path) -> list:
+    falhas = []
+    arquivo = tmp / "metrics.prom"
+    registry = metrics.REGISTRY
+    registry.start_exporters(file=arquivo, port=0, interval=0.2)
+
+    loader = BackgroundModelLoader(StubModel, name="stub")
+    with TranscriptionServer(loader, port=0) as server:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, porta = server.address
+        cliente = TranscriptionClient(host, porta)
+        for segundos in (1, 2, 3):
+            cliente.transcribe(np.zeros(16000 * segundos, dtype=np.float32))
+        server.shutdown()
+
+    host, porta = registry.http_address
+    with urllib.request.urlopen(f"http://{host}:{porta}/metrics", timeout=5) as resposta:
+        texto = resposta.read().decode("utf-8")
+    for esperado in ('transcription_requests_total{cmd="transcribe",ok="True"} 3',
+                     "transcription_model_seconds_count 3",
+                     "transcription_audio_seconds_sum 6.000000"):
+        if esperado not in texto:
+            falhas.append(f"/metrics sem '{esperado}'")
+
+    time.sleep(0.5)
+    registry.stop_exporters()
+    if not arquivo.exists() or "transcription_model_seconds_count 3" not in arquivo.read_text(encoding="utf-8"):
+        falhas.append("arquivo Prometheus não gravado")
+    if "transcription_model_seconds" not in registry.summary():
+        falhas.append("resumo --stats sem o histograma do modelo")
+    return falhas
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark das métricas")
+    parser.add_argument("--ops", type=int, default=200000)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    resultados = medir_operacoes(args.ops)
+    with tempfile.TemporaryDirectory() as tmp:
+        resultados["failures"] = verificar_exportacao(Path(tmp))
+
+    for modo in ("disabled", "enabled"):
+        r = resultados[modo]
+        print(f"{modo:<9} span={r['span_ns']:7.0f}ns  observe={r['observe_ns']:7.0f}ns  "
+              f"inc(rótulo)={r['inc_labels_ns']:7.0f}ns")
+    for falha in resultados["failures"]:
+        print(f"✗ {falha}")
+    print("✓ exportação verificada" if not resultados["failures"] else f"✗ {len(resultados['failures'])} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"metrics_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "metrics", resultados, ops=args.ops)
+    if resultados["failures"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
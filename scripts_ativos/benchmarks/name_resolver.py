@@ -0,0 +1,118 @@
+"""
+Benchmark: resolução de nomes de projeto falados.
+
+Gera N nomes de projeto sintéticos, aplica erros típicos de transcrição
+(hífen removido, letra dobrada simplificada, acento perdido) e mede o custo
+por consulta do ``ProjectNameResolver`` e a taxa de acerto. Antes, confere
+pares que a chave fonética deve igualar (ç/ss/z → s, ch → x, qu → k...).
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/name_resolver.py --projects 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.name_resolver import ProjectNameResolver, phonetic_key
+
+PALAVRAS = [
+    "e-commerce", "site", "pessoal", "agente", "loja", "aplicativo", "ação",
+    "financeiro", "estoque", "blog", "portfólio", "chatbot", "relatório",
+    "vendas", "clientes", "marketing", "automação", "dashboard", "api", "mobile",
+]
+
+
+# Grafias que soam igual em português: mesma chave fonética
+PARES_FONETICOS = [
+    ("açúcar", "assucar"), ("maçã", "massa"), ("Caçador", "cassador"), ("cabeça", "cabessa"),
+    ("casa", "caza"), ("chatbot", "xatbot"), ("queijo", "keijo"), ("e-commerce", "ecomerce"),
+]
+
+
+def verificar() -> list:
+    falhas = []
+    for a, b in PARES_FONETICOS:
+        if phonetic_key(a) != phonetic_key(b):
+            falhas.append(f"phonetic_key({a!r}) = {phonetic_key(a)!r} ≠ phonetic_key({b!r}) = {phonetic_key(b)!r}")
+    resolver = ProjectNameResolver(["maçã verde", "site pessoal"])
+    match = resolver.resolve("massa verde")
+    if match is None or match.name != "maçã verde":
+        falhas.append(f"'massa verde' resolvido como {match}")
+    return falhas
+
+
+def gerar_nomes(n: int, rng: random.Random):
+    nomes = set()
+    while len(nomes) < n:
+        nomes.add(" ".join(rng.sample(PALAVRAS, 2)) + f" {rng.randint(1, 999)}")
+    return sorted(nomes)
+
+
+def distorcer(nome: str, rng: random.Random) -> str:
+    """Simula erros de transcrição comuns do Whisper."""
+    falado = nome.replace("-", rng.choice(["", " "]))
+    falado = falado.replace("mm", "m").replace("ss", "s")
+    return falado.replace("ç", "c").replace("ã", "a").replace("ó", "o")
+
+
+def truncar(nome: str, rng: random.Random) -> str:
+    """Remove uma letra: força o caminho por trigramas (sem match fonético exato)."""
+    i = rng.randrange(len(nome))
+    return nome[:i] + nome[i + 1:]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark da resolução de nomes de projeto")
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = verificar()
+    rng = random.Random(args.seed)
+    nomes = gerar_nomes(args.projects, rng)
+
+    t0 = time.perf_counter()
+    resolver = ProjectNameResolver(nomes)
+    construcao = time.perf_counter() - t0
+
+    resultados = {"build_ms": round(construcao * 1000, 3)}
+    print(f"Índice com {args.projects} nomes: {resultados['build_ms']:.1f}ms")
+
+    for cenario, erro in (("transcription", distorcer), ("missing_letter", truncar)):
+        tempos, acertos = [], 0
+        for _ in range(args.queries):
+            alvo = rng.choice(nomes)
+            falado = erro(alvo, rng)
+            t0 = time.perf_counter()
+            match = resolver.resolve(falado)
+            tempos.append(time.perf_counter() - t0)
+            acertos += bool(match and match.name == alvo)
+        resultados[cenario] = {"resolve": percentiles(tempos),
+                               "accuracy": round(acertos / args.queries, 4)}
+        r = resultados[cenario]
+        print(f"{cenario:<15} p50={r['resolve']['p50_ms']:.3f}ms "
+              f"p95={r['resolve']['p95_ms']:.3f}ms  acerto={r['accuracy']:.1%}")
+
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"name_resolver_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "name_resolver", resultados, projects=args.projects, queries=args.queries)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,117 @@
+"""
+Benchmark: notificações com um sink lento.
+
+Simula o F8 com um sink falso que leva ``--sink-delay`` segundos por toast
+(como a API de toast do Windows num dia ruim) e mede quanto o handler da
+hotkey fica preso nas três notificações de cada interação (abrir, executar,
+fechar):
+
+    sync     → sink chamado direto no handler (comportamento antigo)
+    dispatch → ``NotificationDispatcher.notify``
+
+E verifica que rajadas com a mesma chave se fundem, que a fila é limitada
+e que mensagens velhas são descartadas.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/notifications.py --presses 20 --sink-delay 0.2
+"""
+
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.notifications import Notification, NotificationDispatcher, NotificationSink
+
+
+class SinkLento(NotificationSink):
+    """Sink falso que demora ``delay`` segundos e guarda o que exibiu."""
+
+    name = "lento"
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.exibidas = []
+        self._lock = threading.Lock()
+
+    def show(self, notification):
+        time.sleep(self.delay)
+        with self._lock:
+            self.exibidas.append(notification)
+
+
+def interacao(notify) -> float:
+    """Um F8 completo: abre, executa e fecha, cada um com uma notificação."""
+    t0 = time.perf_counter()
+    notify("Claude Code", "Seletor de comandos aberto!", 2)
+    notify("Claude Code", "Executando comando: /review", 2)
+    notify("Claude Code", "Seletor fechado. Pressione F8 para reabrir.", 2)
+    return time.perf_counter() - t0
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do dispatcher de notificações")
+    parser.add_argument("--presses", type=int, default=20)
+    parser.add_argument("--sink-delay", type=float, default=0.2)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+    falhas = []
+
+    sink = SinkLento(args.sink_delay)
+    sync = [interacao(lambda t, m, d: sink.show(Notification(t, m, d)))
+            for _ in range(min(args.presses, 5))]
+
+    sink = SinkLento(args.sink_delay)
+    dispatcher = NotificationDispatcher(sink, min_interval=0.3, max_age=5.0)
+    dispatch = []
+    for _ in range(args.presses):
+        dispatch.append(interacao(dispatcher.notify))
+        time.sleep(0.05)  # Usuário apertando F8 em sequência
+    dispatcher.flush(10)
+    dispatcher.close()
+    if sink.exibidas and sink.exibidas[-1].message != "Seletor fechado. Pressione F8 para reabrir.":
+        falhas.append(f"última exibida não é a mais recente: {sink.exibidas[-1].message!r}")
+    if len(sink.exibidas) >= args.presses * 3:
+        falhas.append("rajada não foi fundida")
+
+    # Fila limitada: 20 chaves distintas com o sink travado
+    dispatcher = NotificationDispatcher(SinkLento(1.0), maxsize=4, min_interval=0.0)
+    for i in range(20):
+        dispatcher.notify(f"titulo {i}", "msg")
+    if dispatcher.pending() > 4:
+        falhas.append(f"fila passou do limite: {dispatcher.pending()}")
+    dispatcher.close(0.1)
+
+    # Mensagens velhas: atrás de um toast lento, expiram antes de aparecer
+    sink = SinkLento(0.5)
+    dispatcher = NotificationDispatcher(sink, min_interval=0.0, max_age=0.2)
+    dispatcher.notify("A", "primeira")
+    time.sleep(0.05)
+    dispatcher.notify("B", "velha")
+    dispatcher.flush(5)
+    if [n.message for n in sink.exibidas] != ["primeira"] or dispatcher.dropped != 1:
+        falhas.append(f"mensagem velha não descartada: {[n.message for n in sink.exibidas]}")
+    dispatcher.close()
+
+    resultados = {"sync": percentiles(sync), "dispatch": percentiles(dispatch), "failures": falhas}
+    for nome in ("sync", "dispatch"):
+        r = resultados[nome]
+        print(f"{nome:<9} p50={r['p50_ms']:9.3f}ms  max={r['max_ms']:9.3f}ms  (por F8)")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"notifications_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "notifications", resultados, presses=args.presses, sink_delay=args.sink_delay)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
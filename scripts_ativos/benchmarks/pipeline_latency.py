@@ -0,0 +1,188 @@
+"""
+Benchmark de latência ponta a ponta do pipeline voz → ação (Agente Pessoal).
+
+Reproduz um corpus de fixtures WAV pelo pipeline real de ``4_personal_agent.py``
+com hotkey, microfone e abertura do ``claude`` stubados, medindo cada etapa:
+
+    capture    → escrita dos blocos em um ring buffer do pool + view contígua
+    trim       → VAD / corte de silêncio
+    transcribe → model.transcribe
+    parse      → processar_comando (sem o tempo de launch)
+    launch     → abrir_claude_com_contexto (lançador de processos stubado)
+    total      → soma das etapas
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/pipeline_latency.py --stub --lengths 2 5 15
+    python benchmarks/pipeline_latency.py --models tiny base --corpus fixtures/
+    python benchmarks/pipeline_latency.py --stub --save-fixtures fixtures/
+
+Os resultados (p50/p95 por etapa, modelo e clipe) são gravados em JSON.
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, load_script, percentiles, read_wav, synthetic_clip, write_results, write_wav
+
+BLOCK_SIZE = 1024  # Tamanho típico de bloco entregue pelo sounddevice
+STAGES = ["capture", "trim", "transcribe", "parse", "launch", "total"]
+
+
+def load_corpus(args) -> List[Tuple[str, np.ndarray, str]]:
+    """Retorna lista de (nome, áudio, comando esperado) do corpus ou sintética."""
+    corpus = []
+    if args.corpus:
+        for wav in sorted(Path(args.corpus).glob("*.wav")):
+            transcript = wav.with_suffix(".txt")
+            texto = transcript.read_text(encoding="utf-8").strip() if transcript.exists() else ""
+            corpus.append((wav.name, read_wav(wav), texto))
+    else:
+        for i, segundos in enumerate(args.lengths):
+            corpus.append((f"synthetic_{segundos:g}s.wav", synthetic_clip(segundos, seed=i), ""))
+
+    if args.save_fixtures:
+        destino = Path(args.save_fixtures)
+        destino.mkdir(parents=True, exist_ok=True)
+        for nome, audio, _ in corpus:
+            write_wav(destino / nome, audio)
+        print(f"✓ {len(corpus)} fixtures salvas em {destino}")
+    return corpus
+
+
+def load_models(args) -> Dict[str, object]:
+    """Carrega os modelos pedidos (o stub não precisa de pesos)."""
+    modelos = {}
+    if args.stub:
+        from hotkey_core.transcription_server import StubModel
+        modelos["stub"] = StubModel()
+    for nome in args.models:
+        import whisper
+        t0 = time.perf_counter()
+        modelos[nome] = whisper.load_model(nome)
+        print(f"Modelo {nome} carregado em {time.perf_counter() - t0:.2f}s")
+    return modelos
+
+
+def run_once(agent, model, audio: np.ndarray, comando: str) -> Dict[str, float]:
+    """Executa o pipeline uma vez e retorna a duração (s) de cada etapa."""
+    tempos = {}
+
+    ring = agent.buffer_pool.acquire()
+    try:
+        t0 = time.perf_counter()
+        for ini in range(0, len(audio), BLOCK_SIZE):
+            ring.callback(audio[ini:ini + BLOCK_SIZE, None], BLOCK_SIZE, None, None)
+        dados = ring.view()
+        tempos["capture"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        if agent.VAD:
+            recorte = agent.trim_silence(dados, agent.SAMPLE_RATE)
+            if not recorte.is_silent:
+                dados = recorte.audio
+        tempos["trim"] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        texto = model.transcribe(dados, language="pt")["text"].strip()
+        tempos["transcribe"] = time.perf_counter() - t0
+    finally:
+        agent.buffer_pool.release(ring)
+
+    # Sem texto reconhecido (ex.: clipe sintético), usa o comando esperado do corpus
+    texto = texto or comando or "listar projetos"
+
+    launch = []
+    original = agent.abrir_claude_com_contexto
+
+    def abrir_cronometrado(t):
+        inicio = time.perf_counter()
+        original(t)
+        launch.append(time.perf_counter() - inicio)
+
+    agent.abrir_claude_com_contexto = abrir_cronometrado
+    try:
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent.processar_comando(texto)
+        dispatch = time.perf_counter() - t0
+    finally:
+        agent.abrir_claude_com_contexto = original
+
+    tempos["launch"] = sum(launch)
+    tempos["parse"] = dispatch - tempos["launch"]
+    tempos["total"] = sum(tempos[etapa] for etapa in STAGES[:-1])
+    return tempos
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de latência do pipeline de voz")
+    parser.add_argument("--corpus", help="Diretório com fixtures .wav (e .txt com o comando esperado)")
+    parser.add_argument("--lengths", type=float, nargs="+", default=[2, 5, 15],
+                        help="Durações dos clipes sintéticos (sem --corpus)")
+    parser.add_argument("--models", nargs="*", default=[], help="Modelos Whisper (tiny, base, small...)")
+    parser.add_argument("--stub", action="store_true", help="Inclui o modelo stub (sem pesos)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições por clipe")
+    parser.add_argument("--save-fixtures", help="Salva os clipes usados como WAV neste diretório")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    if not args.stub and not args.models:
+        parser.error("informe --models e/ou --stub")
+
+    with tempfile.TemporaryDirectory() as home:
+        agent = load_script("4_personal_agent.py", Path(home), "personal_agent")
+        # Nenhuma janela é aberta: o launch registra a ação mas não lança o processo
+        agent.process_launcher = types.SimpleNamespace(
+            launch=lambda *a, **k: types.SimpleNamespace(id=0),
+            launch_warm=lambda *a, **k: types.SimpleNamespace(id=0),
+        )
+
+        corpus = load_corpus(args)
+        modelos = load_models(args)
+
+        resultados = []
+        for nome_modelo, model in modelos.items():
+            agent.model = model
+            geral = {etapa: [] for etapa in STAGES}
+            for nome_clipe, audio, comando in corpus:
+                amostras = {etapa: [] for etapa in STAGES}
+                for _ in range(args.repeat):
+                    tempos = run_once(agent, model, audio, comando)
+                    for etapa in STAGES:
+                        amostras[etapa].append(tempos[etapa])
+                        geral[etapa].append(tempos[etapa])
+
+                resultados.append({
+                    "model": nome_modelo,
+                    "clip": nome_clipe,
+                    "clip_seconds": round(len(audio) / agent.SAMPLE_RATE, 3),
+                    "stages": {etapa: percentiles(v) for etapa, v in amostras.items()},
+                })
+                total = resultados[-1]["stages"]["total"]
+                print(f"{nome_modelo:>6} {nome_clipe:<24} total p50={total['p50_ms']:9.2f}ms "
+                      f"p95={total['p95_ms']:9.2f}ms")
+
+            resultados.append({
+                "model": nome_modelo,
+                "clip": "*",
+                "stages": {etapa: percentiles(v) for etapa, v in geral.items()},
+            })
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "pipeline_latency", resultados, repeat=args.repeat, block_size=BLOCK_SIZE)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
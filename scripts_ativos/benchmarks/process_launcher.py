@@ -0,0 +1,229 @@
+"""
+Benchmark: lançamento de sessões do Claude Code com um ``claude`` falso.
+
+Cria um executável ``claude`` que grava o próprio argv em JSON e sai com o
+código pedido, e o lança pelo ``ProcessLauncher`` com o backend headless:
+
+    launch   → tempo que ``launch`` segura a thread chamadora (hotkey/UI)
+    ready    → tempo até a sessão ter PID (Popen concluído)
+
+E verifica:
+    - o prompt chega como um único argumento, com aspas, ``&``, ``|``,
+      ``$()`` e ``;`` intactos (nada passa por shell)
+    - PID, início, fim e código de saída registrados por sessão
+    - o limite de sessões simultâneas recusa o excedente
+    - executável inexistente vira sessão "failed", sem exceção no chamador
+    - no Windows (``WindowsConsoleBackend.prepare``, sem abrir nada): o
+      ``claude.exe`` roda sem cmd, e a linha do ``claude.cmd`` passa pelas
+      duas análises do cmd (a da linha e a do ``%*`` do .cmd) e pelo parser
+      do CRT devolvendo o argv original, sem ``&``/``|``/``<``/``>`` soltos
+      nem ``%VAR%`` expandida (simulação simplificada do cmd)
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/process_launcher.py --launches 50
+"""
+
+import argparse
+import json
+import stat
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.process_launcher import HeadlessBackend, ProcessLauncher, WindowsConsoleBackend
+
+FAKE_CLAUDE = """#!{python}
+import json, os, sys, time
+saida = os.environ["FAKE_CLAUDE_OUT"]
+with open(os.path.join(saida, f"{{os.getpid()}}.json"), "w", encoding="utf-8") as f:
+    json.dump(sys.argv[1:], f)
+time.sleep(float(os.environ.get("FAKE_CLAUDE_SLEEP", "0")))
+sys.exit(int(os.environ.get("FAKE_CLAUDE_EXIT", "0")))
+"""
+
+PROMPT_PERIGOSO = 'diga "oi" & echo hacked | cat; $(rm -rf /tmp/x) `id` %PATH% \\o/'
+ARGV_WINDOWS = ["--dangerously-skip-permissions", '"', "/a&b", "a&b.md", "texto com %PATH% e x&y",
+                PROMPT_PERIGOSO, "^caret^ <in >out 2>&1 || (x)", "termina\\", "100% !x! ,;="]
+AMBIENTE_CMD = {"PATH": "C:\\Windows", "x": "X", "USERNAME": "eu"}
+
+
+def criar_claude_falso(diretorio: Path) -> Path:
+    caminho = diretorio / "claude"
+    caminho.write_text(FAKE_CLAUDE.format(python=sys.executable), encoding="utf-8")
+    caminho.chmod(caminho.stat().st_mode | stat.S_IXUSR)
+    return caminho
+
+
+def cmd_analisar(linha: str, expandir: bool) -> str:
+    """
+    Uma análise do cmd: expansão de ``%VAR%`` (se ``expandir``) e carets.
+
+    Raises:
+        ValueError: ``%VAR%`` definida ou ``&|<>`` fora de aspas sem escape
+    """
+    if expandir:
+        for i in (i for i, c in enumerate(linha) if c == "%"):
+            for var in AMBIENTE_CMD:
+                if linha[i + 1:].upper().startswith(var.upper() + "%"):
+                    raise ValueError(f"%{var}% seria expandida")
+    saida, aspas, i = [], False, 0
+    while i < len(linha):
+        c = linha[i]
+        if c == '"':
+            aspas = not aspas
+        elif c == "^" and not aspas:
+            i += 1
+            c = linha[i] if i < len(linha) else ""
+        elif c in "&|<>" and not aspas:
+            raise ValueError(f"{c!r} solto na posição {i}: {linha!r}")
+        saida.append(c)
+        i += 1
+    return "".join(saida)
+
+
+def crt_split(linha: str) -> list:
+    """argv como o CRT do Windows separa uma linha de comando."""
+    args, i, n = [], 0, len(linha)
+    while i < n:
+        while i < n and linha[i] in " \t":
+            i += 1
+        if i >= n:
+            break
+        arg, aspas = [], False
+        while i < n and (aspas or linha[i] not in " \t"):
+            if linha[i] == "\\":
+                j = i
+                while j < n and linha[j] == "\\":
+                    j += 1
+                if j < n and linha[j] == '"':
+                    arg.append("\\" * ((j - i) // 2))
+                    if (j - i) % 2:
+                        arg.append('"')
+                        j += 1
+                else:
+                    arg.append("\\" * (j - i))
+                i = j
+            elif linha[i] == '"':
+                aspas = not aspas
+                i += 1
+            else:
+                arg.append(linha[i])
+                i += 1
+        args.append("".join(arg))
+    return args
+
+
+def verificar_windows(tmp: Path) -> list:
+    """Metacaracteres do cmd no ``prepare`` do Windows (.exe direto e .cmd do npm)."""
+    falhas = []
+    backend = WindowsConsoleBackend()
+    for nome in ("claude.exe", "claude.cmd"):
+        executavel = tmp / nome
+        executavel.write_text("", encoding="utf-8")
+        executavel.chmod(executavel.stat().st_mode | stat.S_IXUSR)
+        comando, kwargs = backend.prepare([str(executavel), *ARGV_WINDOWS], "t")
+        if not kwargs.get("creationflags"):
+            falhas.append(f"{nome}: sem CREATE_NEW_CONSOLE")
+        if nome.endswith(".exe"):
+            if comando != [str(executavel), *ARGV_WINDOWS]:
+                falhas.append(f"{nome}: argv alterado ou passando pelo cmd: {comando!r}")
+            continue
+
+        prefixo = "cmd /d /s /k "
+        if not isinstance(comando, str) or not comando.startswith(prefixo + '"') or not comando.endswith('"'):
+            falhas.append(f"{nome}: linha inesperada: {comando!r}")
+            continue
+        try:
+            # /s: o cmd tira as aspas externas e analisa o resto
+            linha = cmd_analisar(comando[len(prefixo) + 1:-1], expandir=True)
+            programa, _, resto = linha.partition(" ")
+            # O .cmd repassa %* por mais uma análise (o texto substituído não é expandido de novo)
+            recebido = crt_split(cmd_analisar(resto, expandir=False))
+        except ValueError as e:
+            falhas.append(f"{nome}: {e}")
+            continue
+        if programa != str(executavel) or recebido != ARGV_WINDOWS:
+            falhas.append(f"{nome}: argv alterado pelo cmd: {programa!r} {recebido!r}")
+    return falhas
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do lançador de sessões")
+    parser.add_argument("--launches", type=int, default=50)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        claude = criar_claude_falso(tmp)
+        saida = tmp / "argv"
+        saida.mkdir()
+        env = {"FAKE_CLAUDE_OUT": str(saida)}
+
+        # Latência de launch/ready e registro das sessões
+        launcher = ProcessLauncher(HeadlessBackend(tmp / "logs"), max_concurrent=0)
+        tempos_launch, tempos_ready, sessoes = [], [], []
+        for i in range(args.launches):
+            t0 = time.perf_counter()
+            session = launcher.launch([claude, "--dangerously-skip-permissions", PROMPT_PERIGOSO],
+                                      title=f"bench {i}", env={**env, "FAKE_CLAUDE_EXIT": str(i % 3)})
+            tempos_launch.append(time.perf_counter() - t0)
+            while session.pid is None and session.running:
+                time.sleep(0.0005)
+            tempos_ready.append(time.perf_counter() - t0)
+            sessoes.append(session)
+        for session in sessoes:
+            session.wait(10)
+
+        for i, session in enumerate(sessoes):
+            if session.status != "exited" or session.returncode != i % 3:
+                falhas.append(f"sessão {session.id}: {session.status} código {session.returncode}")
+            elif not (session.pid and session.started_at and session.ended_at >= session.started_at):
+                falhas.append(f"sessão {session.id}: PID/horários não registrados")
+            recebido = json.loads((saida / f"{session.pid}.json").read_text(encoding="utf-8"))
+            if recebido != ["--dangerously-skip-permissions", PROMPT_PERIGOSO]:
+                falhas.append(f"sessão {session.id}: argv alterado: {recebido!r}")
+
+        # Limite de sessões simultâneas
+        launcher = ProcessLauncher(HeadlessBackend(), max_concurrent=2)
+        lentas = [launcher.launch([claude], env={**env, "FAKE_CLAUDE_SLEEP": "0.5"}) for _ in range(2)]
+        excedente = launcher.launch([claude], env=env)
+        if excedente is not None:
+            falhas.append("limite de sessões não respeitado")
+        for session in lentas:
+            session.wait(5)
+        if launcher.launch([claude], env=env) is None:
+            falhas.append("vaga não liberada após o fim das sessões")
+
+        # Executável inexistente
+        session = launcher.launch([tmp / "nao-existe"])
+        session.wait(5)
+        if session.status != "failed" or "não encontrado" not in session.error:
+            falhas.append(f"executável inexistente: {session.status} {session.error!r}")
+        launcher.shutdown(5)
+
+        falhas += verificar_windows(tmp)
+
+    resultados = {"launch": percentiles(tempos_launch), "ready": percentiles(tempos_ready), "failures": falhas}
+    for nome in ("launch", "ready"):
+        r = resultados[nome]
+        print(f"{nome:<7} p50={r['p50_ms']:8.3f}ms  p95={r['p95_ms']:8.3f}ms  max={r['max_ms']:8.3f}ms")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"process_launcher_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "process_launcher", resultados, launches=args.launches)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,134 @@
+"""
+Benchmark: pool de processos ``claude`` pré-aquecidos.
+
+Usa um ``claude`` falso que demora ``--startup`` segundos para "carregar"
+(como o Node do CLI) antes de ler o prompt do stdin, e mede o tempo entre o
+comando e o prompt ser atendido:
+
+    cold → sem processo pronto: a partida inteira cai sobre o usuário
+    warm → processo retirado do pool, já carregado
+
+Também verifica que o pool repõe os processos após cada retirada e que os
+ociosos são encerrados depois do ``idle_ttl``.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/process_pool.py --commands 10 --startup 0.4
+"""
+
+import argparse
+import stat
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.process_launcher import HeadlessBackend, ProcessLauncher
+from hotkey_core.process_pool import WarmProcessPool
+
+FAKE_CLAUDE = """#!{python}
+import os, sys, time
+time.sleep(float(os.environ["FAKE_CLAUDE_STARTUP"]))  # "Carregando módulos"
+prompt = sys.stdin.read()
+with open(os.path.join(os.environ["FAKE_CLAUDE_OUT"], f"{{os.getpid()}}.done"), "w", encoding="utf-8") as f:
+    f.write(f"{{time.time()}}\\n{{os.getcwd()}}\\n{{prompt}}")
+"""
+
+
+def esperar(condicao, timeout: float = 10.0) -> bool:
+    limite = time.monotonic() + timeout
+    while not condicao():
+        if time.monotonic() > limite:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def medir(launcher: ProcessLauncher, saida: Path, prompt: str, cwd: str):
+    """Lança um prompt e retorna (latência até ser atendido, conteúdo gravado pelo falso claude)."""
+    t0 = time.time()
+    session = launcher.launch_warm(prompt, cwd=cwd)
+    session.wait(30)
+    linhas = (saida / f"{session.pid}.done").read_text(encoding="utf-8").split("\n", 2)
+    return float(linhas[0]) - t0, session, linhas[1], linhas[2]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do pool de processos pré-aquecidos")
+    parser.add_argument("--commands", type=int, default=10)
+    parser.add_argument("--startup", type=float, default=0.4, help="Partida simulada do claude (s)")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        claude = tmp / "claude"
+        claude.write_text(FAKE_CLAUDE.format(python=sys.executable), encoding="utf-8")
+        claude.chmod(claude.stat().st_mode | stat.S_IXUSR)
+        saida = tmp / "out"
+        saida.mkdir()
+        projeto = tmp / "projeto"
+        projeto.mkdir()
+        env = {"FAKE_CLAUDE_OUT": str(saida), "FAKE_CLAUDE_STARTUP": str(args.startup)}
+
+        def novo_pool(size: int, idle_ttl: float = 600.0) -> WarmProcessPool:
+            return WarmProcessPool([claude, "-p"], size=size, cwd=str(projeto), env=env, idle_ttl=idle_ttl)
+
+        # A frio: pool vazio, toda retirada parte um processo novo
+        frio = novo_pool(0)
+        launcher = ProcessLauncher(HeadlessBackend(), max_concurrent=0, pool=frio)
+        cold = [medir(launcher, saida, f"comando {i}", str(projeto))[0] for i in range(args.commands)]
+
+        # Aquecido: 2 prontos, reposição entre um comando e outro
+        pool = novo_pool(2)
+        pool.start()
+        launcher = ProcessLauncher(HeadlessBackend(), max_concurrent=0, pool=pool)
+        warm = []
+        for i in range(args.commands):
+            if not esperar(lambda: len(pool) == 2):
+                falhas.append(f"pool não reposto antes do comando {i}")
+            time.sleep(args.startup * 1.5)  # Deixa os processos terminarem de "carregar"
+            latencia, session, cwd, prompt = medir(launcher, saida, f'prompt "{i}" & | ;', None)
+            warm.append(latencia)
+            if not session.warm:
+                falhas.append(f"comando {i} não usou processo aquecido")
+            if cwd != str(projeto) or prompt != f'prompt "{i}" & | ;':
+                falhas.append(f"comando {i}: cwd/prompt errados ({cwd!r}, {prompt!r})")
+        if not esperar(lambda: len(pool) == 2):
+            falhas.append("pool não reposto após o último comando")
+        pool.close()
+
+        # TTL: ociosos encerrados, e o pool volta a aquecer no próximo uso
+        pool = novo_pool(1, idle_ttl=0.5)
+        pool.start()
+        if not esperar(lambda: len(pool) == 1) or not esperar(lambda: len(pool) == 0 and pool.evicted == 1):
+            falhas.append(f"ociosos não encerrados pelo TTL (ociosos={len(pool)}, encerrados={pool.evicted})")
+        if pool.take() is not None:
+            falhas.append("take após o TTL devia partir a frio")
+        if not esperar(lambda: len(pool) == 1):
+            falhas.append("pool não voltou a aquecer após o uso")
+        pool.close()
+
+    resultados = {"cold": percentiles(cold), "warm": percentiles(warm), "failures": falhas}
+    for nome in ("cold", "warm"):
+        r = resultados[nome]
+        print(f"{nome:<5} p50={r['p50_ms']:8.1f}ms  p95={r['p95_ms']:8.1f}ms")
+    ganho = resultados["cold"]["p50_ms"] - resultados["warm"]["p50_ms"]
+    print(f"ganho na mediana: {ganho:.1f}ms (partida simulada de {args.startup * 1000:.0f}ms)")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"process_pool_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "process_pool", resultados, commands=args.commands, startup=args.startup)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
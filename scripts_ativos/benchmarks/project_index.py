@@ -0,0 +1,192 @@
+"""
+Benchmark: varredura de JSON por projeto vs. índice SQLite.
+
+Gera N projetos sintéticos (pasta + ``<projeto>.json`` com histórico) em um
+diretório temporário e compara, para listagem e resumo de contexto:
+
+    json_scan → iterdir() em PROJETOS_DIR + json.loads de cada metadado
+                (caminho antigo de listar_projetos/obter_contexto_projetos)
+    sqlite    → consultas no ProjectIndex (após migrate_from_json)
+
+Mede também ``sync_folders`` (roda a cada inicialização do agente) e confere
+que pastas criadas depois da migração entram no índice no próximo início.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/project_index.py --projects 10000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.project_index import ProjectIndex
+
+
+def gerar_projetos(raiz: Path, n: int, acoes: int):
+    """Cria a estrutura antiga (pastas + JSON) com ``n`` projetos."""
+    projetos_dir = raiz / "projetos"
+    metadata_dir = raiz / "metadata"
+    projetos_dir.mkdir()
+    metadata_dir.mkdir()
+    base = datetime(2024, 1, 1)
+    for i in range(n):
+        nome = f"projeto-{i:05d}"
+        (projetos_dir / nome).mkdir()
+        criado = base + timedelta(minutes=i)
+        metadata = {
+            "nome": nome,
+            "criado_em": criado.isoformat(),
+            "atualizado_em": (criado + timedelta(days=1)).isoformat(),
+            "arquivos": [str(projetos_dir / nome / f"{nome}.md")],
+            "acoes_historico": [
+                {"acao": "adicionar_info", "timestamp": (criado + timedelta(hours=h)).isoformat(),
+                 "detalhes": f"nota {h}"}
+                for h in range(acoes)
+            ],
+        }
+        (metadata_dir / f"{nome}.json").write_text(json.dumps(metadata, ensure_ascii=False), encoding="utf-8")
+    return projetos_dir, metadata_dir
+
+
+def contexto_json_scan(projetos_dir: Path, metadata_dir: Path) -> int:
+    """Reproduz o caminho antigo: iterdir + json.loads por projeto."""
+    total = 0
+    for d in projetos_dir.iterdir():
+        if not d.is_dir():
+            continue
+        metadata_file = metadata_dir / f"{d.name}.json"
+        if metadata_file.exists():
+            metadata = json.loads(metadata_file.read_text(encoding="utf-8"))
+            total += len(metadata.get("acoes_historico", []))
+    return total
+
+
+def contexto_sqlite(index: ProjectIndex) -> int:
+    return sum(p["acoes_count"] for p in index.summaries())
+
+
+def verificar(raiz: Path) -> list:
+    """Migração única do JSON (pulando os inválidos) + registro de pastas novas a cada inicialização."""
+    falhas = []
+    projetos_dir, metadata_dir = gerar_projetos(raiz, 3, 2)
+    (projetos_dir / "sem-json").mkdir()
+    # JSON corrompido (escrita interrompida) e JSON que não é um objeto
+    for nome, conteudo in (("corrompido", '{"nome": "corrompido", "acoes_'), ("lista", "[]")):
+        (projetos_dir / nome).mkdir()
+        (metadata_dir / f"{nome}.json").write_text(conteudo, encoding="utf-8")
+    db = raiz / "verificacao.db"
+
+    index = ProjectIndex(db)
+    try:
+        if index.migrate_from_json(metadata_dir) != 3:
+            falhas.append("migração não importou os 3 projetos com JSON válido")
+    except Exception as e:
+        falhas.append(f"migração interrompida por JSON inválido: {e!r}")
+    if index.sync_folders(projetos_dir) != 3 or not index.exists("sem-json"):
+        falhas.append("pastas sem JSON válido não foram registradas na primeira inicialização")
+    elif not index.exists("corrompido") or not index.exists("lista"):
+        falhas.append("pastas com JSON inválido não foram registradas por sync_folders")
+    index.close()
+
+    # Próxima inicialização: pasta criada fora do agente depois da migração
+    nova = projetos_dir / "criada-depois"
+    nova.mkdir()
+    (nova / "criada-depois.md").write_text("# criada-depois\n", encoding="utf-8")
+    index = ProjectIndex(db)
+    if index.migrate_from_json(metadata_dir) != 0:
+        falhas.append("migração do JSON rodou de novo")
+    if index.sync_folders(projetos_dir) != 1 or not index.exists("criada-depois"):
+        falhas.append("pasta criada depois da migração não foi registrada")
+    elif index.get("criada-depois")["arquivos"] != [str(nova / "criada-depois.md")]:
+        falhas.append(f"arquivos da pasta nova: {index.get('criada-depois')['arquivos']}")
+    if index.sync_folders(projetos_dir) != 0:
+        falhas.append("sync_folders registrou de novo pastas já conhecidas")
+    if index.get("projeto-00000")["acoes_count"] != 2:
+        falhas.append("sync_folders alterou um projeto importado do JSON")
+    index.close()
+    return falhas
+
+
+def medir(fn, repeat: int):
+    tempos = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - t0)
+    return percentiles(tempos)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do índice SQLite de projetos")
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--actions", type=int, default=10, help="Ações por projeto")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        falhas = verificar(Path(tmp))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raiz = Path(tmp)
+        print(f"Gerando {args.projects} projetos sintéticos...")
+        projetos_dir, metadata_dir = gerar_projetos(raiz, args.projects, args.actions)
+
+        index = ProjectIndex(raiz / "projects.db")
+        t0 = time.perf_counter()
+        index.migrate_from_json(metadata_dir)
+        migracao = time.perf_counter() - t0
+
+        resultados = {
+            "migration_ms": round(migracao * 1000, 3),
+            "sync_folders": medir(lambda: index.sync_folders(projetos_dir), args.repeat),
+            "list": {
+                "json_scan": medir(lambda: [d.name for d in projetos_dir.iterdir() if d.is_dir()], args.repeat),
+                "sqlite": medir(index.list_projects, args.repeat),
+            },
+            "context_summary": {
+                "json_scan": medir(lambda: contexto_json_scan(projetos_dir, metadata_dir), args.repeat),
+                "sqlite": medir(lambda: contexto_sqlite(index), args.repeat),
+            },
+            "single_project": {
+                "json_scan": medir(
+                    lambda: json.loads((metadata_dir / "projeto-00042.json").read_text(encoding="utf-8")),
+                    args.repeat),
+                "sqlite": medir(lambda: index.get("projeto-00042"), args.repeat),
+            },
+            "record_action": {
+                "sqlite": medir(
+                    lambda: index.record_action("projeto-00042", "adicionar_info",
+                                                datetime.now().isoformat(), "bench"),
+                    args.repeat),
+            },
+        }
+        index.close()
+
+    print(f"Migração: {resultados['migration_ms']:.1f}ms   "
+          f"sync_folders p50={resultados['sync_folders']['p50_ms']:.1f}ms")
+    for consulta in ("list", "context_summary", "single_project"):
+        r = resultados[consulta]
+        print(f"{consulta:<16} json_scan p50={r['json_scan']['p50_ms']:9.3f}ms   "
+              f"sqlite p50={r['sqlite']['p50_ms']:9.3f}ms")
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    saida = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"project_index_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(saida, "project_index", resultados, projects=args.projects, actions=args.actions)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,168 @@
+"""
+Verificação: transcrição em streaming com falas sobrepostas.
+
+No agente, cada fala tem o seu ``StreamingTranscriber``; a janela da fala
+nova começa a ser decodificada enquanto o pipeline ainda termina a anterior.
+Com o modelo local, as duas threads chamam o mesmo ``BackgroundModelLoader``.
+Um modelo falso que demora ``--decode`` segundos por janela acusa quando
+duas chamadas se sobrepõem, e o script mede quanto o lock custa:
+
+    serial     → as falas decodificadas uma depois da outra (referência)
+    overlapped → duas falas em streaming ao mesmo tempo, pelo mesmo loader
+    cancel     → fala descartada (fila cheia): ``cancel()`` volta na hora,
+                 as janelas pendentes não chegam ao modelo e o buffer é
+                 liberado quando o worker para
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/streaming.py --decode 0.05
+"""
+
+import argparse
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, synthetic_clip, write_results
+
+from hotkey_core.model_loader import BackgroundModelLoader
+from hotkey_core.streaming import StreamingTranscriber
+
+SAMPLE_RATE = 16000
+BLOCK_SIZE = 1024
+
+
+class ModeloVigiado:
+    """Modelo falso que registra quantas chamadas rodam ao mesmo tempo."""
+
+    def __init__(self, decode: float):
+        self.decode = decode
+        self.ativas = 0
+        self.max_ativas = 0
+        self.chamadas = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        with self._lock:
+            self.ativas += 1
+            self.chamadas += 1
+            self.max_ativas = max(self.max_ativas, self.ativas)
+        time.sleep(self.decode)
+        with self._lock:
+            self.ativas -= 1
+        return {"text": f"janela {len(audio) / SAMPLE_RATE:.1f}s"}
+
+
+def falar(loader, audio: np.ndarray) -> str:
+    """Alimenta o streaming bloco a bloco (sem esperar o tempo real) e finaliza."""
+    streamer = StreamingTranscriber(loader.transcribe, sample_rate=SAMPLE_RATE,
+                                    window_seconds=2.0, overlap_seconds=0.5)
+    for ini in range(0, len(audio), BLOCK_SIZE):
+        streamer.feed(audio[ini:ini + BLOCK_SIZE])
+    return streamer.finish(timeout=60)
+
+
+def verificar_cancel(decode: float, seconds: float) -> tuple:
+    """Cancela uma fala com a primeira janela no modelo e outras pendentes."""
+    falhas = []
+    modelo = ModeloVigiado(decode)
+    streamer = StreamingTranscriber(modelo.transcribe, sample_rate=SAMPLE_RATE,
+                                    window_seconds=2.0, overlap_seconds=0.5)
+    streamer.feed(synthetic_clip(seconds, seed=2))
+    limite = time.perf_counter() + 5
+    while not modelo.ativas and time.perf_counter() < limite:
+        time.sleep(0.001)
+
+    liberado = threading.Event()
+    liberacoes = []
+
+    def liberar():
+        liberacoes.append(threading.current_thread())
+        liberado.set()
+
+    t0 = time.perf_counter()
+    streamer.cancel(on_done=liberar)
+    retorno = time.perf_counter() - t0
+    if retorno > decode / 2:
+        falhas.append(f"cancel() bloqueou {retorno * 1000:.0f}ms")
+    if not liberado.wait(decode * 5):
+        falhas.append("on_done não foi chamado depois do cancel")
+    if modelo.chamadas != 1:
+        falhas.append(f"{modelo.chamadas} janelas decodificadas após o cancel, esperado só a que já rodava")
+
+    # Worker já parado: on_done roda na hora, na thread de quem cancelou
+    streamer.cancel(on_done=liberar)
+    if len(liberacoes) != 2 or liberacoes[-1] is not threading.current_thread():
+        falhas.append("cancel() com o worker parado não chamou on_done na hora")
+    return falhas, {"cancel_return_ms": round(retorno * 1000, 3), "cancel_calls": modelo.chamadas}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Verificação do streaming com falas sobrepostas")
+    parser.add_argument("--decode", type=float, default=0.05, help="Segundos por janela do modelo falso")
+    parser.add_argument("--seconds", type=float, default=6.0, help="Duração de cada fala")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    falas = [synthetic_clip(args.seconds, seed=i) for i in range(2)]
+
+    modelo = ModeloVigiado(args.decode)
+    loader = BackgroundModelLoader(lambda: modelo, name="vigiado")
+    loader.get()
+
+    t0 = time.perf_counter()
+    for audio in falas:
+        falar(loader, audio)
+    serial = time.perf_counter() - t0
+
+    # Duas falas em streaming ao mesmo tempo, como F12 solto e pressionado de novo
+    modelo.max_ativas = 0
+    textos = [None, None]
+
+    def rodar(i):
+        textos[i] = falar(loader, falas[i])
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=rodar, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sobreposto = time.perf_counter() - t0
+
+    if modelo.max_ativas != 1:
+        falhas.append(f"{modelo.max_ativas} transcrições simultâneas no mesmo modelo")
+    if not all(textos):
+        falhas.append(f"fala sem texto: {textos}")
+
+    falhas_cancel, cancel = verificar_cancel(max(args.decode, 0.2), args.seconds)
+    falhas += falhas_cancel
+
+    resultados = {
+        "serial_s": round(serial, 3),
+        "overlapped_s": round(sobreposto, 3),
+        "calls": modelo.chamadas,
+        "max_concurrent": modelo.max_ativas,
+        **cancel,
+        "failures": falhas,
+    }
+    print(f"serial={serial * 1000:.0f}ms  sobreposto={sobreposto * 1000:.0f}ms  "
+          f"máx. simultâneas={modelo.max_ativas}  cancel={cancel['cancel_return_ms']:.2f}ms")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"streaming_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "streaming", resultados, decode=args.decode, seconds=args.seconds)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,358 @@
+"""
+Benchmark: supervisor único vs. um processo por script (pm2).
+
+Sobe os plugins (launcher F8, agente F12, push-to-talk F9) de três formas e
+mede, em processos novos, o tempo até as hotkeys estarem armadas e a memória
+residente (RSS) somada:
+
+    multi  → um processo por script, em paralelo (como o ecosystem.config.js);
+             cada um é um supervisor de um plugin só, que paga sozinho o
+             interpretador, os imports, a thread de notificações e o backend
+    single → um supervisor com todos os plugins iniciados já
+    lazy   → um supervisor com os plugins carregados no primeiro uso; mede
+             também quanto o primeiro pressionamento de cada hotkey espera
+
+Teclado e microfone são simulados (``SyntheticEventSource`` e stubs de
+``keyboard``/``sounddevice``); a transcrição usa o modelo stub, então a
+economia do Whisper compartilhado (centenas de MB por processo que carrega o
+modelo local) não entra nos números. Também verifica que o hub mantém uma
+assinatura por tecla, que reiniciar um plugin não mexe nos outros, que um
+plugin que falha é reiniciado sozinho e que parar um plugin no meio de uma
+gravação não espera a tecla ser solta.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/supervisor.py --runs 3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+PLUGINS = ["launcher", "agent", "ptt"]
+
+PLUGIN_QUEBRADO = """
+from pathlib import Path
+MARCA = Path(__file__).with_suffix(".ok")
+
+def plugin_main(ctx):
+    if not MARCA.exists():
+        MARCA.write_text("1")
+        raise RuntimeError("falha na primeira partida")
+    ctx.mark_ready()
+    ctx.stopping.wait()
+"""
+
+# Como os plugins de voz: grava enquanto a tecla está presa, até 120 s
+PLUGIN_GRAVANDO = """
+from hotkey_core.key_state import KeyWatcher
+
+ESPERAS = []
+
+def plugin_main(ctx):
+    watcher = KeyWatcher("f6", source=ctx.keys, max_hold_seconds=120)
+    ctx.on_stop(watcher.cancel)
+    ctx.mark_ready()
+    try:
+        while not ctx.stopping.is_set():
+            if not watcher.wait_press(timeout=0.5):
+                continue
+            ESPERAS.append(watcher.wait_release())
+            watcher.wait_idle()
+    finally:
+        watcher.close()
+"""
+
+
+def rss_mb() -> float:
+    """Memória residente atual do processo, em MB."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linha in f:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource  # Fora do Linux: pico de RSS (ru_maxrss em KB)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# ==================== PROCESSO FILHO ====================
+
+def verificar(supervisor, fonte, plugins, home: Path) -> list:
+    """Verificações funcionais, rodadas dentro de um supervisor com tudo iniciado."""
+    from hotkey_core.supervisor import Plugin, SharedTranscriber
+
+    falhas = []
+    teclas = sorted(p.hotkey for p in plugins)
+    if supervisor.keys.keys() != teclas or len(fonte._subscribers) != len(teclas):
+        falhas.append(f"hub devia ter uma assinatura por tecla ({supervisor.keys.keys()}, "
+                      f"{len(fonte._subscribers)} na fonte)")
+
+    # Reiniciar o agente não toca no launcher nem no push-to-talk
+    outros = {p.name: p.module for p in plugins if p.name != "agent"}
+    if not supervisor.restart_plugin("agent") or not supervisor.plugins["agent"].ready.wait(30):
+        falhas.append("agente não voltou depois do restart")
+    agente = supervisor.plugins["agent"]
+    if agente.starts != 2 or agente.status != "running":
+        falhas.append(f"restart: agente com starts={agente.starts}, status={agente.status}")
+    for nome, module in outros.items():
+        plugin = supervisor.plugins[nome]
+        if plugin.module is not module or plugin.status != "running":
+            falhas.append(f"restart do agente afetou {nome} (status {plugin.status})")
+    if supervisor.keys.keys() != teclas:
+        falhas.append(f"assinaturas perdidas no restart: {supervisor.keys.keys()}")
+
+    # Push-to-talk abre o Claude com argv em lista: o texto falado não vira shell
+    from hotkey_core.process_launcher import claude_argv
+
+    lancados = []
+    ptt = supervisor.plugins["ptt"].module
+    ptt.process_launcher = types.SimpleNamespace(launch=lambda argv, **kw: lancados.append(argv) or object())
+    falado = 'liste os arquivos & apague "tudo" | mais'
+    ptt.abrir_claude(falado)
+    if lancados != [claude_argv(falado)]:
+        falhas.append(f"push-to-talk lançou {lancados}, esperado {claude_argv(falado)}")
+
+    # Agente e push-to-talk transcrevendo juntos: uma chamada por vez no modelo
+    class Modelo:
+        ativas = maximo = 0
+
+        def transcribe(self, audio, **kwargs):
+            Modelo.ativas += 1
+            Modelo.maximo = max(Modelo.maximo, Modelo.ativas)
+            time.sleep(0.02)
+            Modelo.ativas -= 1
+            return {"text": ""}
+
+    compartilhado = SharedTranscriber(Modelo)
+    falantes = [threading.Thread(target=compartilhado.transcribe, args=(b"",)) for _ in range(4)]
+    for falante in falantes:
+        falante.start()
+    for falante in falantes:
+        falante.join()
+    if Modelo.maximo != 1:
+        falhas.append(f"SharedTranscriber deixou {Modelo.maximo} transcrições simultâneas")
+
+    # Um plugin que falha na partida é reiniciado sozinho
+    script = home / "plugin_quebrado.py"
+    script.write_text(PLUGIN_QUEBRADO, encoding="utf-8")
+    quebrado = Plugin("quebrado", script, "f7", lazy=False)
+    supervisor.plugins["quebrado"] = quebrado
+    supervisor.restart_delay = 0.1
+    supervisor.start_plugin("quebrado")
+    limite = time.monotonic() + 10
+    while quebrado.status != "running" and time.monotonic() < limite:
+        time.sleep(0.01)
+    if quebrado.status != "running" or quebrado.starts != 2:
+        falhas.append(f"autorestart: status={quebrado.status}, starts={quebrado.starts}, erro={quebrado.error}")
+
+    # Parar um plugin no meio de uma gravação não espera a tecla ser solta
+    script = home / "plugin_gravando.py"
+    script.write_text(PLUGIN_GRAVANDO, encoding="utf-8")
+    gravando = Plugin("gravando", script, "f6", lazy=False)
+    supervisor.plugins["gravando"] = gravando
+    supervisor.start_plugin("gravando")
+    gravando.ready.wait(10)
+    fonte.press("f6")
+    time.sleep(0.2)  # Plugin já bloqueado em wait_release
+    t0 = time.perf_counter()
+    parou = supervisor.stop_plugin("gravando", timeout=5)
+    segundos = time.perf_counter() - t0
+    fonte.release("f6")
+    if not parou or gravando.status != "stopped" or segundos > 1:
+        falhas.append(f"stop durante gravação: parou={parou}, status={gravando.status}, {segundos:.2f}s")
+    elif gravando.module.ESPERAS != [True]:
+        falhas.append(f"stop durante gravação: esperas do plugin {gravando.module.ESPERAS}")
+    return falhas
+
+
+def marcar(linha: str) -> None:
+    """Escreve uma linha para o pai em uma única chamada (prints dos plugins não a quebram)."""
+    sys.stdout.write(f"\n{linha}\n")
+    sys.stdout.flush()
+
+
+def filho(args) -> None:
+    """Sobe um supervisor com os plugins pedidos e informa tempo e memória."""
+    os.environ["HOME"] = os.environ["USERPROFILE"] = args.home
+    for nome in ("sounddevice", "keyboard"):
+        sys.modules[nome] = types.ModuleType(nome)  # Sem microfone e sem hook global
+
+    from hotkey_core.key_state import SyntheticEventSource
+    from hotkey_core.notifications import NotificationDispatcher, NullSink
+    from hotkey_core.supervisor import (
+        DEFAULT_PLUGINS, KeyHub, Plugin, SharedTranscriber, Supervisor, transcription_backend,
+    )
+
+    fonte = SyntheticEventSource()
+    plugins = [
+        Plugin(nome, SCRIPTS_DIR / DEFAULT_PLUGINS[nome][0], DEFAULT_PLUGINS[nome][1], lazy=args.lazy)
+        for nome in args.child.split(",")
+    ]
+    supervisor = Supervisor(
+        plugins,
+        keys=KeyHub(fonte),
+        notifier=NotificationDispatcher(NullSink()),
+        transcriber=SharedTranscriber(lambda: transcription_backend("stub")),
+    )
+    supervisor.start()
+    if not args.lazy:
+        for plugin in plugins:
+            plugin.ready.wait(60)
+    marcar("PRONTO")  # O pai mede a partida até aqui
+
+    resultado = {"rss_mb": round(rss_mb(), 1), "cpu_s": round(time.process_time(), 3)}
+    if args.lazy:
+        # Primeiro uso: o pressionamento carrega o plugin (soltar já, para não gravar)
+        primeiro = {}
+        for plugin in plugins:
+            t0 = time.perf_counter()
+            fonte.press(plugin.hotkey)
+            fonte.release(plugin.hotkey)
+            plugin.ready.wait(60)
+            primeiro[plugin.name] = time.perf_counter() - t0
+        resultado["first_press_s"] = primeiro
+        resultado["rss_after_first_use_mb"] = round(rss_mb(), 1)
+    resultado["status"] = {p.name: p.status for p in plugins}
+    resultado["errors"] = {p.name: p.error for p in plugins if p.error}
+    if args.checks:
+        resultado["failures"] = verificar(supervisor, fonte, plugins, Path(args.home))
+    supervisor.shutdown()
+    marcar("RESULTADO " + json.dumps(resultado))
+
+
+# ==================== PROCESSO PAI ====================
+
+def subir(plugins: str, home: Path, lazy: bool = False, checks: bool = False) -> subprocess.Popen:
+    argv = [sys.executable, str(Path(__file__).resolve()), "--child", plugins, "--home", str(home)]
+    if lazy:
+        argv.append("--lazy")
+    if checks:
+        argv.append("--checks")
+    return subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding="utf-8", cwd=SCRIPTS_DIR)
+
+
+def colher(proc: subprocess.Popen, t0: float):
+    """Lê a saída do filho: (segundos até PRONTO, dicionário do RESULTADO, saída completa)."""
+    pronto, resultado, saida = None, None, []
+    for linha in proc.stdout:
+        saida.append(linha)
+        if linha.startswith("PRONTO") and pronto is None:
+            pronto = time.perf_counter() - t0
+        elif linha.startswith("RESULTADO "):
+            resultado = json.loads(linha[len("RESULTADO "):])
+    proc.wait()
+    return pronto, resultado, "".join(saida)
+
+
+def rodada(modo: str, home: Path, checks: bool = False) -> dict:
+    """Sobe os processos de um modo e soma memória/CPU; a partida é a do último a ficar pronto."""
+    t0 = time.perf_counter()
+    if modo == "multi":
+        procs = [subir(nome, home) for nome in PLUGINS]
+    else:
+        procs = [subir(",".join(PLUGINS), home, lazy=modo == "lazy", checks=checks)]
+    # Uma thread por filho: o PRONTO de cada um é registrado quando chega
+    colhidos = [None] * len(procs)
+
+    def ler(i, proc):
+        colhidos[i] = colher(proc, t0)
+
+    leitores = [threading.Thread(target=ler, args=(i, proc)) for i, proc in enumerate(procs)]
+    for leitor in leitores:
+        leitor.start()
+    for leitor in leitores:
+        leitor.join()
+    for pronto, resultado, saida in colhidos:
+        if pronto is None or resultado is None:
+            raise RuntimeError(f"processo do modo {modo} não terminou direito:\n{saida}")
+    resultados = [r for _, r, _ in colhidos]
+    soma = {
+        "processes": len(procs),
+        "ready_s": max(p for p, _, _ in colhidos),
+        "rss_mb": round(sum(r["rss_mb"] for r in resultados), 1),
+        "cpu_s": round(sum(r["cpu_s"] for r in resultados), 3),
+        "status": {k: v for r in resultados for k, v in r["status"].items()},
+        "errors": {k: v for r in resultados for k, v in r["errors"].items()},
+        "failures": [f for r in resultados for f in r.get("failures", [])],
+    }
+    if modo == "lazy":
+        soma["first_press_s"] = resultados[0]["first_press_s"]
+        soma["rss_after_first_use_mb"] = resultados[0]["rss_after_first_use_mb"]
+    return soma
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do supervisor de plugins")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--home", help=argparse.SUPPRESS)
+    parser.add_argument("--lazy", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--checks", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        filho(args)
+        return
+
+    falhas = []
+    rodadas = {"multi": [], "single": [], "lazy": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.runs):
+            for modo in rodadas:
+                # Cada rodada em um HOME novo: o catálogo/índices começam frios
+                home = Path(tmp) / f"{modo}_{i}"
+                home.mkdir()
+                r = rodada(modo, home, checks=(modo == "single" and i == 0))
+                rodadas[modo].append(r)
+                falhas += r["failures"]
+                for nome, status in r["status"].items():
+                    if status != "running":
+                        falhas.append(f"{modo}: plugin {nome} terminou em {status} ({r['errors'].get(nome)})")
+
+    resultados = {"failures": falhas}
+    for modo, lista in rodadas.items():
+        resultados[modo] = {
+            "processes": lista[0]["processes"],
+            "ready": percentiles([r["ready_s"] for r in lista]),
+            "rss_mb": round(sorted(r["rss_mb"] for r in lista)[len(lista) // 2], 1),
+            "cpu_s": round(sorted(r["cpu_s"] for r in lista)[len(lista) // 2], 3),
+        }
+        print(f"{modo:<6} {lista[0]['processes']} proc  pronto p50={resultados[modo]['ready']['p50_ms']:7.1f}ms  "
+              f"RSS={resultados[modo]['rss_mb']:6.1f}MB  CPU={resultados[modo]['cpu_s']:.2f}s")
+    primeiro = {nome: percentiles([r["first_press_s"][nome] for r in rodadas["lazy"]]) for nome in PLUGINS}
+    resultados["lazy"]["first_press"] = primeiro
+    resultados["lazy"]["rss_after_first_use_mb"] = rodadas["lazy"][-1]["rss_after_first_use_mb"]
+    for nome, r in primeiro.items():
+        print(f"  lazy: primeiro {nome} espera p50={r['p50_ms']:.1f}ms")
+
+    if resultados["single"]["rss_mb"] >= resultados["multi"]["rss_mb"]:
+        falhas.append(f"supervisor não economizou memória ({resultados['single']['rss_mb']}MB "
+                      f"vs {resultados['multi']['rss_mb']}MB)")
+    if resultados["lazy"]["rss_mb"] >= resultados["single"]["rss_mb"]:
+        falhas.append("modo preguiçoso devia partir com menos memória que o ansioso")
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"supervisor_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "supervisor", resultados, runs=args.runs)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
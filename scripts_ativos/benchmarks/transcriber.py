@@ -0,0 +1,177 @@
+"""
+Benchmark: backends de transcrição (latência e WER).
+
+Carrega cada backend pedido a partir dos pesos locais e transcreve um corpus
+de fixtures (pares ``nome.wav`` + ``nome.txt`` com a transcrição esperada, o
+mesmo formato de ``pipeline_latency.py --corpus``), medindo:
+
+    load    → carregar (e, no int8, quantizar) o modelo
+    latency → p50/p95 por clipe e fator de tempo real (decode / duração do áudio)
+    wer     → erros de palavra / palavras das referências, no corpus inteiro
+
+Backends sem a dependência instalada ou sem os pesos no disco são pulados com
+aviso (nada é baixado). Sem ``--corpus`` usa clipes sintéticos, que não têm
+fala: só a latência é comparada.
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/transcriber.py --corpus fixtures/ --models tiny base
+    python benchmarks/transcriber.py --backends whisper whisper-int8 --model-dir pesos/
+    python benchmarks/transcriber.py --backends stub
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, percentiles, read_wav, synthetic_clip, word_errors, write_results
+
+from hotkey_core.transcriber import BACKENDS, DEFAULT_MODEL, StubTranscriber, load_transcriber
+
+SAMPLE_RATE = 16000
+
+
+def load_corpus(args):
+    """Retorna lista de (nome, áudio, transcrição esperada)."""
+    if args.corpus:
+        corpus = []
+        for wav in sorted(Path(args.corpus).glob("*.wav")):
+            transcript = wav.with_suffix(".txt")
+            texto = transcript.read_text(encoding="utf-8").strip() if transcript.exists() else ""
+            corpus.append((wav.name, read_wav(wav), texto))
+        return corpus
+    return [(f"synthetic_{s:g}s.wav", synthetic_clip(s, seed=i), "") for i, s in enumerate(args.lengths)]
+
+
+def verificar() -> list:
+    """Checagens que não dependem do Whisper instalado."""
+    falhas = []
+    for ref, hip, esperado in [
+        ("criar projeto alfa", "Criar projeto Alfa.", (0, 3)),
+        ("criar projeto alfa", "criar o projeto", (2, 3)),
+        ("adicionar ao projeto", "", (3, 3)),
+    ]:
+        if word_errors(ref, hip) != esperado:
+            falhas.append(f"WER({ref!r}, {hip!r}) = {word_errors(ref, hip)}, esperado {esperado}")
+
+    stub = load_transcriber("stub")
+    audio = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    if not isinstance(stub, StubTranscriber) or stub.transcribe(audio) != stub.transcribe(audio):
+        falhas.append("stub não é determinístico")
+    try:
+        load_transcriber("inexistente")
+        falhas.append("backend desconhecido devia ser recusado")
+    except ValueError:
+        pass
+
+    # Offline: sem os pesos no diretório, falha na hora em vez de tentar baixar
+    with tempfile.TemporaryDirectory() as vazio:
+        for backend in ("whisper", "whisper-int8"):
+            try:
+                load_transcriber(backend, "base", vazio)
+                falhas.append(f"{backend} carregou sem pesos em {vazio}")
+            except FileNotFoundError:
+                pass
+    return falhas
+
+
+def medir(transcriber, corpus, repeat: int) -> dict:
+    """Transcreve o corpus ``repeat`` vezes e junta latência e WER."""
+    transcriber.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="pt")  # Warm-up
+    latencias, decode, audio_total = [], 0.0, 0.0
+    erros = palavras = 0
+    clipes = []
+    for nome, audio, referencia in corpus:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            texto = transcriber.transcribe(audio, language="pt")["text"].strip()
+            segundos = time.perf_counter() - t0
+            latencias.append(segundos)
+            decode += segundos
+            audio_total += len(audio) / SAMPLE_RATE
+        clipe = {"name": nome, "hypothesis": texto}
+        if referencia:
+            e, n = word_errors(referencia, texto)
+            erros, palavras = erros + e, palavras + n
+            clipe.update(reference=referencia, errors=e, words=n)
+        clipes.append(clipe)
+    return {
+        "latency": percentiles(latencias),
+        "rtf": round(decode / audio_total, 4) if audio_total else None,
+        "wer": round(erros / palavras, 4) if palavras else None,
+        "clips": clipes,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de transcrição")
+    parser.add_argument("--corpus", help="Diretório com .wav + .txt (transcrição esperada)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--models", nargs="+", default=[DEFAULT_MODEL], help="Tamanhos ou caminhos .pt")
+    parser.add_argument("--model-dir", help="Diretório dos pesos (padrão: cache do Whisper)")
+    parser.add_argument("--lengths", type=float, nargs="+", default=[2.0, 5.0], help="Clipes sintéticos (s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = verificar()
+    corpus = load_corpus(args)
+    if not corpus:
+        parser.error(f"nenhum .wav em {args.corpus}")
+    if not any(ref for _, _, ref in corpus):
+        print("Aviso: corpus sem transcrições esperadas, WER não será calculado.")
+
+    resultados = {}
+    for backend in args.backends:
+        for model in (["stub"] if backend == "stub" else args.models):
+            chave = f"{backend}:{model}"
+            t0 = time.perf_counter()
+            try:
+                transcriber = load_transcriber(backend, model, args.model_dir)
+            except (ImportError, FileNotFoundError) as e:
+                print(f"Aviso: {chave} pulado: {e}")
+                resultados[chave] = {"skipped": str(e)}
+                continue
+            r = {"load_s": round(time.perf_counter() - t0, 3), **medir(transcriber, corpus, args.repeat)}
+            resultados[chave] = r
+            wer = f"{r['wer']:.1%}" if r["wer"] is not None else "-"
+            print(f"{chave:<22} load={r['load_s']:6.2f}s  p50={r['latency']['p50_ms']:9.1f}ms  "
+                  f"p95={r['latency']['p95_ms']:9.1f}ms  RTF={r['rtf']:.3f}  WER={wer}")
+            del transcriber
+            gc.collect()  # Libera os pesos antes do próximo modelo
+
+    # int8 vs. precisão total, por modelo
+    for model in args.models:
+        base, q = resultados.get(f"whisper:{model}"), resultados.get(f"whisper-int8:{model}")
+        if not base or not q or "skipped" in base or "skipped" in q:
+            continue
+        ganho = base["latency"]["p50_ms"] / q["latency"]["p50_ms"]
+        comparacao = {"speedup_p50": round(ganho, 2)}
+        linha = f"{model}: int8 {ganho:.2f}x mais rápido na mediana"
+        if base["wer"] is not None:
+            comparacao["wer_delta"] = round(q["wer"] - base["wer"], 4)
+            linha += f", WER {base['wer']:.1%} → {q['wer']:.1%}"
+        resultados[f"int8_vs_fp32:{model}"] = comparacao
+        print(linha)
+
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"transcriber_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "transcriber", resultados, corpus=args.corpus or "synthetic",
+                  clips=len(corpus), repeat=args.repeat)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
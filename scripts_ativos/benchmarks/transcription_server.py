@@ -0,0 +1,125 @@
+"""
+Verificação: limites e queda do servidor de transcrição.
+
+Sobe ``TranscriptionServer`` com o modelo stub numa porta livre e confere:
+
+    limit    → cabeçalho com mais amostras que ``max_seconds`` (ou negativo) é
+               recusado na hora, sem o servidor tentar ler o PCM
+    fallback → com o servidor fora do ar, o cliente passa para o modelo local
+    error    → sem ``fallback``, o cliente levanta ``ConnectionError`` claro
+
+Também mede a ida e volta de uma transcrição pelo socket (modelo stub).
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/transcription_server.py --requests 50
+"""
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, percentiles, write_results
+
+from hotkey_core.model_loader import BackgroundModelLoader
+from hotkey_core.transcription_server import StubModel, TranscriptionClient, TranscriptionServer
+
+SAMPLE_RATE = 16000
+
+
+def pedir_cru(host: str, porta: int, cabecalho: dict, timeout: float = 2.0) -> dict:
+    """Manda só o cabeçalho (sem PCM) e devolve a resposta do servidor."""
+    with socket.create_connection((host, porta), timeout=timeout) as sock:
+        sock.sendall((json.dumps(cabecalho) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline().decode("utf-8"))
+
+
+def porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Limites e queda do servidor de transcrição")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duração de cada clipe")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    resultados = {}
+    audio = np.zeros(int(args.seconds * SAMPLE_RATE), dtype=np.float32)
+
+    server = TranscriptionServer(BackgroundModelLoader(StubModel, name="stub"), port=0, max_seconds=10)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, porta = server.address
+    cliente = TranscriptionClient(host, porta, fallback=lambda: BackgroundModelLoader(StubModel, name="local"))
+
+    tempos = []
+    for _ in range(args.requests):
+        t0 = time.perf_counter()
+        cliente.transcribe(audio, language="pt")
+        tempos.append(time.perf_counter() - t0)
+    resultados["roundtrip"] = percentiles(tempos)
+
+    # Cabeçalhos fora do limite: resposta imediata, sem esperar o PCM
+    for nome, amostras in (("oversized", 11 * SAMPLE_RATE), ("huge", 2**40), ("negative", -1)):
+        t0 = time.perf_counter()
+        try:
+            resposta = pedir_cru(host, porta, {"cmd": "transcribe", "samples": amostras})
+        except OSError as e:
+            resposta = {"ok": None, "error": repr(e)}
+        resultados[f"limit_{nome}_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        if resposta.get("ok") is not False or "limite" not in resposta.get("error", ""):
+            falhas.append(f"limit: {amostras} amostras não foram recusadas ({resposta})")
+    if cliente.transcribe(audio).get("text") != f"stub {args.seconds:.2f}s":
+        falhas.append("limit: servidor parou de atender depois de recusar pedidos")
+
+    # Servidor cai no meio da sessão: o cliente passa para o modelo local
+    server.shutdown()
+    server.server_close()
+    try:
+        texto = cliente.transcribe(audio).get("text")
+        if not cliente.local or texto != f"stub {args.seconds:.2f}s":
+            falhas.append(f"fallback: cliente não passou para o modelo local ({texto!r})")
+    except Exception as e:
+        falhas.append(f"fallback: transcrição falhou com o servidor fora do ar: {e!r}")
+
+    # Sem fallback: erro claro em vez de um OSError cru
+    sem_fallback = TranscriptionClient("127.0.0.1", porta_livre(), timeout=2)
+    try:
+        sem_fallback.transcribe(audio)
+        falhas.append("error: transcrição sem servidor e sem fallback não falhou")
+    except ConnectionError as e:
+        resultados["error_message"] = str(e)
+        if "indisponível" not in str(e):
+            falhas.append(f"error: mensagem pouco clara: {e}")
+    except Exception as e:
+        falhas.append(f"error: esperado ConnectionError, veio {e!r}")
+
+    r = resultados["roundtrip"]
+    print(f"ida e volta ({args.seconds:.0f}s de áudio) p50={r['p50_ms']:.3f}ms p95={r['p95_ms']:.3f}ms")
+    print(f"recusa acima do limite: {resultados['limit_huge_ms']:.3f}ms")
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"transcription_server_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "transcription_server", resultados, requests=args.requests, seconds=args.seconds)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,166 @@
+"""
+Verificação: VAD e corte de silêncio em áudio sintético.
+
+Monta clipes com trechos conhecidos de ruído baixo e "fala" (tom modulado,
+como em ``synthetic_clip``) e confere o que ``trim_silence`` faz com eles:
+
+    silence  → silêncio puro e ruído baixo são rejeitados (``is_silent``)
+    edges    → silêncio do início e do fim é removido, preservando a margem
+    pauses   → pausas longas separam trechos; pausas curtas ficam no trecho
+    seconds  → ``kept_seconds``/``removed_seconds`` batem com o áudio devolvido
+
+As posições esperadas valem para os parâmetros padrão de ``detect_speech``
+(frames de 30 ms, margem de 150 ms, pausas acima de 600 ms separam trechos).
+
+Uso (a partir de scripts_ativos/):
+    python benchmarks/vad.py
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from bench_utils import SCRIPTS_DIR, write_results
+
+from hotkey_core.vad import trim_silence
+
+SAMPLE_RATE = 16000
+PADDING = 0.15       # padding_ms padrão de detect_speech
+KEEP_PAUSE = 0.3     # keep_pause_ms padrão de trim_silence
+TOLERANCIA = 0.065   # Cada borda arredonda para um frame de 30 ms
+
+
+def montar(partes, seed: int = 0) -> np.ndarray:
+    """Concatena trechos ``("fala"|"silencio", segundos)`` sobre ruído baixo."""
+    rng = np.random.default_rng(seed)
+    blocos = []
+    for tipo, segundos in partes:
+        n = int(segundos * SAMPLE_RATE)
+        bloco = rng.normal(0, 0.002, n).astype(np.float32)
+        if tipo == "fala":
+            t = np.arange(n) / SAMPLE_RATE
+            envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)
+            bloco += (0.2 * envelope * np.sin(2 * np.pi * 180 * t)).astype(np.float32)
+        blocos.append(bloco)
+    return np.concatenate(blocos)
+
+
+def resumo(vad) -> dict:
+    return {
+        "segments_s": [[round(ini / SAMPLE_RATE, 3), round(fim / SAMPLE_RATE, 3)] for ini, fim in vad.segments],
+        "original_s": round(vad.original_seconds, 3),
+        "kept_s": round(vad.kept_seconds, 3),
+        "removed_s": round(vad.removed_seconds, 3),
+    }
+
+
+def perto(valor: float, esperado: float) -> bool:
+    return abs(valor - esperado) <= TOLERANCIA
+
+
+def verificar_segundos(nome, vad, falhas) -> None:
+    """As contas do resultado batem com o áudio de fato devolvido."""
+    if not perto(vad.kept_seconds, len(vad.audio) / SAMPLE_RATE):
+        falhas.append(f"{nome}: kept_seconds={vad.kept_seconds:.3f} mas o áudio tem "
+                      f"{len(vad.audio) / SAMPLE_RATE:.3f}s")
+    if abs(vad.removed_seconds - (vad.original_seconds - vad.kept_seconds)) > 1e-9:
+        falhas.append(f"{nome}: removed_seconds não é original - kept")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Verificação do VAD em áudio sintético")
+    parser.add_argument("--output", help="Arquivo JSON de saída")
+    args = parser.parse_args(argv)
+
+    falhas = []
+    resultados = {}
+
+    # Silêncio puro e ruído baixo: nada chega ao Whisper
+    for nome, audio in [
+        ("zeros", np.zeros(2 * SAMPLE_RATE, dtype=np.float32)),
+        ("noise", montar([("silencio", 2.0)])),
+        ("empty", np.zeros(0, dtype=np.float32)),
+    ]:
+        vad = trim_silence(audio, SAMPLE_RATE)
+        resultados[f"silence_{nome}"] = resumo(vad)
+        if not vad.is_silent or len(vad.audio) or vad.kept_seconds:
+            falhas.append(f"{nome}: clipe sem fala não foi rejeitado ({resumo(vad)})")
+        if not perto(vad.removed_seconds, len(audio) / SAMPLE_RATE):
+            falhas.append(f"{nome}: removed_seconds={vad.removed_seconds:.3f}, esperado o clipe todo")
+
+    # Bordas: 0,8s de silêncio, 2s de fala, 1s de silêncio
+    audio = montar([("silencio", 0.8), ("fala", 2.0), ("silencio", 1.0)], seed=1)
+    vad = trim_silence(audio, SAMPLE_RATE)
+    resultados["edges"] = resumo(vad)
+    verificar_segundos("edges", vad, falhas)
+    if len(vad.segments) != 1:
+        falhas.append(f"edges: {len(vad.segments)} trechos, esperado 1")
+    else:
+        ini, fim = (s / SAMPLE_RATE for s in vad.segments[0])
+        if not perto(ini, 0.8 - PADDING) or not perto(fim, 2.8 + PADDING):
+            falhas.append(f"edges: trecho {ini:.3f}-{fim:.3f}s, esperado "
+                          f"{0.8 - PADDING:.2f}-{2.8 + PADDING:.2f}s")
+        if not perto(vad.kept_seconds, 2.0 + 2 * PADDING):
+            falhas.append(f"edges: kept_seconds={vad.kept_seconds:.3f}, esperado {2.0 + 2 * PADDING:.2f}")
+        if not perto(vad.removed_seconds, 1.8 - 2 * PADDING):
+            falhas.append(f"edges: removed_seconds={vad.removed_seconds:.3f}, esperado {1.8 - 2 * PADDING:.2f}")
+        if not np.shares_memory(vad.audio, audio):
+            falhas.append("edges: trecho único devia ser uma view do clipe original")
+
+    # Fala sem nenhum silêncio: nada a cortar
+    audio = montar([("fala", 1.5)], seed=2)
+    vad = trim_silence(audio, SAMPLE_RATE)
+    resultados["speech_only"] = resumo(vad)
+    verificar_segundos("speech_only", vad, falhas)
+    if vad.segments != [(0, len(audio))]:
+        falhas.append(f"speech_only: trechos {vad.segments}, esperado o clipe inteiro")
+
+    # Pausa curta (0,4s) fica dentro do trecho, sem ser encurtada
+    audio = montar([("silencio", 0.5), ("fala", 1.0), ("silencio", 0.4), ("fala", 1.0), ("silencio", 0.5)], seed=3)
+    vad = trim_silence(audio, SAMPLE_RATE)
+    resultados["short_pause"] = resumo(vad)
+    verificar_segundos("short_pause", vad, falhas)
+    if len(vad.segments) != 1:
+        falhas.append(f"short_pause: {len(vad.segments)} trechos, esperado 1 (pausa curta mantida)")
+    elif not perto(vad.kept_seconds, 2.4 + 2 * PADDING):
+        falhas.append(f"short_pause: kept_seconds={vad.kept_seconds:.3f}, esperado {2.4 + 2 * PADDING:.2f}")
+
+    # Pausa longa (2s) separa os trechos e vira KEEP_PAUSE de silêncio
+    audio = montar([("silencio", 0.5), ("fala", 1.0), ("silencio", 2.0), ("fala", 1.0), ("silencio", 0.5)], seed=4)
+    vad = trim_silence(audio, SAMPLE_RATE)
+    resultados["long_pause"] = resumo(vad)
+    verificar_segundos("long_pause", vad, falhas)
+    esperado = 2 * (1.0 + 2 * PADDING) + KEEP_PAUSE
+    if len(vad.segments) != 2:
+        falhas.append(f"long_pause: {len(vad.segments)} trechos, esperado 2 (pausa longa separa)")
+    else:
+        inicios = [ini / SAMPLE_RATE for ini, _ in vad.segments]
+        if not perto(inicios[0], 0.5 - PADDING) or not perto(inicios[1], 3.5 - PADDING):
+            falhas.append(f"long_pause: trechos começam em {inicios}, esperado "
+                          f"{[0.5 - PADDING, 3.5 - PADDING]}")
+        if not perto(vad.kept_seconds, esperado):
+            falhas.append(f"long_pause: kept_seconds={vad.kept_seconds:.3f}, esperado {esperado:.2f}")
+        if not perto(vad.removed_seconds, vad.original_seconds - esperado):
+            falhas.append(f"long_pause: removed_seconds={vad.removed_seconds:.3f}, "
+                          f"esperado {vad.original_seconds - esperado:.2f}")
+
+    for nome, r in resultados.items():
+        print(f"{nome:<15} {r['original_s']:5.2f}s -> {r['kept_s']:5.2f}s  trechos={r['segments_s']}")
+    resultados["failures"] = falhas
+    for falha in falhas:
+        print(f"✗ {falha}")
+    print("✓ todas as verificações passaram" if not falhas else f"✗ {len(falhas)} falhas")
+
+    destino = Path(args.output) if args.output else (
+        SCRIPTS_DIR / "benchmarks" / "results" / f"vad_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    write_results(destino, "vad", resultados, sample_rate=SAMPLE_RATE)
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,8 @@
+"""
+Núcleo compartilhado dos scripts de hotkey
+==========================================
+
+Componentes reutilizáveis pelos scripts em ``scripts_ativos`` (agente pessoal,
+push-to-talk e launcher de comandos). Cada módulo é independente e importa
+suas dependências pesadas (numpy, whisper, keyboard) apenas quando necessário.
+"""
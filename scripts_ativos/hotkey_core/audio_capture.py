@@ -0,0 +1,162 @@
+"""
+Captura de áudio em ring buffer pré-alocado.
+
+O callback do ``sounddevice.InputStream`` escreve direto em um array NumPy
+alocado uma única vez, sem criar cópias por bloco. O buffer é espelhado
+(cada amostra é gravada em ``i`` e ``i + capacidade``), de modo que qualquer
+trecho das últimas ``capacidade`` amostras é sempre contíguo e pode ser
+entregue ao Whisper como view, sem ``np.concatenate``.
+"""
+
+import queue
+import threading
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Ring buffer mono float32 com leitura contígua sem cópia."""
+
+    def __init__(self, max_seconds: float, sample_rate: int = 16000):
+        """
+        Args:
+            max_seconds: Duração máxima mantida no buffer
+            sample_rate: Taxa de amostragem do áudio
+        """
+        self.sample_rate = sample_rate
+        self.capacity = int(max_seconds * sample_rate)
+        self._buf = np.zeros(2 * self.capacity, dtype=np.float32)
+        self.total_written = 0  # Posição absoluta (monotônica) da próxima amostra
+
+    def reset(self) -> None:
+        """Descarta o conteúdo, mantendo a memória alocada."""
+        self.total_written = 0
+
+    def __len__(self) -> int:
+        """Quantidade de amostras disponíveis para leitura."""
+        return min(self.total_written, self.capacity)
+
+    @property
+    def seconds(self) -> float:
+        """Duração do áudio disponível em segundos."""
+        return len(self) / self.sample_rate
+
+    def write(self, bloco: np.ndarray) -> None:
+        """
+        Escreve um bloco de amostras, sobrescrevendo as mais antigas se cheio.
+
+        Args:
+            bloco: Amostras mono (shape ``(n,)`` ou ``(n, 1)``)
+        """
+        dados = bloco.reshape(-1)
+        n = len(dados)
+        if n > self.capacity:
+            # Só as últimas `capacity` amostras cabem no buffer
+            self.total_written += n - self.capacity
+            dados = dados[-self.capacity:]
+            n = self.capacity
+
+        pos = self.total_written % self.capacity
+        primeiro = min(n, self.capacity - pos)
+        cap = self.capacity
+
+        self._buf[pos:pos + primeiro] = dados[:primeiro]
+        self._buf[pos + cap:pos + cap + primeiro] = dados[:primeiro]
+        if primeiro < n:
+            resto = n - primeiro
+            self._buf[:resto] = dados[primeiro:]
+            self._buf[cap:cap + resto] = dados[primeiro:]
+
+        self.total_written += n
+
+    def callback(self, indata, frames, time, status) -> None:
+        """Callback compatível com ``sounddevice.InputStream`` (canal 0)."""
+        self.write(indata[:, 0])
+
+    def slice(self, inicio: int, fim: int) -> np.ndarray:
+        """
+        Retorna view contígua das amostras nas posições absolutas ``[inicio, fim)``.
+
+        Raises:
+            ValueError: Se o trecho já foi sobrescrito ou ainda não foi gravado
+        """
+        if fim > self.total_written or inicio < self.total_written - self.capacity or inicio > fim:
+            raise ValueError(
+                f"Trecho [{inicio}, {fim}) fora do buffer "
+                f"(disponível: [{max(0, self.total_written - self.capacity)}, {self.total_written}))"
+            )
+        pos = inicio % self.capacity
+        return self._buf[pos:pos + (fim - inicio)]
+
+    def view(self) -> np.ndarray:
+        """Retorna view contígua de todo o áudio disponível (sem cópia)."""
+        return self.slice(self.total_written - len(self), self.total_written)
+
+
+class AudioBufferPool:
+    """
+    Pool de ring buffers criados sob demanda.
+
+    Com o pipeline, a próxima gravação começa enquanto a anterior ainda está
+    sendo transcrita; cada gravação usa um buffer do pool, devolvido após a
+    transcrição. ``size`` limita quantas gravações ficam pendentes, mas só
+    ``warm`` buffers ficam alocados em repouso: os demais (cada um com
+    ``2 × max_seconds`` de áudio espelhado) são criados quando o pipeline
+    atrasa e liberados assim que voltam ao pool.
+    """
+
+    def __init__(self, size: int, max_seconds: float, sample_rate: int = 16000, warm: int = 1):
+        self.size = size
+        self.warm = max(1, min(warm, size))
+        self._max_seconds = max_seconds
+        self._sample_rate = sample_rate
+        self._livres: "queue.Queue[AudioRingBuffer]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._criados = 0
+        for _ in range(self.warm):
+            self._livres.put(self._criar())
+
+    def _criar(self) -> AudioRingBuffer:
+        self._criados += 1
+        return AudioRingBuffer(self._max_seconds, self._sample_rate)
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[AudioRingBuffer]:
+        """
+        Retira um buffer zerado do pool, criando um novo se todos estão em uso.
+
+        Returns:
+            AudioRingBuffer, ou None se o pool está no limite e nenhum buffer
+            ficou livre dentro do timeout
+        """
+        try:
+            ring = self._livres.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                ring = self._criar() if self._criados < self.size else None
+            if ring is None:
+                try:
+                    ring = self._livres.get(timeout=timeout)
+                except queue.Empty:
+                    return None
+        ring.reset()
+        return ring
+
+    def release(self, ring: AudioRingBuffer) -> None:
+        """Devolve o buffer ao pool; além dos ``warm`` em repouso, ele é descartado."""
+        with self._lock:
+            if self._livres.qsize() >= self.warm:
+                self._criados -= 1
+            else:
+                self._livres.put(ring)
+
+    @property
+    def available(self) -> int:
+        """Quantidade de buffers que ainda podem ser retirados sem esperar."""
+        with self._lock:
+            return self._livres.qsize() + self.size - self._criados
+
+    @property
+    def allocated(self) -> int:
+        """Quantidade de buffers alocados no momento (livres ou em uso)."""
+        return self._criados
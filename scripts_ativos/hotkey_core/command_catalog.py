@@ -0,0 +1,353 @@
+"""
+Catálogo persistente de slash commands, com várias raízes e subpastas.
+
+Antes, cada F8 listava um único diretório de commands (``iterdir()`` + um
+``is_file()`` por entrada), ignorando subpastas, o que em drives de
+rede/sincronizados deixava o popup lento. O ``CommandCatalog``:
+
+- Varre várias raízes (projeto, usuário, compartilhada do time) e suas
+  subpastas com ``os.scandir`` (o tipo da entrada vem da própria listagem,
+  sem um stat por arquivo), cada diretório uma tarefa em um pool de threads.
+  Em disco local o pool não ganha nada (a listagem é quase só CPU, sob o
+  GIL); ele paga em drives de rede, onde cada diretório espera o servidor
+- Nomeia commands de subpastas com namespace: ``frontend/build.md`` →
+  ``frontend:build``; o mesmo nome em duas raízes fica com a primeira
+  raiz da lista (a de maior precedência), e cada command guarda sua raiz
+- Guarda, por raiz, o mtime de cada diretório varrido; criar, apagar ou
+  renomear um arquivo muda o mtime do diretório que o contém, então um
+  ``stat`` por diretório diz se a lista ainda vale, e só as raízes que
+  mudaram são varridas de novo
+- Opcionalmente, uma thread vigia os mtimes em segundo plano, e
+  ``commands()`` nem chega a tocar no disco
+- Salva o último catálogo em JSON: após reiniciar, o primeiro popup usa a
+  lista salva sem listar os diretórios
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .project_store import write_json_atomic
+
+COMMAND_SUFFIXES = (".md", ".txt", "")
+NAMESPACE_SEP = ":"
+
+
+class CommandEntry(NamedTuple):
+    """Um slash command encontrado."""
+
+    name: str  # Com namespace das subpastas ("frontend:build")
+    path: str
+    root: str  # Raiz onde foi encontrado
+
+
+class RootScan(NamedTuple):
+    """Resultado da varredura de uma raiz."""
+
+    entries: List[CommandEntry]
+    dir_mtimes: Dict[str, int]  # Diretório → mtime no momento da varredura
+    seconds: float
+
+
+def _scan_dir(path: str, suffixes) -> Tuple[List[Tuple[str, str]], List[str], int]:
+    """Lista um diretório: ([(nome, caminho)], subdiretórios, mtime)."""
+    arquivos, subdirs = [], []
+    mtime = os.stat(path).st_mtime_ns
+    with os.scandir(path) as entradas:
+        for entrada in entradas:
+            if entrada.is_dir(follow_symlinks=False):
+                if not entrada.name.startswith("."):
+                    subdirs.append(entrada.path)
+                continue
+            nome, ext = os.path.splitext(entrada.name)
+            if ext in suffixes and entrada.is_file():
+                arquivos.append((nome, entrada.path))
+    return arquivos, subdirs, mtime
+
+
+def scan_roots(roots: Iterable[Path], suffixes=COMMAND_SUFFIXES, max_workers: int = 8) -> Dict[str, RootScan]:
+    """
+    Varre as raízes e suas subpastas em paralelo.
+
+    Cada diretório é uma tarefa no pool; as subpastas encontradas viram
+    novas tarefas, então raízes e subárvores lentas (rede) são listadas ao
+    mesmo tempo.
+
+    Returns:
+        Raiz → RootScan. Raízes inexistentes ou ilegíveis voltam vazias.
+    """
+    roots = [str(r) for r in roots]
+    inicio = {r: time.perf_counter() for r in roots}
+    fim = dict(inicio)
+    entradas: Dict[str, List[CommandEntry]] = {r: [] for r in roots}
+    mtimes: Dict[str, Dict[str, int]] = {r: {} for r in roots}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="command-scan") as pool:
+        pendentes = {pool.submit(_scan_dir, r, suffixes): (r, r) for r in roots}
+        while pendentes:
+            prontos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                raiz, diretorio = pendentes.pop(futuro)
+                try:
+                    arquivos, subdirs, mtime = futuro.result()
+                except OSError as e:
+                    if diretorio != raiz or os.path.exists(raiz):
+                        print(f"⚠ Erro ao listar {diretorio}: {e}", flush=True)
+                    continue
+                finally:
+                    fim[raiz] = time.perf_counter()
+
+                mtimes[raiz][diretorio] = mtime
+                relativo = os.path.relpath(diretorio, raiz)
+                namespace = "" if relativo == "." else relativo.replace(os.sep, NAMESPACE_SEP) + NAMESPACE_SEP
+                entradas[raiz].extend(CommandEntry(namespace + nome, caminho, raiz) for nome, caminho in arquivos)
+                for subdir in subdirs:
+                    pendentes[pool.submit(_scan_dir, subdir, suffixes)] = (raiz, subdir)
+
+    return {
+        r: RootScan(sorted(entradas[r]), mtimes[r], fim[r] - inicio[r])
+        for r in roots
+    }
+
+
+def merge_entries(roots: List[str], scans: Dict[str, RootScan]) -> List[CommandEntry]:
+    """Junta as raízes por ordem de precedência; nomes repetidos ficam com a primeira."""
+    vistos: Dict[str, CommandEntry] = {}
+    for raiz in roots:
+        scan = scans.get(raiz)
+        if scan is None:
+            continue
+        for entrada in scan.entries:
+            vistos.setdefault(entrada.name, entrada)
+    return sorted(vistos.values())
+
+
+def unique_roots(roots: Iterable[Union[str, Path]]) -> List[str]:
+    """Raízes sem repetição (mesmo caminho resolvido), mantendo a primeira ocorrência."""
+    vistas, unicas = set(), []
+    for raiz in roots:
+        chave = os.path.normcase(os.path.realpath(raiz))
+        if chave not in vistas:
+            vistas.add(chave)
+            unicas.append(str(raiz))
+    return unicas
+
+
+def _mudou(raiz: str, scan: Optional[RootScan]) -> bool:
+    """True se algum diretório da raiz mudou desde a varredura (um stat por diretório)."""
+    if scan is None:
+        return True
+    if not scan.dir_mtimes:
+        return os.path.isdir(raiz)  # Raiz que não existia e passou a existir
+    for diretorio, mtime in scan.dir_mtimes.items():
+        try:
+            if os.stat(diretorio).st_mtime_ns != mtime:
+                return True
+        except OSError:
+            return True
+    return False
+
+
+class CommandCatalog:
+    """Lista de commands de várias raízes em cache, invalidada pelos mtimes dos diretórios."""
+
+    def __init__(
+        self,
+        roots: Union[Path, List[Path]],
+        cache_file: Optional[Path] = None,
+        suffixes=COMMAND_SUFFIXES,
+        max_workers: int = 8,
+    ):
+        """
+        Args:
+            roots: Raízes de commands, da maior para a menor precedência
+            cache_file: JSON onde o último catálogo é salvo (None = só memória)
+            suffixes: Extensões aceitas ("" = sem extensão)
+            max_workers: Threads usadas na varredura
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.suffixes = tuple(suffixes)
+        self.max_workers = max_workers
+        self.scans = 0  # Quantas vezes alguma raiz foi varrida
+        # Raízes varridas no último refresh → segundos (vazio se nada mudou)
+        self.last_scan_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._roots: List[str] = unique_roots(roots if isinstance(roots, (list, tuple)) else [roots])
+        self._por_raiz: Dict[str, RootScan] = {}
+        self._entries: List[CommandEntry] = []
+        self._names: List[str] = []
+        self._por_nome: Dict[str, CommandEntry] = {}
+        self._carregado = False
+        self._watcher: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._load_cache()
+
+    @property
+    def roots(self) -> List[Path]:
+        return [Path(r) for r in self._roots]
+
+    @property
+    def commands_dir(self) -> Path:
+        """Raiz de maior precedência (a do projeto)."""
+        return Path(self._roots[0])
+
+    def _set_entries(self, entries: List[CommandEntry]) -> None:
+        """Troca a lista atual (chamado com o lock, exceto no __init__)."""
+        self._entries = entries
+        self._names = [e.name for e in entries]  # commands() só copia esta lista
+        self._por_nome = {e.name: e for e in entries}
+
+    def _load_cache(self) -> None:
+        """Recupera o catálogo salvo das raízes que continuam configuradas."""
+        if not self.cache_file or not self.cache_file.exists():
+            return
+        try:
+            dados = json.loads(self.cache_file.read_text(encoding="utf-8"))
+            por_raiz = {
+                raiz: RootScan([CommandEntry(*e) for e in r["entries"]], r["dir_mtimes"], r.get("seconds", 0.0))
+                for raiz, r in dados.get("roots", {}).items()
+                if raiz in self._roots
+            }
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return
+        # Raízes novas (sem nada salvo) são varridas no primeiro refresh
+        self._por_raiz = por_raiz
+        self._set_entries(merge_entries(self._roots, por_raiz))
+        self._carregado = set(por_raiz) == set(self._roots)
+
+    def _save_cache(self) -> None:
+        if not self.cache_file:
+            return
+        with self._lock:
+            dados = {
+                "saved_at": time.time(),
+                "roots": {
+                    raiz: {"entries": [list(e) for e in scan.entries],
+                           "dir_mtimes": scan.dir_mtimes, "seconds": scan.seconds}
+                    for raiz, scan in self._por_raiz.items()
+                },
+            }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.cache_file, dados, indent=None)
+        except OSError as e:
+            print(f"⚠ Não foi possível salvar o catálogo: {e}", flush=True)
+
+    def refresh(self, force: bool = False) -> Tuple[List[str], bool]:
+        """
+        Varre de novo as raízes cujos diretórios mudaram (ou todas, se ``force``).
+
+        Returns:
+            (commands, mudou)
+        """
+        with self._lock:
+            roots = list(self._roots)
+            anteriores = dict(self._por_raiz)
+
+        alteradas = [r for r in roots if force or _mudou(r, anteriores.get(r))]
+        if not alteradas:
+            with self._lock:
+                self._carregado = True
+                self.last_scan_seconds = {}
+                return list(self._names), False
+
+        novos = scan_roots(alteradas, self.suffixes, self.max_workers)
+
+        with self._lock:
+            if roots != self._roots:
+                # Raízes trocadas durante a varredura: descarta o resultado
+                return list(self._names), False
+            self._por_raiz.update(novos)
+            entries = merge_entries(roots, self._por_raiz)
+            mudou = entries != self._entries
+            self._set_entries(entries)
+            self._carregado = True
+            self.last_scan_seconds = {r: s.seconds for r, s in novos.items()}
+            self.scans += 1
+        if mudou or force:
+            self._save_cache()
+        return [e.name for e in entries], mudou
+
+    def commands(self) -> List[str]:
+        """
+        Lista atual de commands (nomes com namespace).
+
+        Com o vigia ativo, retorna o cache sem tocar no disco; sem ele, faz
+        um ``stat`` por diretório conhecido para validar o cache.
+        """
+        with self._lock:
+            if self._carregado and self.watching:
+                return list(self._names)
+        return self.refresh()[0]
+
+    def entries(self) -> List[CommandEntry]:
+        """Commands com caminho e raiz de origem (do cache atual)."""
+        with self._lock:
+            return list(self._entries)
+
+    def get(self, name: str) -> Optional[CommandEntry]:
+        with self._lock:
+            return self._por_nome.get(name)
+
+    def scan_report(self) -> List[Tuple[str, int, Optional[float]]]:
+        """
+        (raiz, commands, segundos) de cada raiz; segundos é None para as
+        raízes que o último refresh não precisou varrer (vieram do cache).
+        """
+        with self._lock:
+            return [
+                (raiz, len(self._por_raiz[raiz].entries) if raiz in self._por_raiz else 0,
+                 self.last_scan_seconds.get(raiz))
+                for raiz in self._roots
+            ]
+
+    def set_roots(self, roots: List[Path]) -> List[str]:
+        """Troca as raízes (repetidas são descartadas) e varre as novas."""
+        roots = unique_roots(roots)
+        with self._lock:
+            self._roots = roots
+            # Raízes que continuam configuradas aproveitam a última varredura
+            self._por_raiz = {r: s for r, s in self._por_raiz.items() if r in self._roots}
+            self._set_entries(merge_entries(self._roots, self._por_raiz))
+            self._carregado = False
+        return self.refresh()[0]
+
+    def set_directory(self, commands_dir: Path) -> List[str]:
+        """
+        Troca a raiz de maior precedência (a do projeto), mantendo as demais.
+
+        Se a pasta escolhida já é outra raiz (ex.: a do usuário), ela sobe
+        para o topo em vez de aparecer duas vezes.
+        """
+        return self.set_roots([Path(commands_dir)] + self.roots[1:])
+
+    # ---------- vigia em segundo plano ----------
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def start_watcher(self, interval: float = 2.0) -> None:
+        """Inicia a thread que varre de novo quando algum diretório muda."""
+        if self.watching:
+            return
+        self._parar.clear()
+
+        def vigiar():
+            while True:
+                self.refresh()
+                if self._parar.wait(interval):
+                    return
+
+        self._watcher = threading.Thread(target=vigiar, name="command-catalog", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._parar.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
@@ -0,0 +1,181 @@
+"""
+Pré-visualização dos arquivos de slash command.
+
+- ``parse_command_file`` lê só o necessário: o frontmatter (``---`` ...
+  ``---``) e as primeiras linhas do corpo, com limite de bytes, então um
+  arquivo enorme custa o mesmo que um pequeno
+- ``PreviewCache`` é um LRU limitado com chave (caminho, mtime, tamanho):
+  arquivo editado invalida a entrada sozinho
+- ``PreviewLoader`` lê em uma thread própria e só o pedido mais recente
+  importa: segurar a seta pela lista gera vários pedidos, mas só o item
+  onde a seleção parou é lido, e a thread de UI nunca espera o disco
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class CommandPreview:
+    """Resumo de um arquivo de command para o painel de pré-visualização."""
+
+    description: str = ""
+    frontmatter: Dict[str, str] = field(default_factory=dict)
+    lines: List[str] = field(default_factory=list)
+    truncated: bool = False
+    error: str = ""
+
+
+def parse_command_file(path: str, max_lines: int = 15, max_bytes: int = 16 * 1024) -> CommandPreview:
+    """
+    Lê frontmatter, descrição e primeiras linhas de um arquivo de command.
+
+    A descrição vem do campo ``description`` do frontmatter ou, na falta
+    dele, da primeira linha de texto do corpo.
+
+    Args:
+        max_lines: Linhas do corpo mantidas
+        max_bytes: Máximo lido do arquivo (frontmatter incluso)
+    """
+    preview = CommandPreview()
+    lidos = 0
+    with open(path, encoding="utf-8", errors="replace") as f:
+
+        def proxima_linha() -> str:
+            # readline com limite: uma linha gigante sem "\n" não é lida inteira
+            nonlocal lidos
+            linha = f.readline(max(0, max_bytes - lidos))
+            lidos += len(linha)
+            return linha
+
+        linha = proxima_linha()
+        if linha.strip() == "---":
+            while True:
+                linha = proxima_linha()
+                if not linha or linha.strip() == "---":
+                    break
+                chave, sep, valor = linha.partition(":")
+                if sep and chave.strip():
+                    preview.frontmatter[chave.strip()] = valor.strip().strip("\"'")
+            linha = proxima_linha()
+
+        while linha:
+            texto = linha.rstrip("\r\n")
+            if preview.lines or texto.strip():  # Pula linhas em branco do começo
+                if len(preview.lines) >= max_lines:
+                    preview.truncated = True
+                    break
+                preview.lines.append(texto)
+            linha = proxima_linha()
+        else:
+            # Parou pelo limite de bytes, não pelo fim do arquivo
+            preview.truncated = lidos >= max_bytes
+
+    preview.description = preview.frontmatter.get("description", "")
+    if not preview.description:
+        for texto in preview.lines:
+            texto = texto.strip().lstrip("#").strip()
+            if texto:
+                preview.description = texto
+                break
+    return preview
+
+
+class PreviewCache:
+    """LRU limitado de pré-visualizações, com chave (caminho, mtime, tamanho)."""
+
+    def __init__(self, maxsize: int = 256, max_lines: int = 15, max_bytes: int = 16 * 1024):
+        self.maxsize = maxsize
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._itens: "OrderedDict[Tuple[str, int, int], CommandPreview]" = OrderedDict()
+        self._ultima_chave: Dict[str, Tuple[str, int, int]] = {}  # caminho → chave mais recente
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def peek(self, path: str) -> Optional[CommandPreview]:
+        """Última pré-visualização conhecida do caminho, sem tocar no disco."""
+        with self._lock:
+            chave = self._ultima_chave.get(path)
+            return self._itens.get(chave) if chave else None
+
+    def get(self, path: str) -> CommandPreview:
+        """Pré-visualização atual (um ``stat``; lê o arquivo só se mudou ou não está no cache)."""
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            return CommandPreview(error=str(e))
+        chave = (path, st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            preview = self._itens.get(chave)
+            if preview is not None:
+                self._itens.move_to_end(chave)
+                self.hits += 1
+                return preview
+            self.misses += 1
+
+        try:
+            preview = parse_command_file(path, self.max_lines, self.max_bytes)
+        except OSError as e:
+            return CommandPreview(error=str(e))
+
+        with self._lock:
+            antiga = self._ultima_chave.get(path)
+            if antiga and antiga != chave:
+                self._itens.pop(antiga, None)
+            self._itens[chave] = preview
+            self._ultima_chave[path] = chave
+            while len(self._itens) > self.maxsize:
+                removida, _ = self._itens.popitem(last=False)
+                if self._ultima_chave.get(removida[0]) == removida:
+                    del self._ultima_chave[removida[0]]
+        return preview
+
+
+class PreviewLoader:
+    """Thread que carrega pré-visualizações; só o pedido mais recente é atendido."""
+
+    def __init__(self, cache: PreviewCache, on_ready: Callable[[str, CommandPreview], None]):
+        """
+        Args:
+            cache: Cache usado para ler os arquivos
+            on_ready: Chamado na thread do loader com (caminho, preview); a
+                UI deve só enfileirar o resultado para a própria thread
+        """
+        self.cache = cache
+        self.on_ready = on_ready
+        self._cond = threading.Condition()
+        self._pendente: Optional[str] = None
+        self._fechado = False
+        self._thread = threading.Thread(target=self._run, name="command-preview", daemon=True)
+        self._thread.start()
+
+    def request(self, path: str) -> None:
+        """Pede a pré-visualização de ``path``, substituindo o pedido anterior."""
+        with self._cond:
+            self._pendente = path
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._fechado = True
+            self._cond.notify()
+        self._thread.join(timeout=2)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pendente is None and not self._fechado:
+                    self._cond.wait()
+                if self._fechado:
+                    return
+                path, self._pendente = self._pendente, None
+            self.on_ready(path, self.cache.get(path))
@@ -0,0 +1,223 @@
+"""
+Filtro fuzzy incremental e ranking por frecência para o launcher de commands.
+
+- ``CommandFilter``: cada tecla digitada estreita a lista. O match é por
+  subsequência ("rvpr" encontra "review-pr") e guarda, para cada candidato,
+  a posição do último caractere casado e a pontuação parcial. A tecla
+  seguinte só continua a busca a partir dessa posição, nos candidatos que
+  sobraram da tecla anterior; apagar uma tecla volta ao estado já calculado
+  (pilha de estados por prefixo da consulta).
+- ``FrecencyStore``: frequência × recência das execuções, com decaimento
+  exponencial (meia-vida configurável), persistida em JSON. ``record`` só
+  atualiza a memória (é chamado na thread de UI); uma thread grava o JSON
+  alguns segundos depois, juntando execuções seguidas, e ``close`` grava o
+  que faltar.
+
+A pontuação favorece caracteres consecutivos, início de palavra (após
+``-``, ``_``, ``/``, ``:``, espaço ou no começo) e penaliza lacunas; a
+frecência entra como bônus logarítmico, então um command muito usado sobe
+sem atropelar um match muito melhor.
+"""
+
+import json
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .project_store import write_json_atomic
+
+SEPARADORES = frozenset("-_/:. ")
+
+BONUS_CONSECUTIVO = 5.0
+BONUS_INICIO = 8.0
+BONUS_PALAVRA = 6.0
+PENALIDADE_LACUNA = 0.1
+PESO_FRECENCIA = 4.0
+
+
+class FrecencyStore:
+    """Frequência/recência de execução de cada command, persistida em JSON."""
+
+    def __init__(self, path: Optional[Path] = None, half_life_days: float = 14.0, save_delay: float = 2.0):
+        """
+        Args:
+            path: Arquivo JSON (None = só memória)
+            half_life_days: Tempo para o peso de uma execução cair pela metade
+            save_delay: Espera antes de gravar; execuções nesse intervalo
+                saem em uma única gravação
+        """
+        self.path = Path(path) if path else None
+        self.half_life = half_life_days * 86400
+        self.save_delay = save_delay
+        self.saves = 0
+        self._lock = threading.Lock()
+        # nome → (pontuação decaída até "last", timestamp da última execução)
+        self._dados: Dict[str, Tuple[float, float]] = {}
+        self._pendente = False  # Há execuções ainda não gravadas
+        self._acordar = threading.Event()
+        self._fechado = threading.Event()
+        self._gravador: Optional[threading.Thread] = None
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            dados = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return
+        self._dados = {nome: (float(v["score"]), float(v["last"])) for nome, v in dados.items()}
+
+    def _save(self) -> None:
+        """Grava o estado atual, se há execuções pendentes (fora do lock: o fsync é lento)."""
+        with self._lock:
+            if not self.path or not self._pendente:
+                return
+            dados = {nome: {"score": score, "last": last} for nome, (score, last) in self._dados.items()}
+            self._pendente = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(self.path, dados)
+            self.saves += 1
+        except OSError as e:
+            print(f"⚠ Não foi possível salvar a frecência: {e}", flush=True)
+
+    def _gravar(self) -> None:
+        """Thread de gravação: espera uma execução, junta as seguintes e grava."""
+        while not self._fechado.is_set():
+            self._acordar.wait()
+            self._fechado.wait(self.save_delay)
+            self._acordar.clear()
+            self._save()
+
+    def _agendar(self) -> None:
+        if not self.path:
+            return
+        if self._fechado.is_set():
+            self._save()  # Depois do close não há thread: grava direto
+            return
+        with self._lock:
+            if self._gravador is None:
+                self._gravador = threading.Thread(target=self._gravar, name="frecency-save", daemon=True)
+                self._gravador.start()
+        self._acordar.set()
+
+    def close(self) -> None:
+        """Para a thread de gravação e grava as execuções pendentes."""
+        self._fechado.set()
+        self._acordar.set()
+        if self._gravador is not None:
+            self._gravador.join(timeout=5)
+        self._save()
+
+    def _decair(self, score: float, last: float, now: float) -> float:
+        return score * 0.5 ** (max(0.0, now - last) / self.half_life)
+
+    def record(self, nome: str, now: Optional[float] = None) -> None:
+        """Registra uma execução do command."""
+        now = time.time() if now is None else now
+        with self._lock:
+            score, last = self._dados.get(nome, (0.0, now))
+            self._dados[nome] = (self._decair(score, last, now) + 1.0, now)
+            self._pendente = True
+        self._agendar()
+
+    def score(self, nome: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        with self._lock:
+            if nome not in self._dados:
+                return 0.0
+            return self._decair(*self._dados[nome], now)
+
+    def scores(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Pontuação atual de todos os commands já executados."""
+        now = time.time() if now is None else now
+        with self._lock:
+            return {nome: self._decair(score, last, now) for nome, (score, last) in self._dados.items()}
+
+
+# Estado de um candidato: (índice do command, posição do último caractere casado, pontuação)
+_Match = Tuple[int, int, float]
+
+
+class CommandFilter:
+    """Filtro fuzzy incremental sobre uma lista de commands."""
+
+    def __init__(self, commands: List[str] = (), frecency: Optional[FrecencyStore] = None):
+        self.frecency = frecency
+        self.set_commands(commands)
+
+    def set_commands(self, commands: List[str]) -> None:
+        """Troca a lista de commands (descarta os estados incrementais)."""
+        self.commands = list(commands)
+        self._minusculos = [c.lower() for c in self.commands]
+        self.refresh_frecency()
+        # Pilha de (consulta, candidatos); a base é a consulta vazia
+        self._pilha: List[Tuple[str, List[_Match]]] = [
+            ("", [(i, -1, 0.0) for i in range(len(self.commands))])
+        ]
+
+    def refresh_frecency(self) -> None:
+        """Relê as pontuações de frecência (ex.: após executar um command)."""
+        scores = self.frecency.scores() if self.frecency else {}
+        self._bonus = {
+            i: PESO_FRECENCIA * math.log1p(scores[nome])
+            for i, nome in enumerate(self.commands) if nome in scores
+        }
+
+    def _estender(self, candidatos: List[_Match], c: str) -> List[_Match]:
+        """Casa mais um caractere a partir da posição salva de cada candidato."""
+        minusculos = self._minusculos
+        resultado = []
+        for i, ultimo, score in candidatos:
+            nome = minusculos[i]
+            p = nome.find(c, ultimo + 1)
+            if p < 0:
+                continue
+            score += 1.0
+            if p == 0:
+                score += BONUS_INICIO
+            elif nome[p - 1] in SEPARADORES:
+                score += BONUS_PALAVRA
+            if ultimo >= 0:
+                if p == ultimo + 1:
+                    score += BONUS_CONSECUTIVO
+                else:
+                    score -= (p - ultimo - 1) * PENALIDADE_LACUNA
+            resultado.append((i, p, score))
+        return resultado
+
+    def _candidatos(self, consulta: str) -> List[_Match]:
+        # Volta até o maior prefixo já calculado (ex.: backspace)
+        while len(self._pilha) > 1 and not consulta.startswith(self._pilha[-1][0]):
+            self._pilha.pop()
+        atual, candidatos = self._pilha[-1]
+        for c in consulta[len(atual):]:
+            atual += c
+            candidatos = self._estender(candidatos, c)
+            self._pilha.append((atual, candidatos))
+        return candidatos
+
+    def filter(self, consulta: str) -> List[str]:
+        """
+        Commands que contêm a consulta como subsequência, melhores primeiro.
+
+        Consulta vazia: todos, ordenados por frecência e depois por nome.
+        """
+        consulta = "".join(consulta.lower().split())
+        candidatos = self._candidatos(consulta)
+        bonus = self._bonus
+        commands = self.commands
+
+        if not consulta:
+            if not bonus:
+                return list(commands)
+            return [commands[i] for i in sorted(range(len(commands)), key=lambda i: -bonus.get(i, 0.0))]
+
+        ordenados = sorted(
+            candidatos,
+            key=lambda m: (-(m[2] + bonus.get(m[0], 0.0)), len(commands[m[0]]), m[0]),
+        )
+        return [commands[i] for i, _, _ in ordenados]
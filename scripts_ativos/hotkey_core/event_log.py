@@ -0,0 +1,391 @@
+"""
+Log de eventos estruturado (JSON lines) compartilhado pelos scripts.
+
+Cada evento é uma linha JSON (``ts``, ``level``, ``source``, ``event``,
+``msg`` e campos extras). Quem registra só coloca o registro numa fila
+(``logging.handlers.QueueHandler``); uma thread (``QueueListener``) faz a
+escrita, então a hotkey e a UI não pagam nenhuma syscall:
+
+- ``BatchedFileHandler`` mantém o arquivo aberto e só faz ``fsync`` a cada
+  ``fsync_interval`` segundos ou ``fsync_every`` eventos (e nos erros e no
+  encerramento)
+- Rotação por tamanho e por idade: o arquivo atual vira
+  ``<nome>.<data>.jsonl.gz`` (comprimido na thread do listener) e só os
+  ``backup_count`` mais recentes são mantidos, então o disco fica limitado
+- O console (opcional) também é escrito pela thread do listener
+
+Consulta pela linha de comando (lê do fim do arquivo, sem carregar tudo)::
+
+    python -m hotkey_core.event_log agent -n 20
+    python -m hotkey_core.event_log commands --event execute --since 2h
+    python -m hotkey_core.event_log agent --grep projeto --rotated
+    python -m hotkey_core.event_log commands -f
+"""
+
+import argparse
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_LOG_DIR = Path(os.environ.get("HOTKEY_LOG_DIR", Path.home() / ".hotkey_logs"))
+SUFFIX = ".jsonl"
+
+# Atributos padrão do LogRecord (o resto veio de ``extra`` e vira campo do evento)
+_ATRIBUTOS_RECORD = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "event"}
+
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formata o registro como uma linha JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        evento = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "source": record.name,
+            "event": getattr(record, "event", "log"),
+            "msg": record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_RECORD:
+                evento[chave] = valor
+        if record.exc_info:
+            evento["exc"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+
+class BatchedFileHandler(logging.Handler):
+    """Arquivo JSON lines com fsync em lote e rotação comprimida por tamanho/idade."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 5 * 1024 * 1024,
+        max_age_seconds: float = 7 * 86400,
+        backup_count: int = 10,
+        fsync_interval: float = 2.0,
+        fsync_every: int = 100,
+    ):
+        """
+        Args:
+            path: Arquivo atual (``<nome>.jsonl``)
+            max_bytes: Tamanho que dispara a rotação
+            max_age_seconds: Idade do arquivo atual que dispara a rotação
+            backup_count: Arquivos rotacionados (``.gz``) mantidos
+            fsync_interval: Segundos máximos entre dois fsync
+            fsync_every: Eventos máximos entre dois fsync
+        """
+        super().__init__()
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.backup_count = backup_count
+        self.fsync_interval = fsync_interval
+        self.fsync_every = fsync_every
+        self.fsyncs = 0
+        self.rotations = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._abrir()
+
+    def _abrir(self) -> None:
+        self._f = open(self.path, "a", encoding="utf-8")
+        st = os.stat(self.path)
+        self._tamanho = st.st_size
+        # Idade conta da criação: arquivo vazio (novo) começa agora
+        self._criado = time.time() if st.st_size == 0 else _criado_em(self.path, st)
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            linha = self.format(record) + "\n"
+            tamanho = len(linha.encode("utf-8"))
+            if self._tamanho and (
+                self._tamanho + tamanho > self.max_bytes
+                or time.time() - self._criado > self.max_age_seconds
+            ):
+                self.rotate()
+            self._f.write(linha)
+            self._f.flush()  # Visível para o tail na hora; só o fsync é em lote
+            self._tamanho += tamanho
+            self._pendentes += 1
+            if (
+                record.levelno >= logging.ERROR
+                or self._pendentes >= self.fsync_every
+                or time.monotonic() - self._ultimo_fsync >= self.fsync_interval
+            ):
+                self.sync()
+        except Exception:
+            self.handleError(record)
+
+    def sync(self) -> None:
+        """Faz fsync dos eventos ainda não sincronizados."""
+        if self._pendentes:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+            self.fsyncs += 1
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def rotate(self) -> None:
+        """Comprime o arquivo atual e começa um novo; apaga os excedentes."""
+        self.sync()
+        self._f.close()
+        destino = self.path.with_name(f"{self.path.stem}.{datetime.now():%Y%m%d_%H%M%S_%f}{SUFFIX}.gz")
+        with open(self.path, "rb") as origem, gzip.open(destino, "wb") as gz:
+            shutil.copyfileobj(origem, gz)
+        os.remove(self.path)
+        for antigo in rotated_files(self.path)[:-self.backup_count or None]:
+            antigo.unlink(missing_ok=True)
+        self.rotations += 1
+        self._abrir()
+
+    def flush(self) -> None:
+        self.sync()
+
+    def close(self) -> None:
+        try:
+            self.sync()
+            self._f.close()
+        finally:
+            super().close()
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Console com só a mensagem (como os prints), escrito pela thread do listener."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+        self.setFormatter(logging.Formatter("%(message)s"))
+
+
+def _criado_em(path: Path, st: os.stat_result) -> float:
+    """Momento da criação do arquivo: o ``ts`` da primeira linha (o mtime do Linux não serve)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return datetime.fromisoformat(json.loads(f.readline())["ts"]).timestamp()
+    except (OSError, ValueError, KeyError):
+        return st.st_mtime
+
+
+def rotated_files(path: Path) -> List[Path]:
+    """Arquivos rotacionados de ``path``, do mais antigo para o mais recente."""
+    path = Path(path)
+    return sorted(path.parent.glob(f"{path.stem}.*{SUFFIX}.gz"))
+
+
+def setup_event_log(
+    name: str,
+    log_dir: Optional[Path] = None,
+    console: bool = False,
+    level: int = logging.INFO,
+    **handler_kwargs,
+) -> logging.Logger:
+    """
+    Configura o logger ``name`` para gravar em ``<log_dir>/<name>.jsonl`` por fila.
+
+    Args:
+        name: Nome do logger e do arquivo (ex.: ``agent``, ``commands``)
+        log_dir: Diretório dos logs (None = ``DEFAULT_LOG_DIR``)
+        console: Também escreve a mensagem no stdout (pela mesma thread)
+        handler_kwargs: Repassados ao ``BatchedFileHandler`` (rotação, fsync)
+    """
+    logger = logging.getLogger(name)
+    if name in _listeners:
+        return logger
+    handlers: List[logging.Handler] = []
+    arquivo = BatchedFileHandler(Path(log_dir or DEFAULT_LOG_DIR) / f"{name}{SUFFIX}", **handler_kwargs)
+    arquivo.setFormatter(JsonLinesFormatter())
+    handlers.append(arquivo)
+    if console:
+        handlers.append(ConsoleHandler())
+
+    fila: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    logger.setLevel(level)
+    logger.propagate = False
+    logger.addHandler(logging.handlers.QueueHandler(fila))
+    listener = logging.handlers.QueueListener(fila, *handlers, respect_handler_level=True)
+    listener.start()
+    if not _listeners:
+        atexit.register(shutdown_event_log)  # Não perde a fila se o script sair com sys.exit
+    _listeners[name] = listener
+    return logger
+
+
+def shutdown_event_log(name: Optional[str] = None) -> None:
+    """Esvazia a fila, faz fsync e fecha os arquivos (todos os logs, ou só ``name``)."""
+    for nome in [name] if name else list(_listeners):
+        listener = _listeners.pop(nome, None)
+        if listener is None:
+            continue
+        listener.stop()  # Processa o que ainda está na fila
+        for handler in listener.handlers:
+            handler.close()
+        logger = logging.getLogger(nome)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+
+def log_event(logger: logging.Logger, event: str, msg: str = "", level: int = logging.INFO, **fields) -> None:
+    """Registra um evento com campos estruturados (só enfileira)."""
+    logger.log(level, msg, extra={"event": event, **fields})
+
+
+# ==================== CONSULTA ====================
+
+def tail_lines(path: Path, n: int, bloco: int = 64 * 1024) -> List[str]:
+    """Últimas ``n`` linhas do arquivo, lendo blocos a partir do fim."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        dados = b""
+        while pos > 0 and dados.count(b"\n") <= n:
+            passo = min(bloco, pos)
+            pos -= passo
+            f.seek(pos)
+            dados = f.read(passo) + dados
+    linhas = dados.decode("utf-8", errors="replace").splitlines()
+    return linhas[-n:] if n else []
+
+
+def _ler(path: Path) -> Iterator[str]:
+    abrir = gzip.open if path.suffix == ".gz" else open
+    with abrir(path, "rt", encoding="utf-8", errors="replace") as f:
+        yield from f
+
+
+def parse_since(texto: str) -> datetime:
+    """``30m``, ``2h``, ``3d`` (relativo a agora) ou data ISO."""
+    unidades = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if texto and texto[-1] in unidades and texto[:-1].replace(".", "", 1).isdigit():
+        return datetime.fromtimestamp(time.time() - float(texto[:-1]) * unidades[texto[-1]])
+    return datetime.fromisoformat(texto)
+
+
+def filter_events(
+    linhas,
+    event: Optional[str] = None,
+    level: Optional[str] = None,
+    grep: Optional[str] = None,
+    since: Optional[datetime] = None,
+) -> Iterator[Dict]:
+    """Eventos das linhas que passam nos filtros (linhas inválidas são puladas)."""
+    grep = grep.lower() if grep else None
+    ts_min = since.isoformat(timespec="milliseconds") if since else None
+    for linha in linhas:
+        if grep and grep not in linha.lower():
+            continue  # Filtro barato antes do json.loads
+        try:
+            evento = json.loads(linha)
+        except json.JSONDecodeError:
+            continue  # Linha incompleta (escrita em andamento)
+        if event and evento.get("event") != event:
+            continue
+        if level and evento.get("level") != level.lower():
+            continue
+        if ts_min and evento.get("ts", "") < ts_min:
+            continue
+        yield evento
+
+
+def query_events(
+    name: str,
+    log_dir: Optional[Path] = None,
+    limit: int = 20,
+    rotated: bool = False,
+    **filtros,
+) -> List[Dict]:
+    """
+    Últimos ``limit`` eventos que passam nos filtros, do mais antigo ao mais recente.
+
+    Sem filtros, lê só o fim do arquivo atual; com filtros, percorre o
+    arquivo atual (e os rotacionados, se ``rotated``).
+
+    Args:
+        filtros: ``event``, ``level``, ``grep`` e ``since`` de ``filter_events``
+    """
+    path = Path(log_dir or DEFAULT_LOG_DIR) / f"{name}{SUFFIX}"
+    if not any(filtros.values()) and not rotated:
+        linhas = tail_lines(path, limit) if path.exists() else []
+    else:
+        arquivos = (rotated_files(path) if rotated else []) + ([path] if path.exists() else [])
+        linhas = (linha for arquivo in arquivos for linha in _ler(arquivo))
+    return list(deque(filter_events(linhas, **filtros), maxlen=limit))
+
+
+def follow_events(name: str, log_dir: Optional[Path] = None, intervalo: float = 0.2, **filtros) -> Iterator[Dict]:
+    """Eventos novos conforme são gravados (acompanha a rotação do arquivo)."""
+    path = Path(log_dir or DEFAULT_LOG_DIR) / f"{name}{SUFFIX}"
+    f, inode, resto = None, None, ""
+    while True:
+        if f is None or (path.exists() and os.stat(path).st_ino != inode):
+            # Rotação: o arquivo atual é novo, lê desde o começo
+            novo = f is not None
+            if f:
+                f.close()
+            if not path.exists():
+                time.sleep(intervalo)
+                continue
+            f = open(path, encoding="utf-8", errors="replace")
+            inode = os.fstat(f.fileno()).st_ino
+            if not novo:
+                f.seek(0, os.SEEK_END)
+        linha = f.readline()
+        if not linha.endswith("\n"):
+            resto += linha  # Linha ainda sendo escrita
+            time.sleep(intervalo)
+            continue
+        linha, resto = resto + linha, ""
+        yield from filter_events([linha], **filtros)
+
+
+def format_event(evento: Dict) -> str:
+    extras = {k: v for k, v in evento.items() if k not in ("ts", "level", "source", "event", "msg")}
+    texto = f"{evento.get('ts', '')}  {evento.get('level', ''):<7} {evento.get('event', ''):<16} {evento.get('msg', '')}"
+    if extras:
+        texto += "  " + " ".join(f"{k}={v}" for k, v in extras.items())
+    return texto
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Consulta os logs de eventos dos scripts")
+    parser.add_argument("name", help="Nome do log (ex.: agent, commands, transcription)")
+    parser.add_argument("--dir", type=Path, help=f"Diretório dos logs (padrão {DEFAULT_LOG_DIR})")
+    parser.add_argument("-n", type=int, default=20, help="Quantidade de eventos")
+    parser.add_argument("--event", help="Só eventos com esse nome")
+    parser.add_argument("--level", help="Só eventos desse nível (info, warning, error)")
+    parser.add_argument("--grep", help="Texto contido no evento (sem diferenciar maiúsculas)")
+    parser.add_argument("--since", help="A partir de: 30m, 2h, 3d ou data ISO")
+    parser.add_argument("--rotated", action="store_true", help="Inclui os arquivos rotacionados (.gz)")
+    parser.add_argument("--json", action="store_true", help="Imprime as linhas JSON originais")
+    parser.add_argument("-f", "--follow", action="store_true", help="Continua mostrando eventos novos")
+    args = parser.parse_args(argv)
+
+    filtros = dict(event=args.event, level=args.level, grep=args.grep,
+                   since=parse_since(args.since) if args.since else None)
+    mostrar = (lambda e: json.dumps(e, ensure_ascii=False)) if args.json else format_event
+    for evento in query_events(args.name, args.dir, args.n, rotated=args.rotated, **filtros):
+        print(mostrar(evento))
+
+    if args.follow:
+        try:
+            for evento in follow_events(args.name, args.dir, **filtros):
+                print(mostrar(evento), flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Roteamento de comandos de voz por tabela de intenções.
+
+Cada intenção registra um ou mais padrões em uma sintaxe simples:
+
+    "criar projeto {projeto}"
+    "sobre [o] projeto {projeto}"
+    "(buscar|procurar|pesquisar) {consulta}"
+
+- ``{slot}`` captura texto (o último slot do padrão fica com o resto da frase)
+- ``[palavras]`` é opcional
+- ``(a|b)`` são alternativas
+
+Cada padrão vira uma regex ancorada, e os padrões são indexados pela
+primeira palavra literal (um trie de um nível: "criar" → padrões que começam
+com "criar"). Rotear consulta esse índice e testa só os poucos candidatos da
+primeira palavra da frase (mais os padrões que começam com slot ou trecho
+opcional), então o custo não cresce com o número de comandos, ao contrário
+de uma cadeia de ``startswith`` ou de uma regex com uma alternativa por
+padrão (o ``re`` testa as alternativas uma a uma).
+
+Os candidatos ficam em ordem de prioridade e, dentro da mesma prioridade, os
+padrões com mais texto literal vêm antes ("sobre o projeto X" antes de
+"sobre X"). Uma intenção pode ter um ``guard`` que recusa o match (ex.: o
+slot não é um projeto conhecido); nesse caso o roteamento continua pelos
+candidatos seguintes.
+
+Intenções extras podem vir de um JSON (``load_config``) apontando para ações
+já registradas, com slots fixos ou montados a partir dos capturados.
+"""
+
+import json
+import re
+import string
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+Handler = Callable[[Dict[str, str]], None]
+Guard = Callable[[Dict[str, str]], bool]
+
+_TOKEN = re.compile(r"\{(\w+)\}|\[([^\]]+)\]|\(([^)]+)\)|(\s+)|([^{\[(\s]+)")
+
+
+def normalize_command(texto: str) -> str:
+    """Minúsculas, espaços colapsados e sem pontuação nas pontas ("Criar projeto X." → "criar projeto x")."""
+    return " ".join(texto.lower().split()).strip(" .,!?;:")
+
+
+@dataclass
+class Intent:
+    """Uma intenção registrada no roteador."""
+
+    name: str
+    patterns: List[str]
+    handler: Handler
+    guard: Optional[Guard] = None
+    priority: int = 0
+    defaults: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class IntentMatch:
+    """Resultado do roteamento: intenção escolhida e slots extraídos."""
+
+    intent: Intent
+    slots: Dict[str, str]
+
+    @property
+    def name(self) -> str:
+        return self.intent.name
+
+
+def compile_pattern(padrao: str) -> str:
+    """Converte um padrão de intenção em regex (sem âncoras)."""
+    partes = []
+    tokens = list(_TOKEN.finditer(normalize_command(padrao)))
+    slots = [t.group(1) for t in tokens if t.group(1)]
+    for i, token in enumerate(tokens):
+        slot, opcional, alternativas, espaco, literal = token.groups()
+        if opcional and i == len(tokens) - 1:
+            # Opcional no fim da frase: o espaço anterior também é opcional
+            if partes and partes[-1] == "\\s+":
+                partes.pop()
+            partes.append(f"(?:\\s+{compile_pattern(opcional)})?")
+        elif slot:
+            # O último slot é guloso; os anteriores param no próximo literal
+            guloso = slot == slots[-1]
+            partes.append(f"(?P<{slot}>.+{'' if guloso else '?'})")
+        elif opcional:
+            partes.append(f"(?:{compile_pattern(opcional)}\\s+)?")
+        elif alternativas:
+            opcoes = "|".join(re.escape(normalize_command(a)) for a in alternativas.split("|"))
+            partes.append(f"(?:{opcoes})")
+        elif espaco:
+            # Um opcional já consome o espaço seguinte
+            if not (partes and partes[-1].endswith("\\s+)?")):
+                partes.append("\\s+")
+        else:
+            partes.append(re.escape(literal))
+    return "".join(partes)
+
+
+def first_words(padrao: str) -> Optional[Set[str]]:
+    """
+    Palavras com que uma frase que casa com o padrão pode começar.
+
+    Returns:
+        Conjunto de palavras, ou None se o padrão começa com slot/opcional
+        (pode começar com qualquer palavra)
+    """
+    tokens = list(_TOKEN.finditer(normalize_command(padrao)))
+    if not tokens:
+        return None
+    slot, opcional, alternativas, espaco, literal = tokens[0].groups()
+    # A palavra só é completa se o token seguinte for espaço (ou o fim)
+    completa = len(tokens) == 1 or tokens[1].group(4) is not None
+    if literal and completa:
+        return {literal}
+    if alternativas and completa:
+        return {normalize_command(a).split(" ")[0] for a in alternativas.split("|")}
+    return None
+
+
+def pattern_slots(padrao: str) -> Set[str]:
+    """Slots que o padrão sempre captura (os de trechos ``[opcionais]`` podem faltar)."""
+    return {t.group(1) for t in _TOKEN.finditer(normalize_command(padrao)) if t.group(1)}
+
+
+def _validar_defaults(padroes: List[str], defaults: Dict[str, str]) -> None:
+    """
+    Confere que ``match`` consegue montar cada slot fixo com qualquer padrão.
+
+    Raises:
+        ValueError: Slot que não é texto, modelo malformado ou ``{slot}`` que
+            nem todo padrão captura
+    """
+    disponiveis = set.intersection(*(pattern_slots(p) for p in padroes)) if padroes else set()
+    for chave, valor in defaults.items():
+        if not isinstance(valor, str):
+            raise ValueError(f"slot '{chave}' deve ser texto, não {type(valor).__name__}")
+        if "{" in valor:
+            try:
+                campos = [campo for _, campo, _, _ in string.Formatter().parse(valor) if campo is not None]
+            except ValueError as e:
+                raise ValueError(f"slot '{chave}' tem modelo inválido {valor!r}: {e}") from None
+            for campo in campos:
+                if campo not in disponiveis:
+                    opcoes = ", ".join(sorted(disponiveis)) or "nenhum"
+                    raise ValueError(
+                        f"slot '{chave}' usa {{{campo}}}, que nem todo padrão captura (disponíveis: {opcoes})"
+                    )
+        disponiveis.add(chave)  # Slots fixos seguintes podem usar este
+
+
+def _peso_literal(padrao: str) -> int:
+    """Quantidade de texto literal obrigatório: padrões mais específicos primeiro."""
+    return len(re.sub(r"\{\w+\}|\[[^\]]*\]", "", padrao))
+
+
+class IntentRouter:
+    """Tabela de intenções indexada pela primeira palavra."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._intents: Dict[str, Intent] = {}
+        # Primeira palavra → [(ordem, intenção, regex)], e os padrões curinga
+        self._indice: Optional[Tuple[Dict[str, list], list]] = None
+
+    def __len__(self) -> int:
+        return len(self._intents)
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self._intents
+
+    def register(
+        self,
+        name: str,
+        patterns: List[str],
+        handler: Handler,
+        guard: Optional[Guard] = None,
+        priority: int = 0,
+        defaults: Optional[Dict[str, str]] = None,
+    ) -> Intent:
+        """
+        Registra (ou substitui) uma intenção.
+
+        Args:
+            name: Nome único da intenção
+            patterns: Padrões que a ativam
+            handler: Recebe o dicionário de slots
+            guard: Se retornar False, o match é descartado
+            priority: Maior prioridade é testada antes
+            defaults: Slots fixos; valores com ``{slot}`` são preenchidos com
+                os slots capturados
+        """
+        intent = Intent(name, list(patterns), handler, guard, priority, dict(defaults or {}))
+        with self._lock:
+            self._intents[name] = intent
+            self._indice = None  # Recompila na próxima consulta
+        return intent
+
+    def intent(self, name: str, *patterns: str, guard: Optional[Guard] = None, priority: int = 0):
+        """Decorator equivalente a ``register``."""
+        def decorator(handler: Handler) -> Handler:
+            self.register(name, list(patterns), handler, guard=guard, priority=priority)
+            return handler
+        return decorator
+
+    def load_config(self, path: Path) -> int:
+        """
+        Carrega intenções extras de um JSON.
+
+        Formato: lista de objetos com ``name``, ``patterns``, ``action`` (nome
+        de uma intenção já registrada, cujo handler será usado) e,
+        opcionalmente, ``slots`` e ``priority``::
+
+            [{"name": "status_site", "patterns": ["como está o site"],
+              "action": "consultar_projeto", "slots": {"projeto": "site pessoal"}}]
+
+        Slots fixos podem usar os capturados (``"{projeto} pessoal"``); cada
+        ``{slot}`` precisa ser capturado por todos os padrões da intenção.
+
+        Returns:
+            Quantidade de intenções carregadas
+
+        Raises:
+            ValueError: Ação desconhecida ou slot fixo que não pode ser montado
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+        entradas = json.loads(path.read_text(encoding="utf-8"))
+        for entrada in entradas:
+            acao = self._intents.get(entrada["action"])
+            if acao is None:
+                raise ValueError(f"{path}: ação desconhecida '{entrada['action']}' em '{entrada['name']}'")
+            try:
+                _validar_defaults(entrada["patterns"], entrada.get("slots") or {})
+            except ValueError as e:
+                raise ValueError(f"{path}: {e} em '{entrada['name']}'") from None
+            self.register(
+                entrada["name"],
+                entrada["patterns"],
+                acao.handler,
+                guard=acao.guard,
+                priority=entrada.get("priority", 1),  # Intenções do usuário têm preferência
+                defaults=entrada.get("slots"),
+            )
+        return len(entradas)
+
+    def _compilar(self) -> Tuple[Dict[str, list], list]:
+        ordem = []
+        for intent in self._intents.values():
+            for padrao in intent.patterns:
+                ordem.append((intent, padrao))
+        ordem.sort(key=lambda item: (-item[0].priority, -_peso_literal(item[1])))
+
+        por_palavra: Dict[str, list] = {}
+        curingas = []
+        for i, (intent, padrao) in enumerate(ordem):
+            candidato = (i, intent, re.compile(f"^{compile_pattern(padrao)}$"))
+            palavras = first_words(padrao)
+            if palavras is None:
+                curingas.append(candidato)
+            else:
+                for palavra in palavras:
+                    por_palavra.setdefault(palavra, []).append(candidato)
+
+        # Os curingas valem para qualquer primeira palavra: já entram na lista
+        # de cada palavra, na ordem certa, para o match não precisar mesclar
+        indice = {
+            palavra: sorted(lista + curingas, key=lambda c: c[0])
+            for palavra, lista in por_palavra.items()
+        }
+        return indice, curingas
+
+    def match(self, texto: str) -> Optional[IntentMatch]:
+        """Encontra a intenção para o texto, ou None se nenhuma se aplica."""
+        texto = normalize_command(texto)
+        with self._lock:
+            if self._indice is None:
+                self._indice = self._compilar()
+            indice, curingas = self._indice
+
+        primeira = texto.split(" ", 1)[0]
+        for _, intent, regex in indice.get(primeira, curingas):
+            m = regex.match(texto)
+            if m is None:
+                continue
+            slots = {chave: valor.strip() for chave, valor in m.groupdict().items() if valor is not None}
+            for chave, valor in intent.defaults.items():
+                slots[chave] = valor.format(**slots) if "{" in valor else valor
+            if intent.guard is None or intent.guard(slots):
+                return IntentMatch(intent, slots)
+        return None
+
+    def route(self, texto: str) -> bool:
+        """Executa o handler da intenção correspondente; False se nenhuma se aplica."""
+        resultado = self.match(texto)
+        if resultado is None:
+            return False
+        resultado.intent.handler(resultado.slots)
+        return True
@@ -0,0 +1,191 @@
+"""
+Detecção de estado de teclas orientada a eventos.
+
+Substitui o laço ``while keyboard.is_pressed(HOTKEY): pass`` (que ocupa um
+núcleo inteiro da CPU) por espera bloqueante em ``threading.Event``, alimentada
+pelos eventos de key-down/key-up de uma fonte de eventos. A fonte padrão usa os
+hooks globais da biblioteca ``keyboard``; ``SyntheticEventSource`` permite
+simular pressionamentos sem teclado (testes e execução headless).
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+KeyCallback = Callable[[], None]
+
+
+class KeyboardEventSource:
+    """Fonte de eventos baseada nos hooks globais da biblioteca ``keyboard``."""
+
+    def __init__(self):
+        import keyboard  # Import tardio: permite usar o módulo sem hook global
+        self._keyboard = keyboard
+
+    def subscribe(self, key: str, on_down: KeyCallback, on_up: KeyCallback) -> Tuple:
+        """
+        Registra callbacks de pressionar/soltar para uma tecla.
+
+        Returns:
+            Handle a ser passado para ``unsubscribe``
+        """
+        down = self._keyboard.on_press_key(key, lambda e: on_down(), suppress=False)
+        up = self._keyboard.on_release_key(key, lambda e: on_up(), suppress=False)
+        return (down, up)
+
+    def unsubscribe(self, handle: Tuple) -> None:
+        """Remove os hooks registrados por ``subscribe``."""
+        for hook in handle:
+            try:
+                self._keyboard.unhook(hook)
+            except (KeyError, ValueError):
+                pass
+
+    def is_pressed(self, key: str) -> bool:
+        """Retorna o estado atual da tecla."""
+        return self._keyboard.is_pressed(key)
+
+
+class SyntheticEventSource:
+    """Fonte de eventos sintética, controlada via ``press``/``release``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Tuple[str, KeyCallback, KeyCallback]] = {}
+        self._pressed: Dict[str, bool] = {}
+        self._next_handle = 0
+
+    def subscribe(self, key: str, on_down: KeyCallback, on_up: KeyCallback) -> int:
+        with self._lock:
+            handle = self._next_handle
+            self._next_handle += 1
+            self._subscribers[handle] = (key.lower(), on_down, on_up)
+        return handle
+
+    def unsubscribe(self, handle: int) -> None:
+        with self._lock:
+            self._subscribers.pop(handle, None)
+
+    def is_pressed(self, key: str) -> bool:
+        return self._pressed.get(key.lower(), False)
+
+    def _emit(self, key: str, down: bool) -> None:
+        key = key.lower()
+        self._pressed[key] = down
+        with self._lock:
+            callbacks: List[KeyCallback] = [
+                (on_down if down else on_up)
+                for k, on_down, on_up in self._subscribers.values()
+                if k == key
+            ]
+        for callback in callbacks:
+            callback()
+
+    def press(self, key: str) -> None:
+        """Simula o pressionamento da tecla."""
+        self._emit(key, True)
+
+    def release(self, key: str) -> None:
+        """Simula a liberação da tecla."""
+        self._emit(key, False)
+
+    def hold(self, key: str, seconds: float) -> threading.Thread:
+        """
+        Simula a tecla pressionada por ``seconds`` em uma thread separada.
+
+        Returns:
+            Thread que executa a simulação (já iniciada)
+        """
+        def _run():
+            self.press(key)
+            time.sleep(seconds)
+            self.release(key)
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        return thread
+
+
+class KeyWatcher:
+    """Acompanha o estado de uma tecla e permite bloquear até pressionar/soltar."""
+
+    def __init__(self, key: str, source=None, max_hold_seconds: Optional[float] = None):
+        """
+        Args:
+            key: Nome da tecla (ex.: 'f12')
+            source: Fonte de eventos (padrão: ``KeyboardEventSource``)
+            max_hold_seconds: Tempo máximo de espera por ``wait_release``
+        """
+        self.key = key
+        self.source = source if source is not None else KeyboardEventSource()
+        self.max_hold_seconds = max_hold_seconds
+
+        self._down = threading.Event()
+        self._up = threading.Event()
+        self._cancelado = False
+        if self.source.is_pressed(key):
+            self._down.set()
+        else:
+            self._up.set()
+
+        self._handle = self.source.subscribe(key, self._on_down, self._on_up)
+
+    def _on_down(self) -> None:
+        if self._cancelado:
+            return
+        self._up.clear()
+        self._down.set()
+
+    def _on_up(self) -> None:
+        if self._cancelado:
+            return
+        self._down.clear()
+        self._up.set()
+
+    @property
+    def is_pressed(self) -> bool:
+        """Estado atual da tecla conforme os eventos recebidos."""
+        return self._down.is_set() and not self._cancelado
+
+    @property
+    def cancelled(self) -> bool:
+        """True depois de ``cancel``: quem acordou deve descartar o que estava fazendo."""
+        return self._cancelado
+
+    def wait_press(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloqueia até a tecla ser pressionada.
+
+        Returns:
+            True se a tecla foi pressionada, False em caso de timeout ou cancelamento
+        """
+        return self._down.wait(timeout) and not self._cancelado
+
+    def wait_release(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloqueia até a tecla ser solta ou o tempo máximo expirar.
+
+        Args:
+            timeout: Tempo máximo em segundos (padrão: ``max_hold_seconds``)
+
+        Returns:
+            True se a tecla foi solta (ou a espera foi cancelada), False se o
+            tempo máximo expirou
+        """
+        if timeout is None:
+            timeout = self.max_hold_seconds
+        return self._up.wait(timeout)
+
+    def wait_idle(self) -> None:
+        """Bloqueia, sem limite de tempo, até a tecla estar solta."""
+        self._up.wait()
+
+    def cancel(self) -> None:
+        """Acorda quem está em ``wait_press``/``wait_release``/``wait_idle`` (ex.: plugin parando)."""
+        self._cancelado = True
+        self._down.set()
+        self._up.set()
+
+    def close(self) -> None:
+        """Remove os hooks de teclado."""
+        self.source.unsubscribe(self._handle)
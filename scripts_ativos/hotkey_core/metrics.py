@@ -0,0 +1,325 @@
+"""
+Métricas e spans leves para os caminhos quentes dos scripts de hotkey.
+
+- ``counter(nome)``: contador monotônico (``inc``)
+- ``histogram(nome)``: distribuição em buckets fixos, com soma e contagem
+  (formato Prometheus) e uma amostra das últimas observações para o resumo
+  ``--stats`` (p50/p95/máx)
+- ``span(nome)``: context manager que cronometra o bloco e registra em
+  ``<nome>_seconds``
+- Rótulos opcionais (``inc(intent="criar_projeto")``) viram séries separadas
+
+Desligado (padrão), ``span`` devolve sempre o mesmo context manager vazio e
+``inc``/``observe`` retornam na primeira linha: o custo é uma chamada de
+função. Ligado, cada observação é um ``bisect`` e um append sob lock.
+
+Exportação: texto Prometheus em arquivo (regravado periodicamente, de forma
+atômica) e/ou ``http://127.0.0.1:<porta>/metrics``; ``summary()`` monta a
+tabela do ``--stats``.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+# Buckets em segundos: de 1ms (UI) a 1min (transcrição longa)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_NULO = nullcontext()
+
+
+def _rotulos(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _formatar_rotulos(rotulos: Labels, extra: str = "") -> str:
+    partes = [f'{k}="{v}"' for k, v in rotulos]
+    if extra:
+        partes.append(extra)
+    return "{" + ",".join(partes) + "}" if partes else ""
+
+
+class Counter:
+    """Contador monotônico."""
+
+    def __init__(self, registry: "Registry", name: str, help: str = ""):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self._valores: Dict[Labels, float] = {}
+
+    def inc(self, valor: float = 1.0, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        chave = _rotulos(labels) if labels else ()
+        with self.registry.lock:
+            self._valores[chave] = self._valores.get(chave, 0.0) + valor
+
+    def value(self, **labels) -> float:
+        return self._valores.get(_rotulos(labels), 0.0)
+
+    def render(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for rotulos, valor in sorted(self._valores.items()):
+            linhas.append(f"{self.name}{_formatar_rotulos(rotulos)} {valor:g}")
+        return linhas
+
+
+class _Serie:
+    """Uma série de histograma: contagem por bucket, soma e amostra recente."""
+
+    __slots__ = ("buckets", "count", "sum", "max", "recentes")
+
+    def __init__(self, n_buckets: int, reservoir: int):
+        self.buckets = [0] * n_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.recentes: Deque[float] = deque(maxlen=reservoir)
+
+
+class Histogram:
+    """Distribuição de valores (em geral, segundos) em buckets fixos."""
+
+    def __init__(self, registry: "Registry", name: str, help: str = "",
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS, reservoir: int = 1024):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.limites = tuple(sorted(buckets))
+        self.reservoir = reservoir
+        self._series: Dict[Labels, _Serie] = {}
+
+    def observe(self, valor: float, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        chave = _rotulos(labels) if labels else ()
+        i = bisect.bisect_left(self.limites, valor)
+        with self.registry.lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = self._series[chave] = _Serie(len(self.limites), self.reservoir)
+            if i < len(self.limites):
+                serie.buckets[i] += 1
+            serie.count += 1
+            serie.sum += valor
+            serie.max = max(serie.max, valor)
+            serie.recentes.append(valor)
+
+    def time(self, **labels):
+        """Context manager que registra a duração do bloco."""
+        if not self.registry.enabled:
+            return _NULO
+        return _Span(self, labels)
+
+    def series(self) -> Dict[Labels, _Serie]:
+        return self._series
+
+    def render(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for rotulos, serie in sorted(self._series.items()):
+            acumulado = 0
+            for limite, n in zip(self.limites, serie.buckets):
+                acumulado += n
+                le = _formatar_rotulos(rotulos, f'le="{limite:g}"')
+                linhas.append(f"{self.name}_bucket{le} {acumulado}")
+            le = _formatar_rotulos(rotulos, 'le="+Inf"')
+            linhas.append(f"{self.name}_bucket{le} {serie.count}")
+            linhas.append(f"{self.name}_sum{_formatar_rotulos(rotulos)} {serie.sum:.6f}")
+            linhas.append(f"{self.name}_count{_formatar_rotulos(rotulos)} {serie.count}")
+        return linhas
+
+
+class _Span:
+    """Cronometra um bloco e registra no histograma ao sair."""
+
+    __slots__ = ("histograma", "labels", "inicio")
+
+    def __init__(self, histograma: Histogram, labels: Dict[str, str]):
+        self.histograma = histograma
+        self.labels = labels
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histograma.observe(time.perf_counter() - self.inicio, **self.labels)
+        return False
+
+
+class Registry:
+    """Conjunto de métricas de um processo."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self._metricas: Dict[str, object] = {}
+        self._exportador: Optional[threading.Thread] = None
+        self._parar = threading.Event()
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._arquivo: Optional[Path] = None
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        if name not in self._metricas:
+            self._metricas[name] = Counter(self, name, help)
+        return self._metricas[name]
+
+    def histogram(self, name: str, help: str = "", buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self._metricas:
+            self._metricas[name] = Histogram(self, name, help, buckets)
+        return self._metricas[name]
+
+    def span(self, name: str, **labels):
+        """Cronometra o bloco em ``<name>_seconds`` (nada a fazer se desligado)."""
+        if not self.enabled:
+            return _NULO
+        return _Span(self.histogram(f"{name}_seconds"), labels)
+
+    # ---------- exportação ----------
+
+    def render_prometheus(self) -> str:
+        """Todas as métricas no formato texto do Prometheus."""
+        with self.lock:
+            linhas = []
+            for metrica in self._metricas.values():
+                linhas.extend(metrica.render())
+        return "\n".join(linhas) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Grava o texto Prometheus de forma atômica (arquivo temporário + replace)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.render_prometheus(), encoding="utf-8")
+        tmp.replace(path)
+
+    def summary(self) -> str:
+        """Tabela com contagem, média, p50, p95 e máximo de cada histograma e os contadores."""
+        linhas = []
+        with self.lock:
+            metricas = list(self._metricas.values())
+            for metrica in metricas:
+                if not isinstance(metrica, Histogram):
+                    continue
+                for rotulos, serie in sorted(metrica.series().items()):
+                    if not serie.count:
+                        continue
+                    amostra = sorted(serie.recentes)
+                    p50 = amostra[len(amostra) // 2]
+                    p95 = amostra[min(len(amostra) - 1, int(len(amostra) * 0.95))]
+                    nome = metrica.name + _formatar_rotulos(rotulos)
+                    unidade, fator = ("ms", 1000) if metrica.name.endswith("_seconds") else ("", 1)
+                    linhas.append(
+                        f"  {nome:<48} n={serie.count:<6} média={serie.sum / serie.count * fator:9.1f}{unidade} "
+                        f"p50={p50 * fator:9.1f}{unidade} p95={p95 * fator:9.1f}{unidade} "
+                        f"máx={serie.max * fator:9.1f}{unidade}"
+                    )
+            for metrica in metricas:
+                if isinstance(metrica, Counter):
+                    for rotulos, valor in sorted(metrica._valores.items()):
+                        linhas.append(f"  {metrica.name + _formatar_rotulos(rotulos):<48} {valor:g}")
+        return "\n".join(linhas) if linhas else "  (nenhuma métrica registrada)"
+
+    def start_exporters(self, file: Optional[Path] = None, port: Optional[int] = None,
+                        interval: float = 10.0, host: str = "127.0.0.1") -> None:
+        """
+        Liga as métricas e inicia os exportadores pedidos.
+
+        Args:
+            file: Arquivo texto Prometheus (ex.: para o textfile collector do
+                node_exporter), regravado a cada ``interval`` segundos
+            port: Porta do endpoint HTTP ``/metrics`` (só em ``host``)
+        """
+        self.enabled = True
+        if file:
+            self._arquivo = Path(file)
+
+            def gravar_periodicamente():
+                while not self._parar.wait(interval):
+                    self._gravar_arquivo()
+
+            self._exportador = threading.Thread(target=gravar_periodicamente, name="metrics-file", daemon=True)
+            self._exportador.start()
+        if port is not None:
+            registry = self
+
+            class _Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.rstrip("/") not in ("", "/metrics"):
+                        self.send_error(404)
+                        return
+                    corpo = registry.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(corpo)))
+                    self.end_headers()
+                    self.wfile.write(corpo)
+
+                def log_message(self, *args):
+                    pass  # Sem uma linha no console por scrape
+
+            self._http = ThreadingHTTPServer((host, port), _Handler)
+            self._http.daemon_threads = True
+            threading.Thread(target=self._http.serve_forever, name="metrics-http", daemon=True).start()
+
+    @property
+    def http_address(self) -> Optional[Tuple[str, int]]:
+        return self._http.server_address[:2] if self._http else None
+
+    def _gravar_arquivo(self) -> None:
+        try:
+            self.write_prometheus(self._arquivo)
+        except OSError as e:
+            print(f"Aviso: não foi possível gravar as métricas em {self._arquivo}: {e}")
+
+    def stop_exporters(self) -> None:
+        """Para os exportadores (grava o arquivo uma última vez)."""
+        self._parar.set()
+        if self._arquivo:
+            self._gravar_arquivo()
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+
+
+# Registro padrão do processo (desligado até ``configure``/``start_exporters``)
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+span = REGISTRY.span
+
+
+def add_arguments(parser) -> None:
+    """Acrescenta ``--stats``, ``--metrics-file`` e ``--metrics-port`` a um argparse."""
+    grupo = parser.add_argument_group("métricas")
+    grupo.add_argument("--stats", action="store_true", help="Mostra um resumo das latências ao encerrar")
+    grupo.add_argument("--metrics-file", type=Path, help="Exporta métricas Prometheus (texto) neste arquivo")
+    grupo.add_argument("--metrics-port", type=int, help="Exporta métricas em http://127.0.0.1:<porta>/metrics")
+
+
+def configure(args) -> None:
+    """Liga as métricas se algum dos argumentos de ``add_arguments`` foi usado."""
+    if args.stats or args.metrics_file or args.metrics_port is not None:
+        REGISTRY.start_exporters(file=args.metrics_file, port=args.metrics_port)
+        if REGISTRY.http_address:
+            host, porta = REGISTRY.http_address
+            print(f"[Métricas] http://{host}:{porta}/metrics", flush=True)
+
+
+def finish(args) -> None:
+    """Para os exportadores e, com ``--stats``, imprime o resumo."""
+    if not REGISTRY.enabled:
+        return
+    REGISTRY.stop_exporters()
+    if args.stats:
+        print("\n[Estatísticas]")
+        print(REGISTRY.summary(), flush=True)
@@ -0,0 +1,100 @@
+"""
+Carregamento do modelo em background com warm-up.
+
+Importar ``whisper``/``torch`` e carregar os pesos leva segundos. O
+``BackgroundModelLoader`` faz isso em uma thread separada para que a hotkey
+seja armada imediatamente; quem precisar do modelo antes de ele ficar pronto
+simplesmente bloqueia em ``get()``/``transcribe()`` — o áudio continua sendo
+gravado e a transcrição fica na fila até o modelo estar disponível.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class BackgroundModelLoader:
+    """Carrega um modelo em background e expõe ``transcribe`` com espera."""
+
+    def __init__(
+        self,
+        load_fn: Callable[[], Any],
+        warmup_fn: Optional[Callable[[Any], None]] = None,
+        started_at: Optional[float] = None,
+        name: str = "Whisper",
+    ):
+        """
+        Args:
+            load_fn: Função que importa e retorna o modelo
+            warmup_fn: Função chamada com o modelo carregado (ex.: decode vazio)
+            started_at: ``time.perf_counter()`` do início do processo, para os logs
+            name: Nome usado nas mensagens
+        """
+        self.load_fn = load_fn
+        self.warmup_fn = warmup_fn
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.name = name
+
+        self._model: Any = None
+        self._erro: Optional[BaseException] = None
+        self._pronto = threading.Event()
+        self._primeira_transcricao = True
+        # O Whisper não é thread-safe (hooks do kv-cache): uma transcrição por vez
+        self._lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            t0 = time.perf_counter()
+            model = self.load_fn()
+            t1 = time.perf_counter()
+            if self.warmup_fn is not None:
+                self.warmup_fn(model)
+            t2 = time.perf_counter()
+            self._model = model
+            print(f"[Startup] Modelo {self.name} carregado em {t1 - t0:.2f}s "
+                  f"(warm-up {t2 - t1:.2f}s, {t2 - self.started_at:.2f}s desde o início).", flush=True)
+        except BaseException as e:
+            self._erro = e
+            print(f"✗ Erro ao carregar modelo {self.name}: {e}", flush=True)
+        finally:
+            self._pronto.set()
+
+    @property
+    def ready(self) -> bool:
+        """True quando o modelo terminou de carregar (com ou sem erro)."""
+        return self._pronto.is_set()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Retorna o modelo, bloqueando até ele estar carregado.
+
+        Raises:
+            TimeoutError: Se o modelo não carregou dentro do timeout
+            RuntimeError: Se o carregamento falhou
+        """
+        if not self._pronto.is_set():
+            print(f"[Aguardando] Modelo {self.name} ainda carregando...", flush=True)
+            if not self._pronto.wait(timeout):
+                raise TimeoutError(f"Modelo {self.name} não carregou em {timeout}s")
+        if self._erro is not None:
+            raise RuntimeError(f"Falha ao carregar modelo {self.name}") from self._erro
+        return self._model
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        """
+        Equivalente a ``model.transcribe``, aguardando o carregamento se preciso.
+
+        Chamadas concorrentes (janela do streaming de uma fala enquanto o
+        pipeline termina a anterior) são serializadas.
+        """
+        modelo = self.get()
+        with self._lock:
+            resultado = modelo.transcribe(audio, **kwargs)
+        if self._primeira_transcricao:
+            self._primeira_transcricao = False
+            print(f"[Startup] Primeira transcrição concluída "
+                  f"{time.perf_counter() - self.started_at:.2f}s após o início.", flush=True)
+        return resultado
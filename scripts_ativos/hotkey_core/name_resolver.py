@@ -0,0 +1,175 @@
+"""
+Resolução aproximada de nomes de projeto falados.
+
+O Whisper transcreve "e-commerce" como "ecomerce", "e commerce", "écomerce"...
+O ``ProjectNameResolver`` mantém um índice pré-calculado dos nomes de projeto:
+
+- Forma normalizada (minúsculas, sem acento, só letras/dígitos)
+- Chave fonética simplificada para português (ç/ss/z → s, ch → x, qu → k...)
+- Índice invertido de trigramas das duas formas
+
+Uma consulta gera os trigramas do nome falado, conta os compartilhados com
+cada candidato via o índice invertido e pontua com o coeficiente de Dice.
+Só os candidatos que compartilham algum trigrama são visitados, então a
+resolução não varre todos os projetos.
+"""
+
+import heapq
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Set
+
+
+class NameMatch(NamedTuple):
+    """Melhor candidato para um nome falado."""
+
+    name: str
+    score: float  # Confiança entre 0 e 1
+
+
+def normalize_name(nome: str) -> str:
+    """Minúsculas, sem acentos e sem separadores ("E-Commerce" → "ecommerce")."""
+    sem_acento = unicodedata.normalize("NFKD", nome.lower())
+    return "".join(c for c in sem_acento if c.isalnum())
+
+
+# Regras aplicadas em ordem sobre o nome já normalizado (o ç vira s antes:
+# sem o acento ele seria um c comum e cairia na regra c → k)
+_REGRAS_FONETICAS = [
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"ch|sh"), "x"),
+    (re.compile(r"lh"), "l"),
+    (re.compile(r"nh"), "n"),
+    (re.compile(r"qu|q"), "k"),
+    (re.compile(r"c(?=[ei])"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"y"), "i"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"g(?=[ei])"), "j"),
+    (re.compile(r"^h|(?<=[^sclnp])h"), ""),
+    (re.compile(r"(.)\1+"), r"\1"),  # Letras repetidas ("commerce" → "comerce")
+]
+
+
+def phonetic_key(nome: str) -> str:
+    """Chave fonética aproximada para nomes falados em português."""
+    chave = normalize_name(nome.lower().replace("ç", "s"))
+    for padrao, troca in _REGRAS_FONETICAS:
+        chave = padrao.sub(troca, chave)
+    return chave
+
+
+# Um trigrama é "frequente" se aparece em mais de 10% dos nomes (e em mais
+# de _MIN_FREQUENTE); só os _MAX_CANDIDATOS mais promissores são pontuados
+_MIN_FREQUENTE = 64
+_MAX_CANDIDATOS = 64
+
+
+def _trigrams(texto: str) -> Set[str]:
+    texto = f"  {texto} "
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class ProjectNameResolver:
+    """Índice de trigramas/fonético dos nomes de projeto."""
+
+    def __init__(self, names=()):
+        self._lock = threading.Lock()
+        self._normal: Dict[str, str] = {}  # normalizado → nome original
+        self._fonetico: Dict[str, str] = {}  # chave fonética → nome original
+        self._trigramas: Dict[str, Set[str]] = {}  # nome → trigramas
+        self._postings: Dict[str, Set[str]] = defaultdict(set)  # trigrama → nomes
+        for nome in names:
+            self.add(nome)
+
+    def __len__(self) -> int:
+        return len(self._trigramas)
+
+    def __contains__(self, nome: str) -> bool:
+        return nome in self._trigramas
+
+    def add(self, nome: str) -> None:
+        """Indexa um nome de projeto."""
+        with self._lock:
+            if nome in self._trigramas:
+                return
+            normal = normalize_name(nome)
+            fonetico = phonetic_key(nome)
+            trigramas = _trigrams(normal) | {"#" + t for t in _trigrams(fonetico)}
+            self._normal[normal] = nome
+            self._fonetico[fonetico] = nome
+            self._trigramas[nome] = trigramas
+            for t in trigramas:
+                self._postings[t].add(nome)
+
+    def remove(self, nome: str) -> None:
+        """Remove um nome do índice."""
+        with self._lock:
+            trigramas = self._trigramas.pop(nome, None)
+            if trigramas is None:
+                return
+            for t in trigramas:
+                self._postings[t].discard(nome)
+                if not self._postings[t]:
+                    del self._postings[t]
+            if self._normal.get(normalize_name(nome)) == nome:
+                del self._normal[normalize_name(nome)]
+            if self._fonetico.get(phonetic_key(nome)) == nome:
+                del self._fonetico[phonetic_key(nome)]
+
+    def rename(self, antigo: str, novo: str) -> None:
+        """Atualiza o índice após renomear um projeto."""
+        self.remove(antigo)
+        self.add(novo)
+
+    def candidates(self, falado: str, limit: int = 3) -> List[NameMatch]:
+        """
+        Retorna os melhores candidatos para um nome falado.
+
+        Correspondência exata normalizada vale 1.0 e fonética 0.95; os demais
+        recebem o coeficiente de Dice dos trigramas.
+        """
+        normal = normalize_name(falado)
+        if not normal:
+            return []
+        fonetico = phonetic_key(falado)
+
+        with self._lock:
+            if normal in self._normal:
+                return [NameMatch(self._normal[normal], 1.0)]
+            exato_fonetico = self._fonetico.get(fonetico)
+            if exato_fonetico is not None and limit == 1:
+                return [NameMatch(exato_fonetico, 0.95)]
+
+            consulta = _trigrams(normal) | {"#" + t for t in _trigrams(fonetico)}
+            # Trigramas presentes em muitos nomes ("  a", " 1 ") custam caro e
+            # quase não discriminam: os candidatos vêm só dos trigramas raros e
+            # a pontuação final usa a interseção exata dos conjuntos
+            limite = max(_MIN_FREQUENTE, len(self._trigramas) // 10)
+            raros = [t for t in consulta if 0 < len(self._postings.get(t, ())) <= limite]
+            fontes = raros or consulta
+            comuns = Counter(chain.from_iterable(self._postings.get(t, ()) for t in fontes))
+            candidatos = {
+                nome: self._trigramas[nome]
+                for nome, _ in comuns.most_common(_MAX_CANDIDATOS)
+            }
+
+        pontuados = [
+            NameMatch(nome, 2.0 * len(consulta & trigramas) / (len(consulta) + len(trigramas)))
+            for nome, trigramas in candidatos.items()
+        ]
+
+        if exato_fonetico is not None:
+            pontuados = [m for m in pontuados if m.name != exato_fonetico]
+            pontuados.append(NameMatch(exato_fonetico, 0.95))
+
+        return heapq.nlargest(limit, pontuados, key=lambda m: m.score)
+
+    def resolve(self, falado: str) -> Optional[NameMatch]:
+        """Melhor candidato para o nome falado, ou None se nenhum compartilha trigramas."""
+        melhores = self.candidates(falado, limit=1)
+        return melhores[0] if melhores else None
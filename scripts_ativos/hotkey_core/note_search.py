@@ -0,0 +1,178 @@
+"""
+Busca full-text nas notas dos projetos.
+
+Cada seção ``## <timestamp>`` escrita por ``adicionar_info_projeto`` vira um
+documento em um índice invertido SQLite FTS5 (tokenizer ``unicode61`` com
+``remove_diacritics``, então "acao" encontra "ação"). A indexação é
+incremental: como os arquivos de notas são append-only, o índice guarda o
+offset em bytes já processado de cada arquivo e, a cada nova nota, lê apenas
+o trecho acrescentado. O ranking usa BM25 e os trechos vêm de ``snippet()``.
+"""
+
+import re
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes USING fts5(
+    projeto UNINDEXED,
+    timestamp UNINDEXED,
+    texto,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS note_files (
+    projeto TEXT PRIMARY KEY,
+    path    TEXT NOT NULL,
+    offset  INTEGER NOT NULL
+);
+"""
+
+# Palavras muito frequentes em português, ignoradas na consulta
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por pelo pela
+para pra com sem e ou que se sobre ao aos à às é eu me meu minha isso este
+esta esse essa aquele aquela
+""".split())
+
+_SECAO = re.compile(r"^## (.+)$", re.MULTILINE)
+
+
+def normalize_token(token: str) -> str:
+    """Minúsculas e sem acentos (mesma normalização do tokenizer do índice)."""
+    sem_acento = unicodedata.normalize("NFKD", token.lower())
+    return "".join(c for c in sem_acento if not unicodedata.combining(c))
+
+
+_STOPWORDS_NORMALIZADAS = frozenset(normalize_token(p) for p in STOPWORDS)
+
+
+def tokenize(texto: str) -> List[str]:
+    """Quebra o texto em tokens normalizados, sem stopwords."""
+    tokens = re.findall(r"\w+", normalize_token(texto))
+    return [t for t in tokens if t not in _STOPWORDS_NORMALIZADAS]
+
+
+def parse_sections(texto: str) -> List[Tuple[str, str]]:
+    """
+    Extrai as seções ``## timestamp`` de um trecho de arquivo de notas.
+
+    O cabeçalho antes da primeira seção (título, data de criação) é ignorado.
+
+    Returns:
+        Lista de (timestamp, conteúdo)
+    """
+    secoes = []
+    marcas = list(_SECAO.finditer(texto))
+    for i, marca in enumerate(marcas):
+        fim = marcas[i + 1].start() if i + 1 < len(marcas) else len(texto)
+        conteudo = texto[marca.end():fim].strip()
+        if conteudo:
+            secoes.append((marca.group(1).strip(), conteudo))
+    return secoes
+
+
+class NoteSearchIndex:
+    """Índice invertido incremental das notas de todos os projetos."""
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Banco SQLite (pode ser o mesmo do ``ProjectIndex``)
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def sync_file(self, projeto: str, path: Path) -> int:
+        """
+        Indexa apenas o que foi acrescentado ao arquivo desde a última chamada.
+
+        Se o arquivo encolheu (editado à mão), ele é reindexado do zero.
+
+        Returns:
+            Quantidade de seções indexadas
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT offset FROM note_files WHERE projeto = ?", (projeto,)
+            ).fetchone()
+            offset = row["offset"] if row else 0
+            tamanho = path.stat().st_size
+
+            if tamanho < offset:
+                self._conn.execute("DELETE FROM notes WHERE projeto = ?", (projeto,))
+                offset = 0
+            if tamanho == offset:
+                return 0
+
+            with open(path, "rb") as f:
+                f.seek(offset)
+                novo = f.read()
+
+            secoes = parse_sections(novo.decode("utf-8", errors="replace"))
+            self._conn.executemany(
+                "INSERT INTO notes (projeto, timestamp, texto) VALUES (?, ?, ?)",
+                [(projeto, ts, conteudo) for ts, conteudo in secoes],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO note_files (projeto, path, offset) VALUES (?, ?, ?)",
+                (projeto, str(path), offset + len(novo)),
+            )
+            return len(secoes)
+
+    def rename_project(self, antigo: str, novo: str, path: Path) -> None:
+        """Move as notas indexadas de um projeto renomeado para o novo nome."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE notes SET projeto = ? WHERE projeto = ?", (novo, antigo))
+            self._conn.execute(
+                "UPDATE note_files SET projeto = ?, path = ? WHERE projeto = ?",
+                (novo, str(path), antigo),
+            )
+
+    def sync_all(self, projetos_dir: Path) -> int:
+        """Sincroniza os arquivos ``projetos/<nome>/<nome>.md`` de todos os projetos."""
+        total = 0
+        for pasta in Path(projetos_dir).iterdir():
+            if pasta.is_dir():
+                total += self.sync_file(pasta.name, pasta / f"{pasta.name}.md")
+        return total
+
+    def search(self, consulta: str, limit: int = 10, snippet_tokens: int = 12) -> List[Dict]:
+        """
+        Busca notas que contenham todos os termos (prefixo, sem acento).
+
+        Returns:
+            Lista de {projeto, timestamp, snippet, score}, melhores primeiro
+        """
+        termos = tokenize(consulta)
+        if not termos:
+            return []
+        # Cada termo entre aspas (escapa a sintaxe FTS) e como prefixo
+        expressao = " ".join(f'"{t}"*' for t in termos)
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT projeto, timestamp, "
+                "snippet(notes, 2, '[', ']', '…', ?) AS snippet, bm25(notes) AS score "
+                "FROM notes WHERE notes MATCH ? ORDER BY score LIMIT ?",
+                (snippet_tokens, expressao, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self) -> int:
+        """Total de notas indexadas."""
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM notes").fetchone()[0]
@@ -0,0 +1,211 @@
+"""
+Notificações visuais sem bloquear a hotkey nem a UI.
+
+A API de toast do sistema (``plyer.notification.notify``) pode levar
+centenas de milissegundos. ``NotificationDispatcher.notify`` só registra a
+mensagem e retorna; uma thread própria entrega ao sink:
+
+- Mensagens com a mesma chave (por padrão, o título) ainda não exibidas se
+  fundem: só a mais recente aparece ("Seletor aberto" seguido de
+  "Executando /review" vira um único toast)
+- Intervalo mínimo entre toasts; o que chega nesse meio tempo fica pendente
+  e continua se fundindo
+- Mensagens pendentes há mais de ``max_age`` segundos são descartadas (um
+  "Seletor aberto" atrasado só confunde)
+- No máximo ``maxsize`` chaves pendentes; além disso a mais antiga sai
+
+Sinks: ``PlyerSink`` (toast do sistema), ``ConsoleSink`` e ``NullSink``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass
+class Notification:
+    """Uma notificação pendente."""
+
+    title: str
+    message: str
+    duration: int = 3
+    key: str = ""
+    created: float = field(default_factory=time.monotonic)
+    merged: int = 1  # Quantas mensagens foram fundidas nesta
+
+
+# ==================== SINKS ====================
+
+class NotificationSink:
+    """Destino das notificações (chamado só na thread do dispatcher)."""
+
+    name = "base"
+
+    def show(self, notification: Notification) -> None:
+        raise NotImplementedError
+
+
+class PlyerSink(NotificationSink):
+    """Toast do sistema via ``plyer`` (opcional)."""
+
+    name = "plyer"
+
+    def __init__(self, app_name: str = "Claude Code"):
+        from plyer import notification  # ImportError se o plyer não estiver instalado
+        self._notification = notification
+        self.app_name = app_name
+
+    def show(self, notification: Notification) -> None:
+        self._notification.notify(
+            title=notification.title,
+            message=notification.message,
+            app_name=self.app_name,
+            timeout=notification.duration,
+        )
+
+
+class ConsoleSink(NotificationSink):
+    """Escreve a notificação no console."""
+
+    name = "console"
+
+    def show(self, notification: Notification) -> None:
+        print(f"🔔 {notification.title}: {notification.message}", flush=True)
+
+
+class NullSink(NotificationSink):
+    """Descarta as notificações."""
+
+    name = "none"
+
+    def show(self, notification: Notification) -> None:
+        pass
+
+
+def default_sink(nome: str = "", app_name: str = "Claude Code") -> NotificationSink:
+    """
+    Sink pelo nome (``plyer``, ``console``, ``none``); sem nome, o plyer se
+    estiver instalado, senão nenhum (mesmo comportamento de antes).
+    """
+    if nome == "console":
+        return ConsoleSink()
+    if nome == "none":
+        return NullSink()
+    try:
+        return PlyerSink(app_name)
+    except ImportError:
+        if nome == "plyer":
+            print("Aviso: plyer não instalado, notificações desativadas.")
+        return NullSink()
+
+
+# ==================== DISPATCHER ====================
+
+class NotificationDispatcher:
+    """Fila limitada de notificações, entregue ao sink por uma thread própria."""
+
+    def __init__(
+        self,
+        sink: Optional[NotificationSink] = None,
+        maxsize: int = 8,
+        min_interval: float = 1.0,
+        max_age: float = 5.0,
+    ):
+        """
+        Args:
+            sink: Destino (None = ``default_sink()``)
+            maxsize: Chaves pendentes ao mesmo tempo
+            min_interval: Segundos mínimos entre duas notificações exibidas
+            max_age: Pendentes mais velhas que isso são descartadas
+        """
+        self.sink = sink or default_sink()
+        self.maxsize = maxsize
+        self.min_interval = min_interval
+        self.max_age = max_age
+        self.shown = 0
+        self.merged = 0  # Mensagens fundidas em outra pendente
+        self.dropped = 0  # Descartadas por fila cheia ou por idade
+        self._cond = threading.Condition()
+        self._pendentes: "OrderedDict[str, Notification]" = OrderedDict()
+        self._ultimo_toast = float("-inf")
+        self._ocupado = False
+        self._fechado = False
+        self._thread = threading.Thread(target=self._run, name="notifications", daemon=True)
+        self._thread.start()
+
+    def notify(self, title: str, message: str, duration: int = 3, key: Optional[str] = None) -> None:
+        """Agenda a notificação e retorna na hora (nunca espera o sink)."""
+        chave = key if key is not None else title
+        with self._cond:
+            if self._fechado:
+                return
+            anterior = self._pendentes.get(chave)
+            nova = Notification(title, message, duration, chave)
+            if anterior is not None:
+                # Funde com a pendente: fica a mensagem nova, na vez da antiga
+                nova.merged = anterior.merged + 1
+                self.merged += 1
+            self._pendentes[chave] = nova  # Chave existente mantém a posição
+            if len(self._pendentes) > self.maxsize:
+                self._pendentes.popitem(last=False)
+                self.dropped += 1
+            self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pendentes)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera as pendentes serem exibidas ou descartadas; False se o timeout expirou."""
+        limite = time.monotonic() + timeout
+        with self._cond:
+            while self._pendentes or self._ocupado:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                self._cond.wait(restante)
+        return True
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Para a thread; pendentes ainda não exibidas são descartadas."""
+        with self._cond:
+            self._fechado = True
+            self._pendentes.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._fechado:
+                        return
+                    agora = time.monotonic()
+                    # Descarta as velhas (uma fundida conta a partir da mensagem mais nova)
+                    for chave in [c for c, n in self._pendentes.items() if agora - n.created > self.max_age]:
+                        del self._pendentes[chave]
+                        self.dropped += 1
+                    if not self._pendentes:
+                        self._cond.notify_all()  # Acorda flush()
+                        self._cond.wait()
+                        continue
+                    # Respeita o intervalo mínimo; o que chegar até lá se funde
+                    espera = self._ultimo_toast + self.min_interval - agora
+                    if espera > 0:
+                        self._cond.wait(espera)
+                        continue
+                    _, notificacao = self._pendentes.popitem(last=False)
+                    self._ocupado = True
+                    break
+
+            try:
+                self.sink.show(notificacao)
+            except Exception:
+                pass  # Fallback silencioso se a notificação falhar
+            with self._cond:
+                self._ultimo_toast = time.monotonic()
+                self._ocupado = False
+                self.shown += 1
+                self._cond.notify_all()
@@ -0,0 +1,115 @@
+"""
+Pipeline em estágios para processar falas sem bloquear a hotkey.
+
+A captura roda na thread da hotkey e entrega cada fala (``Utterance``) ao
+pipeline; cada estágio seguinte (ex.: transcrição, despacho do comando) tem
+sua própria thread e fila limitada. Com um worker por estágio, as falas são
+processadas na ordem em que foram gravadas. Quando a fila de entrada está
+cheia, ``submit`` espera até ``put_timeout`` e então descarta a fala
+(backpressure), em vez de acumular áudio sem limite.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_FIM = object()
+_ids = itertools.count(1)
+
+
+@dataclass
+class Utterance:
+    """Uma fala capturada e seu progresso pelo pipeline."""
+
+    id: int = field(default_factory=lambda: next(_ids))
+    marks: Dict[str, float] = field(default_factory=dict)
+    ring: Any = None
+    streamer: Any = None
+    text: str = ""
+
+    def __post_init__(self):
+        self.mark("created")
+
+    def mark(self, etapa: str) -> None:
+        """Registra o instante (``time.perf_counter``) em que a etapa terminou."""
+        self.marks[etapa] = time.perf_counter()
+
+    def elapsed(self, inicio: str, fim: str) -> float:
+        """Tempo em segundos entre duas marcas."""
+        return self.marks[fim] - self.marks[inicio]
+
+
+StageFn = Callable[[Utterance], Optional[Utterance]]
+
+
+class Pipeline:
+    """Sequência de estágios, cada um com uma thread e uma fila limitada."""
+
+    def __init__(self, stages: List[Tuple[str, StageFn]], maxsize: int = 3, put_timeout: float = 0.5):
+        """
+        Args:
+            stages: Lista de (nome, função). A função recebe a fala e retorna a
+                fala para o próximo estágio, ou None para encerrá-la ali
+            maxsize: Capacidade da fila de entrada de cada estágio
+            put_timeout: Espera máxima em ``submit`` com a fila cheia
+        """
+        self.put_timeout = put_timeout
+        self.dropped = 0
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize) for _ in stages]
+        self._threads: List[threading.Thread] = []
+
+        for i, (nome, fn) in enumerate(stages):
+            saida = self._queues[i + 1] if i + 1 < len(stages) else None
+            thread = threading.Thread(
+                target=self._worker, args=(nome, fn, self._queues[i], saida),
+                name=f"pipeline-{nome}", daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self, nome: str, fn: StageFn, entrada: queue.Queue, saida: Optional[queue.Queue]) -> None:
+        while True:
+            utt = entrada.get()
+            if utt is _FIM:
+                if saida is not None:
+                    saida.put(_FIM)
+                return
+            try:
+                resultado = fn(utt)
+            except Exception as e:
+                print(f"✗ Erro no estágio '{nome}' (fala #{utt.id}): {e}", flush=True)
+                continue
+            if resultado is None:
+                continue
+            resultado.mark(nome)
+            if saida is not None:
+                # Estágios internos não descartam: esperam o próximo liberar espaço
+                saida.put(resultado)
+
+    def submit(self, utt: Utterance) -> bool:
+        """
+        Entrega uma fala ao primeiro estágio.
+
+        Returns:
+            True se aceita, False se descartada por fila cheia
+        """
+        try:
+            self._queues[0].put(utt, timeout=self.put_timeout)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    @property
+    def pending(self) -> int:
+        """Total de falas aguardando nas filas."""
+        return sum(q.qsize() for q in self._queues)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Processa o que está nas filas e encerra as threads."""
+        self._queues[0].put(_FIM)
+        for thread in self._threads:
+            thread.join(timeout)
@@ -0,0 +1,388 @@
+"""
+Lançamento de processos (Claude Code) sem bloquear a hotkey nem a UI.
+
+- Os comandos são listas de argumentos, sem ``shell=True``: o prompt falado
+  vai como um único argumento, então aspas, ``&`` ou ``|`` no texto não
+  viram sintaxe do shell. No Windows um ``.exe`` abre direto; só o
+  ``claude.cmd`` do npm precisa do cmd, e aí cada argumento é escapado
+  (``cmd_escape``)
+- O ``Popen`` e a espera pelo fim do processo rodam em uma thread por
+  sessão; ``launch`` só registra a sessão e retorna
+- O backend decide onde o processo aparece: nova janela de console no
+  Windows, um emulador de terminal no Linux, ou sem terminal (headless,
+  com a saída em arquivo de log)
+- Cada sessão guarda PID, início, fim e código de saída; há um limite de
+  sessões simultâneas
+- Com um ``WarmProcessPool`` (opcional), ``launch_warm`` entrega o prompt a
+  um ``claude -p`` já iniciado em vez de partir um processo a frio
+
+O executável do Claude vem de ``CLAUDE_BIN`` (padrão ``claude``), o que
+permite testar tudo no Linux com um ``claude`` falso.
+"""
+
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .process_pool import WarmProcessPool
+
+CLAUDE_BIN = os.environ.get("CLAUDE_BIN", "claude")
+CLAUDE_FLAGS = ["--dangerously-skip-permissions"]
+
+
+def claude_argv(*args: str) -> List[str]:
+    """Linha de comando do Claude Code com as flags padrão."""
+    return [CLAUDE_BIN, *CLAUDE_FLAGS, *args]
+
+
+@dataclass
+class Session:
+    """Um processo lançado e seu estado."""
+
+    id: int
+    argv: List[str]
+    title: str
+    backend: str
+    status: str = "starting"  # starting → running → exited | failed
+    pid: Optional[int] = None
+    started_at: Optional[float] = None  # time.time()
+    ended_at: Optional[float] = None
+    returncode: Optional[int] = None
+    error: str = ""
+    warm: bool = False  # Atendida por um processo pré-aquecido do pool
+    log_path: Optional[Path] = None
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def running(self) -> bool:
+        return self.status in ("starting", "running")
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Segundos desde o início (até o fim, se já terminou)."""
+        if self.started_at is None:
+            return None
+        return (self.ended_at or time.time()) - self.started_at
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Espera o processo terminar; False se o timeout expirou."""
+        return self._done.wait(timeout)
+
+
+# ==================== BACKENDS ====================
+
+class TerminalBackend:
+    """Decide como um argv é aberto (janela própria, terminal, sem terminal)."""
+
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def prepare(self, argv: List[str], title: str) -> Tuple[Union[str, List[str]], Dict]:
+        """
+        Returns:
+            (argv final, ou a linha de comando já montada no Windows; kwargs
+            extras para ``subprocess.Popen``)
+        """
+        raise NotImplementedError
+
+
+# Caracteres que o cmd interpreta mesmo dentro de aspas (%, ^) ou fora delas
+_CMD_META = re.compile(r'([()\][%!^"`<>&|;, *?])')
+
+
+def windows_quote(arg: str) -> str:
+    """Argumento sempre entre aspas, pelas regras do CRT (``CommandLineToArgvW``)."""
+    arg = re.sub(r'(\\*)"', r'\1\1\\"', arg)
+    arg = re.sub(r'(\\*)$', r'\1\1', arg)
+    return f'"{arg}"'
+
+
+def cmd_escape(texto: str, vezes: int = 1) -> str:
+    """
+    Prefixa com ``^`` cada metacaractere do cmd, ``vezes`` vezes.
+
+    As próprias aspas viram ``^"``, então o cmd não vê trecho entre aspas e
+    todo ``&``, ``|``, ``<``, ``>`` e ``%`` fica escapado (``^%PATH^%`` não é
+    expandido: a variável ``PATH^`` não existe). Um ``.cmd`` repassa ``%*``
+    por mais uma análise do cmd, daí ``vezes=2`` para os argumentos.
+    """
+    for _ in range(vezes):
+        texto = _CMD_META.sub(r"^\1", texto)
+    return texto
+
+
+class WindowsConsoleBackend(TerminalBackend):
+    """Nova janela de console, sem ``shell=True``."""
+
+    name = "windows"
+
+    def available(self) -> bool:
+        return sys.platform == "win32"
+
+    def prepare(self, argv, title):
+        flags = {"creationflags": getattr(subprocess, "CREATE_NEW_CONSOLE", 0x10)}
+        executavel = shutil.which(argv[0]) or argv[0]
+        if Path(executavel).suffix.lower() not in (".cmd", ".bat"):
+            # claude.exe: abre direto, o texto nunca passa pelo cmd
+            return [executavel, *argv[1:]], flags
+        # claude.cmd do npm: só roda via cmd (/k mantém a janela aberta). A
+        # linha vai pronta, sem o list2cmdline, que não escapa para o cmd
+        linha = " ".join([cmd_escape(executavel), *(cmd_escape(windows_quote(a), 2) for a in argv[1:])])
+        return f'cmd /d /s /k "{linha}"', flags
+
+
+# Emuladores de terminal conhecidos → argumentos antes do argv ({title} é substituído)
+LINUX_TERMINALS = {
+    "gnome-terminal": ["--wait", "--title", "{title}", "--"],
+    "konsole": ["-p", "tabtitle={title}", "-e"],
+    "kitty": ["--title", "{title}"],
+    "alacritty": ["--title", "{title}", "-e"],
+    "xfce4-terminal": ["--disable-server", "--title", "{title}", "-x"],
+    "x-terminal-emulator": ["-e"],
+    "xterm": ["-T", "{title}", "-e"],
+}
+
+
+class LinuxTerminalBackend(TerminalBackend):
+    """Abre o argv em um emulador de terminal (o primeiro disponível, ou o escolhido)."""
+
+    name = "linux"
+
+    def __init__(self, terminal: Optional[str] = None):
+        """
+        Args:
+            terminal: Nome de um emulador de ``LINUX_TERMINALS`` (None = detecta)
+        """
+        self.terminal = terminal or next((t for t in LINUX_TERMINALS if shutil.which(t)), None)
+
+    def available(self) -> bool:
+        return self.terminal is not None and bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+    def prepare(self, argv, title):
+        if self.terminal is None:
+            raise FileNotFoundError("Nenhum emulador de terminal encontrado")
+        prefixo = [a.replace("{title}", title) for a in LINUX_TERMINALS.get(self.terminal, ["-e"])]
+        return [self.terminal, *prefixo, *argv], {"start_new_session": True}
+
+
+class HeadlessBackend(TerminalBackend):
+    """Sem terminal: stdin fechado e stdout/stderr em arquivo de log (ou descartados)."""
+
+    name = "headless"
+
+    def __init__(self, log_dir: Optional[Path] = None):
+        self.log_dir = Path(log_dir) if log_dir else None
+
+    def prepare(self, argv, title):
+        saida = subprocess.DEVNULL
+        if self.log_dir:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            nome = "".join(c if c.isalnum() or c in "-_" else "_" for c in title)[:60] or "session"
+            saida = open(self.log_dir / f"{time.strftime('%Y%m%d_%H%M%S')}_{nome}.log", "ab")
+        return list(argv), {"stdin": subprocess.DEVNULL, "stdout": saida, "stderr": subprocess.STDOUT}
+
+
+BACKENDS = {
+    "windows": WindowsConsoleBackend,
+    "linux": LinuxTerminalBackend,
+    "headless": HeadlessBackend,
+}
+
+
+def default_backend(nome: Optional[str] = None) -> TerminalBackend:
+    """
+    Escolhe o backend: ``nome`` ou ``CC_TERMINAL`` (``windows``, ``linux``,
+    ``headless`` ou o nome de um emulador, ex. ``kitty``); sem escolha,
+    o da plataforma, caindo para headless quando não há terminal gráfico.
+    """
+    nome = nome or os.environ.get("CC_TERMINAL", "")
+    if nome in BACKENDS:
+        return BACKENDS[nome]()
+    if nome in LINUX_TERMINALS:
+        return LinuxTerminalBackend(nome)
+    for backend in (WindowsConsoleBackend(), LinuxTerminalBackend()):
+        if backend.available():
+            return backend
+    return HeadlessBackend()
+
+
+# ==================== LAUNCHER ====================
+
+class ProcessLauncher:
+    """Lança processos em background e acompanha as sessões."""
+
+    def __init__(
+        self,
+        backend: Optional[TerminalBackend] = None,
+        max_concurrent: int = 4,
+        on_exit: Optional[Callable[[Session], None]] = None,
+        history: int = 50,
+        pool: Optional["WarmProcessPool"] = None,
+    ):
+        """
+        Args:
+            backend: Onde os processos abrem (None = ``default_backend()``)
+            max_concurrent: Sessões ativas ao mesmo tempo (0 = sem limite)
+            on_exit: Chamado na thread da sessão quando o processo termina
+                (ou falha ao iniciar)
+            history: Sessões encerradas mantidas para consulta
+            pool: Processos pré-aquecidos usados por ``launch_warm``
+        """
+        self.backend = backend or default_backend()
+        self.max_concurrent = max_concurrent
+        self.on_exit = on_exit
+        self.history = history
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._sessions: Dict[int, Session] = {}
+        self._procs: Dict[int, subprocess.Popen] = {}
+
+    def launch(
+        self,
+        argv: List[str],
+        title: str = "",
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> Optional[Session]:
+        """
+        Agenda o processo e retorna na hora, sem esperar o ``Popen``.
+
+        Returns:
+            A sessão criada, ou None se o limite de sessões ativas foi atingido
+        """
+        argv = [str(a) for a in argv]
+        session = self._nova_sessao(argv, title or Path(argv[0]).name, self.backend.name)
+        if session is not None:
+            threading.Thread(
+                target=self._run, args=(session, cwd, env), name=f"session-{session.id}", daemon=True
+            ).start()
+        return session
+
+    def launch_warm(self, prompt: str, title: str = "", cwd: Optional[str] = None) -> Optional[Session]:
+        """
+        Entrega o prompt a um processo pré-aquecido do pool (ou a um novo,
+        iniciado a frio, se nenhum estiver pronto). Retorna na hora.
+
+        Returns:
+            A sessão criada, ou None se o limite de sessões ativas foi atingido
+        """
+        if self.pool is None:
+            raise RuntimeError("launch_warm requer um pool")
+        session = self._nova_sessao(list(self.pool.argv), title or "claude", "pool")
+        if session is not None:
+            threading.Thread(
+                target=self._run_warm, args=(session, prompt, cwd), name=f"session-{session.id}", daemon=True
+            ).start()
+        return session
+
+    def _nova_sessao(self, argv: List[str], title: str, backend: str) -> Optional[Session]:
+        with self._lock:
+            if self.max_concurrent and len(self.running()) >= self.max_concurrent:
+                return None
+            session = Session(next(self._ids), argv, title, backend)
+            self._sessions[session.id] = session
+        return session
+
+    def _falhou(self, session: Session, e: Exception) -> None:
+        session.status = "failed"
+        if isinstance(e, FileNotFoundError):
+            session.error = f"executável não encontrado: {session.argv[0]}"
+        else:
+            session.error = str(e)
+        session.ended_at = time.time()
+        self._finalizar(session)
+
+    def _run(self, session: Session, cwd: Optional[str], env: Optional[Dict[str, str]]) -> None:
+        saida = None
+        try:
+            argv, kwargs = self.backend.prepare(session.argv, session.title)
+            saida = kwargs.get("stdout") if hasattr(kwargs.get("stdout"), "close") else None
+            proc = subprocess.Popen(
+                argv, cwd=cwd, env={**os.environ, **env} if env else None, **kwargs
+            )
+        except (OSError, ValueError) as e:
+            self._falhou(session, e)
+            return
+        finally:
+            if saida is not None:
+                saida.close()  # O processo filho já herdou o descritor
+
+        self._acompanhar(session, proc)
+
+    def _run_warm(self, session: Session, prompt: str, cwd: Optional[str]) -> None:
+        item = self.pool.take(cwd)
+        session.warm = item is not None
+        try:
+            proc, session.log_path = item or self.pool.spawn(cwd or self.pool.cwd)
+        except OSError as e:
+            self._falhou(session, e)
+            return
+        try:
+            proc.stdin.write(prompt.encode("utf-8"))
+            proc.stdin.close()  # EOF: o claude -p começa a responder
+        except OSError as e:
+            proc.kill()
+            proc.wait()
+            self._falhou(session, e)
+            return
+        self._acompanhar(session, proc)
+
+    def _acompanhar(self, session: Session, proc: subprocess.Popen) -> None:
+        """Registra o processo na sessão e espera ele terminar."""
+        with self._lock:
+            self._procs[session.id] = proc
+            session.pid, session.started_at, session.status = proc.pid, time.time(), "running"
+
+        session.returncode = proc.wait()
+        session.ended_at = time.time()
+        session.status = "exited"
+        with self._lock:
+            self._procs.pop(session.id, None)
+        self._finalizar(session)
+
+    def _finalizar(self, session: Session) -> None:
+        session._done.set()
+        with self._lock:
+            encerradas = [s for s in self._sessions.values() if not s.running]
+            for antiga in encerradas[:max(0, len(encerradas) - self.history)]:
+                del self._sessions[antiga.id]
+        if self.on_exit:
+            try:
+                self.on_exit(session)
+            except Exception as e:
+                print(f"Aviso: callback de fim de sessão falhou: {e}")
+
+    def sessions(self) -> List[Session]:
+        """Sessões ativas e as últimas encerradas, da mais antiga para a mais recente."""
+        with self._lock:
+            return list(self._sessions.values())
+
+    def running(self) -> List[Session]:
+        return [s for s in list(self._sessions.values()) if s.running]
+
+    def terminate(self, session: Session) -> bool:
+        """Encerra o processo da sessão; False se ele já não está rodando."""
+        with self._lock:
+            proc = self._procs.get(session.id)
+        if proc is None:
+            return False
+        proc.terminate()
+        return True
+
+    def shutdown(self, timeout: float = 0.0) -> None:
+        """Espera as sessões ativas terminarem por até ``timeout`` segundos (não as encerra)."""
+        limite = time.monotonic() + timeout
+        for session in self.running():
+            session.wait(max(0.0, limite - time.monotonic()))
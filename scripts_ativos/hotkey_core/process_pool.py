@@ -0,0 +1,196 @@
+"""
+Pool de processos ``claude`` pré-aquecidos.
+
+A partida do CLI (Node carregando módulos, config, autenticação) é o grosso
+da latência entre a hotkey e a resposta. O pool mantém ``size`` processos já
+iniciados, no diretório de trabalho certo, em modo não interativo
+(``claude -p``), parados esperando o prompt no stdin. Entregar um comando é
+só escrever o prompt e fechar o stdin.
+
+- Uma thread repõe os processos em segundo plano depois de cada retirada
+- Processos ociosos há mais de ``idle_ttl`` segundos são encerrados e o pool
+  só volta a aquecer no próximo uso (não fica gastando memória à toa)
+- Um processo que morreu sozinho enquanto esperava é descartado
+
+Como a sessão pré-aquecida não tem terminal (stdin é o pipe do prompt), a
+saída vai para um arquivo de log por sessão; o pool é opcional e desligado
+por padrão nos scripts.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class WarmProcessPool:
+    """Mantém processos pré-iniciados esperando o prompt no stdin."""
+
+    def __init__(
+        self,
+        argv: List[str],
+        size: int = 1,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        idle_ttl: float = 600.0,
+        log_dir: Optional[Path] = None,
+    ):
+        """
+        Args:
+            argv: Linha de comando que espera o prompt no stdin (ex.
+                ``claude_argv("-p")``)
+            size: Processos ociosos mantidos
+            cwd: Diretório de trabalho dos processos
+            env: Variáveis extras de ambiente
+            idle_ttl: Segundos sem uso até encerrar os ociosos
+            log_dir: Onde gravar a saída de cada sessão (None = descarta)
+        """
+        self.argv = [str(a) for a in argv]
+        self.size = size
+        self.cwd = cwd
+        self.env = env
+        self.idle_ttl = idle_ttl
+        self.log_dir = Path(log_dir) if log_dir else None
+        self.hits = 0  # Retiradas atendidas por um processo aquecido
+        self.misses = 0  # Retiradas sem processo pronto (o chamador parte a frio)
+        self.evicted = 0
+        self._cond = threading.Condition()
+        # (processo, arquivo de log, momento em que ficou pronto)
+        self._ociosos: Deque[Tuple[subprocess.Popen, Optional[Path], float]] = deque()
+        self._ultimo_uso = time.monotonic()
+        self._fechado = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia a thread que aquece e repõe os processos."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="claude-pool", daemon=True)
+            self._thread.start()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._ociosos)
+
+    def set_cwd(self, cwd: Optional[str]) -> None:
+        """Troca o diretório de trabalho; os ociosos no diretório antigo são encerrados."""
+        with self._cond:
+            if cwd == self.cwd:
+                return
+            self.cwd = cwd
+            antigos = list(self._ociosos)
+            self._ociosos.clear()
+            self._cond.notify()
+        for proc, _, _ in antigos:
+            self._encerrar(proc)
+
+    def take(self, cwd: Optional[str] = None) -> Optional[Tuple[subprocess.Popen, Optional[Path]]]:
+        """
+        Retira um processo pronto e pede a reposição.
+
+        Args:
+            cwd: Diretório desejado (None = qualquer); se for outro, não há
+                processo pronto
+
+        Returns:
+            (processo com stdin aberto, arquivo de log), ou None se não há
+            processo aquecido (o chamador deve lançar a frio)
+        """
+        with self._cond:
+            self._ultimo_uso = time.monotonic()
+            self._cond.notify()  # Reaquece mesmo se não houver nada pronto agora
+            if cwd is None or cwd == self.cwd:
+                while self._ociosos:
+                    proc, log, _ = self._ociosos.popleft()
+                    if proc.poll() is None:
+                        self.hits += 1
+                        return proc, log
+            self.misses += 1
+            return None
+
+    def close(self) -> None:
+        """Para a reposição e encerra os processos ociosos."""
+        with self._cond:
+            self._fechado = True
+            ociosos = list(self._ociosos)
+            self._ociosos.clear()
+            self._cond.notify()
+        for proc, _, _ in ociosos:
+            self._encerrar(proc)
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _encerrar(self, proc: subprocess.Popen) -> None:
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        proc.terminate()
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def spawn(self, cwd: Optional[str] = None) -> Tuple[subprocess.Popen, Optional[Path]]:
+        """Inicia um processo agora, fora do pool (partida a frio quando ``take`` falha)."""
+        saida, log = subprocess.DEVNULL, None
+        if self.log_dir:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            log = self.log_dir / f"{time.strftime('%Y%m%d_%H%M%S')}_pool_{time.monotonic_ns()}.log"
+            saida = open(log, "ab")
+        try:
+            proc = subprocess.Popen(
+                self.argv,
+                cwd=cwd,
+                env={**os.environ, **self.env} if self.env else None,
+                stdin=subprocess.PIPE,
+                stdout=saida,
+                stderr=subprocess.STDOUT,
+            )
+        finally:
+            if log:
+                saida.close()  # O processo filho já herdou o descritor
+        return proc, log
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._fechado:
+                    return
+                agora = time.monotonic()
+                ativo = agora - self._ultimo_uso < self.idle_ttl
+                # Descarta os que morreram sozinhos; encerra tudo se ficou ocioso demais
+                vencidos = [item for item in self._ociosos if not ativo or item[0].poll() is not None]
+                for item in vencidos:
+                    self._ociosos.remove(item)
+                self.evicted += sum(1 for proc, _, _ in vencidos if proc.poll() is None)
+                faltam = self.size - len(self._ociosos) if ativo else 0
+                cwd = self.cwd
+                if faltam <= 0 and not vencidos:
+                    # Acorda numa retirada, no fechamento ou quando o TTL vencer
+                    espera = self._ultimo_uso + self.idle_ttl - agora if ativo else None
+                    self._cond.wait(espera if espera is None else min(espera, 5.0))
+                    continue
+
+            for proc, _, _ in vencidos:
+                if proc.poll() is None:
+                    self._encerrar(proc)
+            if faltam <= 0:
+                continue
+            try:
+                proc, log = self.spawn(cwd)
+            except OSError as e:
+                print(f"Aviso: não foi possível pré-aquecer o claude: {e}")
+                with self._cond:
+                    self._cond.wait(30)  # Tenta de novo mais tarde (ou na próxima retirada)
+                continue
+            with self._cond:
+                if self._fechado or cwd != self.cwd:
+                    descartar = True
+                else:
+                    self._ociosos.append((proc, log, time.monotonic()))
+                    descartar = False
+            if descartar:
+                self._encerrar(proc)
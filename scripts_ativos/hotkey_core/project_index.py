@@ -0,0 +1,260 @@
+"""
+Índice SQLite dos metadados de projetos.
+
+Substitui a varredura de ``PROJETOS_DIR`` + ``json.loads`` de cada arquivo em
+``PROJECTS_METADATA_DIR`` (custo linear no número de projetos a cada chamada)
+por um único banco SQLite em modo WAL:
+
+    projects(nome, criado_em, atualizado_em, arquivos, acoes_count)
+    actions(id, projeto, acao, timestamp, detalhes)
+
+Listagem, "última atualização" e contagem de ações são consultas indexadas;
+registrar uma ação é um INSERT + UPDATE na mesma transação. Os JSON antigos
+(snapshot + journal) são importados uma única vez por ``migrate_from_json``;
+``sync_folders`` registra, a cada inicialização, pastas que o índice não conhece.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .project_store import MetadataJournal
+
+log = logging.getLogger("project_index")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    nome          TEXT PRIMARY KEY,
+    criado_em     TEXT NOT NULL,
+    atualizado_em TEXT NOT NULL,
+    arquivos      TEXT NOT NULL DEFAULT '[]',
+    acoes_count   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_projects_atualizado ON projects(atualizado_em);
+
+CREATE TABLE IF NOT EXISTS actions (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    projeto   TEXT NOT NULL REFERENCES projects(nome) ON DELETE CASCADE,
+    acao      TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    detalhes  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_actions_projeto ON actions(projeto, timestamp);
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+
+class ProjectIndex:
+    """Acesso thread-safe ao índice SQLite de projetos."""
+
+    def __init__(self, db_path: Path):
+        """
+        Args:
+            db_path: Caminho do arquivo SQLite (criado se não existir)
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        # Uma conexão compartilhada entre as threads do pipeline, protegida por lock
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---------- escrita ----------
+
+    def create_project(self, nome: str, criado_em: str, arquivos: List[str]) -> bool:
+        """
+        Registra um projeto novo.
+
+        Returns:
+            False se o projeto já existia
+        """
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO projects (nome, criado_em, atualizado_em, arquivos) "
+                "VALUES (?, ?, ?, ?)",
+                (nome, criado_em, criado_em, json.dumps(arquivos, ensure_ascii=False)),
+            )
+            return cur.rowcount == 1
+
+    def record_action(self, nome: str, acao: str, timestamp: str, detalhes: str = "") -> bool:
+        """
+        Registra uma ação no histórico e atualiza a data/contagem do projeto.
+
+        Returns:
+            False se o projeto não está no índice
+        """
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE projects SET atualizado_em = ?, acoes_count = acoes_count + 1 WHERE nome = ?",
+                (timestamp, nome),
+            )
+            if cur.rowcount == 0:
+                return False
+            self._conn.execute(
+                "INSERT INTO actions (projeto, acao, timestamp, detalhes) VALUES (?, ?, ?, ?)",
+                (nome, acao, timestamp, detalhes),
+            )
+            return True
+
+    def rename_project(self, antigo: str, novo: str, arquivos: List[str]) -> bool:
+        """
+        Renomeia um projeto, preservando o histórico de ações.
+
+        Returns:
+            False se ``antigo`` não existe ou ``novo`` já existe
+        """
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO projects (nome, criado_em, atualizado_em, arquivos, acoes_count) "
+                "SELECT ?, criado_em, atualizado_em, ?, acoes_count FROM projects WHERE nome = ?",
+                (novo, json.dumps(arquivos, ensure_ascii=False), antigo),
+            )
+            if cur.rowcount == 0:
+                return False
+            self._conn.execute("UPDATE actions SET projeto = ? WHERE projeto = ?", (novo, antigo))
+            self._conn.execute("DELETE FROM projects WHERE nome = ?", (antigo,))
+            return True
+
+    # ---------- leitura ----------
+
+    def exists(self, nome: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM projects WHERE nome = ?", (nome,)).fetchone()
+        return row is not None
+
+    def list_projects(self) -> List[str]:
+        """Nomes de todos os projetos, em ordem alfabética."""
+        with self._lock:
+            rows = self._conn.execute("SELECT nome FROM projects ORDER BY nome").fetchall()
+        return [row["nome"] for row in rows]
+
+    def summaries(self, order_by_recent: bool = False) -> List[Dict]:
+        """Resumo (nome, criado_em, atualizado_em, acoes_count) de todos os projetos."""
+        ordem = "atualizado_em DESC" if order_by_recent else "nome"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT nome, criado_em, atualizado_em, acoes_count FROM projects ORDER BY {ordem}"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, nome: str) -> Optional[Dict]:
+        """Metadados de um projeto, ou None se não existe."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM projects WHERE nome = ?", (nome,)).fetchone()
+        if row is None:
+            return None
+        projeto = dict(row)
+        projeto["arquivos"] = json.loads(projeto["arquivos"])
+        return projeto
+
+    def history(self, nome: str, limit: int = 20) -> List[Dict]:
+        """Últimas ações registradas de um projeto (mais recentes primeiro)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT acao, timestamp, detalhes FROM actions WHERE projeto = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (nome, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # ---------- migração ----------
+
+    def sync_folders(self, projetos_dir: Path) -> int:
+        """
+        Registra as pastas de projeto que o índice ainda não conhece.
+
+        Roda a cada inicialização: pastas criadas à mão (ou por outra máquina,
+        via sincronização) aparecem no índice com a data de modificação da pasta.
+
+        Returns:
+            Quantidade de projetos registrados
+        """
+        if not Path(projetos_dir).exists():
+            return 0
+        conhecidos = set(self.list_projects())
+        novos = []
+        for pasta in Path(projetos_dir).iterdir():
+            if not pasta.is_dir() or pasta.name in conhecidos:
+                continue
+            modificado = datetime.fromtimestamp(pasta.stat().st_mtime).isoformat()
+            arquivo = pasta / f"{pasta.name}.md"
+            arquivos = [str(arquivo)] if arquivo.exists() else []
+            novos.append((pasta.name, modificado, modificado, json.dumps(arquivos, ensure_ascii=False)))
+        if not novos:
+            return 0
+        with self._lock, self._conn:
+            cur = self._conn.executemany(
+                "INSERT OR IGNORE INTO projects (nome, criado_em, atualizado_em, arquivos) "
+                "VALUES (?, ?, ?, ?)",
+                novos,
+            )
+            return cur.rowcount
+
+    def migrate_from_json(self, metadata_dir: Path) -> int:
+        """
+        Importa os metadados JSON (snapshot + journal) uma única vez.
+
+        Pastas sem JSON não entram aqui: ficam com ``sync_folders``, que roda
+        a cada inicialização. O mesmo vale para JSON corrompido, que é
+        registrado no log e pulado sem interromper a migração.
+
+        Args:
+            metadata_dir: Diretório com os ``<projeto>.json``
+
+        Returns:
+            Quantidade de projetos importados (0 se a migração já foi feita)
+        """
+        with self._lock:
+            feita = self._conn.execute(
+                "SELECT valor FROM meta WHERE chave = 'migrated_json'"
+            ).fetchone()
+        if feita:
+            return 0
+
+        importados = 0
+        # Uma única transação para toda a importação
+        with self._lock, self._conn:
+            for metadata_file in sorted(Path(metadata_dir).glob("*.json")):
+                try:
+                    metadata = MetadataJournal(metadata_file).load()
+                    if metadata is not None and not isinstance(metadata, dict):
+                        raise ValueError(f"esperado um objeto, veio {type(metadata).__name__}")
+                except (OSError, ValueError) as e:
+                    log.warning("Metadados ilegíveis em %s, projeto não migrado: %s", metadata_file, e)
+                    continue
+                if not metadata:
+                    continue
+                nome = metadata.get("nome", metadata_file.stem)
+                acoes = metadata.get("acoes_historico", [])
+                criado_em = metadata.get("criado_em", "")
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO projects "
+                    "(nome, criado_em, atualizado_em, arquivos, acoes_count) VALUES (?, ?, ?, ?, ?)",
+                    (nome, criado_em, metadata.get("atualizado_em", criado_em),
+                     json.dumps(metadata.get("arquivos", []), ensure_ascii=False), len(acoes)),
+                )
+                if cur.rowcount == 0:
+                    continue  # Já indexado: não duplica o histórico
+                self._conn.executemany(
+                    "INSERT INTO actions (projeto, acao, timestamp, detalhes) VALUES (?, ?, ?, ?)",
+                    [(nome, a.get("acao", ""), a.get("timestamp", ""), a.get("detalhes", ""))
+                     for a in acoes],
+                )
+                importados += 1
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('migrated_json', '1')")
+        return importados
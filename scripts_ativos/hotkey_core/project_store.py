@@ -0,0 +1,87 @@
+"""
+Escrita segura de arquivos de projeto e leitura dos metadados antigos.
+
+Em vez de ler e regravar o arquivo inteiro a cada nota (custo O(tamanho) e
+risco de truncar o arquivo se o processo cair no meio da escrita):
+
+- Notas (``<projeto>.md``) são acrescentadas com ``open('a')`` + ``fsync``
+- JSON é gravado de forma atômica (arquivo temporário + ``os.replace``)
+
+Os metadados de projeto hoje vivem no índice SQLite (``project_index``).
+``MetadataJournal`` só lê o formato antigo, snapshot ``<projeto>.json`` +
+journal ``<projeto>.journal.jsonl``, para a migração; uma linha incompleta no
+fim do journal (queda durante a escrita) é ignorada.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+# Serializa as escritas entre threads
+_lock = threading.RLock()
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def append_text(path: Path, texto: str) -> None:
+    """Acrescenta texto ao fim do arquivo e força a gravação em disco."""
+    with _lock, open(path, "a", encoding="utf-8") as f:
+        f.write(texto)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def write_json_atomic(path: Path, data: dict, indent: Optional[int] = 2) -> None:
+    """
+    Grava JSON em arquivo temporário e substitui o original atomicamente.
+
+    ``indent=None`` grava compacto (bem mais rápido para arquivos grandes).
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    with _lock:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=indent, ensure_ascii=False))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+
+class MetadataJournal:
+    """Leitura dos metadados antigos de um projeto (snapshot JSON + journal)."""
+
+    def __init__(self, metadata_file: Path):
+        """
+        Args:
+            metadata_file: Caminho do snapshot ``<projeto>.json``
+        """
+        self.metadata_file = Path(metadata_file)
+        self.journal_file = self.metadata_file.with_name(
+            self.metadata_file.stem + JOURNAL_SUFFIX
+        )
+
+    def _replay(self, metadata: dict) -> int:
+        """Aplica as entradas do journal sobre o snapshot; retorna quantas aplicou."""
+        if not self.journal_file.exists():
+            return 0
+        aplicadas = 0
+        with open(self.journal_file, encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue  # Linha truncada por queda durante a escrita
+                metadata["atualizado_em"] = entrada["atualizado_em"]
+                metadata.setdefault("acoes_historico", []).append(entrada["acao"])
+                aplicadas += 1
+        return aplicadas
+
+    def load(self) -> Optional[dict]:
+        """Retorna os metadados atuais (snapshot + journal), ou None se não existem."""
+        with _lock:
+            if not self.metadata_file.exists():
+                return None
+            metadata = json.loads(self.metadata_file.read_text(encoding="utf-8"))
+            self._replay(metadata)
+            return metadata
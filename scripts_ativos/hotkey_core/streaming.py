@@ -0,0 +1,204 @@
+"""
+Transcrição em streaming por janelas sobrepostas.
+
+Enquanto a tecla de push-to-talk está pressionada, o áudio gravado no ring
+buffer é dividido em janelas de tamanho fixo com sobreposição e cada janela é
+transcrita por um worker em background. Ao soltar a tecla resta apenas decodificar a última
+janela, e os textos parciais são costurados removendo as palavras repetidas
+na região de sobreposição. Uma fala descartada é interrompida com ``cancel()``,
+que não espera o worker.
+"""
+
+import threading
+import unicodedata
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from .audio_capture import AudioRingBuffer
+from .vad import trim_silence
+
+
+def _normalizar_palavra(palavra: str) -> str:
+    """Normaliza palavra para comparação (minúsculas, sem acento e pontuação)."""
+    sem_acento = unicodedata.normalize("NFKD", palavra.lower())
+    return "".join(c for c in sem_acento if c.isalnum())
+
+
+def stitch_segments(anterior: List[str], novo: List[str], max_overlap: int = 12) -> List[str]:
+    """
+    Junta duas listas de palavras removendo a repetição causada pela sobreposição.
+
+    Procura o maior sufixo de ``anterior`` que coincide com um prefixo de
+    ``novo`` (comparação normalizada) e descarta esse prefixo de ``novo``.
+
+    Args:
+        anterior: Palavras já costuradas
+        novo: Palavras da nova janela
+        max_overlap: Número máximo de palavras consideradas na sobreposição
+
+    Returns:
+        Lista de palavras resultante
+    """
+    if not anterior:
+        return list(novo)
+
+    cauda = [_normalizar_palavra(p) for p in anterior[-max_overlap:]]
+    cabeca = [_normalizar_palavra(p) for p in novo[:max_overlap]]
+
+    for tamanho in range(min(len(cauda), len(cabeca)), 0, -1):
+        if cauda[-tamanho:] == cabeca[:tamanho]:
+            return list(anterior) + list(novo[tamanho:])
+
+    return list(anterior) + list(novo)
+
+
+class StreamingTranscriber:
+    """Transcreve áudio em janelas sobrepostas enquanto a gravação continua."""
+
+    def __init__(
+        self,
+        transcribe_fn: Callable[..., dict],
+        sample_rate: int = 16000,
+        window_seconds: float = 5.0,
+        overlap_seconds: float = 1.0,
+        language: str = "pt",
+        ring: Optional[AudioRingBuffer] = None,
+        vad: bool = False,
+    ):
+        """
+        Args:
+            transcribe_fn: Função de transcrição (ex.: ``model.transcribe``)
+            sample_rate: Taxa de amostragem do áudio
+            window_seconds: Duração de cada janela decodificada
+            overlap_seconds: Sobreposição entre janelas consecutivas
+            language: Idioma passado ao Whisper
+            ring: Ring buffer compartilhado (é zerado aqui); se omitido,
+                um buffer de 120 s é alocado
+            vad: Remove silêncio de cada janela e pula janelas sem fala
+        """
+        if overlap_seconds >= window_seconds:
+            raise ValueError("overlap_seconds deve ser menor que window_seconds")
+
+        self.transcribe_fn = transcribe_fn
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.overlap = int(overlap_seconds * sample_rate)
+        self.language = language
+        self.vad = vad
+        self.vad_removed_seconds = 0.0  # Inclui silêncio contado em duas janelas sobrepostas
+
+        self.ring = ring if ring is not None else AudioRingBuffer(120, sample_rate)
+        self.ring.reset()
+        if self.ring.capacity <= self.window:
+            raise ValueError("O ring buffer deve ser maior que uma janela")
+
+        self._novo = threading.Event()
+        self._fim = False
+        self._cancelado = False
+        self._estado = threading.Lock()  # Ordena cancel() e o encerramento do worker
+        self._ao_parar: Optional[Callable[[], None]] = None
+        self._palavras: List[str] = []
+        self._janelas = 0
+        self._inicio = 0  # Posição absoluta onde começa a próxima janela
+        self._resultado: Optional[str] = None
+        self._erro: Optional[BaseException] = None
+        self._pronto = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def feed(self, bloco: np.ndarray) -> None:
+        """Grava um bloco de áudio mono no ring buffer (chamado pelo callback do stream)."""
+        self.ring.write(bloco)
+        if self.ring.total_written - self._inicio >= self.window:
+            self._novo.set()
+
+    def callback(self, indata, frames, time, status) -> None:
+        """Callback compatível com ``sounddevice.InputStream`` (canal 0)."""
+        self.feed(indata[:, 0])
+
+    def finish(self, timeout: Optional[float] = None) -> str:
+        """
+        Sinaliza o fim da gravação e aguarda a decodificação da última janela.
+
+        Returns:
+            Texto completo costurado
+        """
+        self._fim = True
+        self._novo.set()
+        self._pronto.wait(timeout)
+        if self._erro is not None:
+            raise self._erro
+        return self._resultado or ""
+
+    def cancel(self, on_done: Optional[Callable[[], None]] = None) -> None:
+        """
+        Descarta a fala sem esperar: as janelas pendentes e a cauda não são decodificadas.
+
+        Retorna na hora; uma janela que já está no modelo termina e é ignorada.
+
+        Args:
+            on_done: Chamada quando o worker para de ler o ring buffer (na
+                thread do worker, ou aqui mesmo se ele já parou); use para
+                devolver o buffer ao pool
+        """
+        with self._estado:
+            self._cancelado = True
+            parado = self._pronto.is_set()
+            if not parado:
+                self._ao_parar = on_done
+        self._novo.set()
+        if parado and on_done is not None:
+            on_done()
+
+    def _decodificar(self, audio: np.ndarray) -> None:
+        """Transcreve uma janela e costura o resultado ao texto acumulado."""
+        self._janelas += 1
+        if self.vad:
+            recorte = trim_silence(audio, self.sample_rate)
+            self.vad_removed_seconds += recorte.removed_seconds
+            if recorte.is_silent:
+                return
+            audio = recorte.audio
+
+        kwargs = {"language": self.language}
+        if self._palavras:
+            # Contexto da janela anterior ajuda o Whisper a manter a continuidade
+            kwargs["initial_prompt"] = " ".join(self._palavras[-30:])
+        resultado = self.transcribe_fn(audio, **kwargs)
+        novas = resultado.get("text", "").split()
+        self._palavras = stitch_segments(self._palavras, novas)
+
+    def _run(self) -> None:
+        """Loop do worker: decodifica cada janela completa assim que é gravada."""
+        try:
+            while True:
+                self._novo.wait()
+                self._novo.clear()
+                fim = self._fim
+                if self._cancelado:
+                    break
+
+                # Se o worker atrasou além da capacidade do buffer, pula o trecho perdido
+                self._inicio = max(self._inicio, self.ring.total_written - self.ring.capacity)
+
+                while not self._cancelado and self.ring.total_written - self._inicio >= self.window:
+                    self._decodificar(self.ring.slice(self._inicio, self._inicio + self.window))
+                    self._inicio += self.window - self.overlap
+
+                if fim and not self._cancelado:
+                    # Se a cauda é só a sobreposição, ela já foi decodificada
+                    ja_decodificado = self.overlap if self._janelas else 0
+                    total = self.ring.total_written
+                    if total - self._inicio > ja_decodificado:
+                        self._decodificar(self.ring.slice(self._inicio, total))
+                    break
+        except BaseException as e:  # Propaga o erro para quem chamar finish()
+            self._erro = e
+        finally:
+            self._resultado = " ".join(self._palavras).strip()
+            with self._estado:
+                self._pronto.set()
+                ao_parar, self._ao_parar = self._ao_parar, None
+            if ao_parar is not None:
+                ao_parar()
@@ -0,0 +1,608 @@
+"""
+Supervisor: os scripts de hotkey como plugins de um único processo.
+
+Com o pm2 cada script é um processo Python próprio: cada um instala seu hook
+global de teclado, importa numpy/Tk/sqlite de novo, sobe sua própria thread
+de notificações e, nos scripts de voz, conecta ao servidor ou carrega seu
+próprio Whisper. O ``Supervisor`` roda os scripts como plugins de um processo
+só, com os serviços compartilhados:
+
+- ``KeyHub``: uma assinatura por tecla na fonte de eventos (um único hook do
+  ``keyboard``), repassada aos plugins. Cada plugin recebe um ``KeyScope``
+  cujas assinaturas são removidas juntas quando ele para
+- Um ``NotificationDispatcher`` (uma thread de toasts; o intervalo mínimo e
+  a fusão de mensagens valem entre todos os plugins)
+- ``SharedTranscriber``: um backend de transcrição (servidor ou modelo
+  local), criado no primeiro uso
+
+Os plugins são preguiçosos: o script só é importado quando a hotkey dele é
+pressionada pela primeira vez (ou já no início, com ``lazy=False``). Cada um
+roda em uma thread própria e é reiniciável sozinho: o script é importado de
+novo como um módulo novo, sem tocar nos outros. Um plugin que falha é
+reiniciado depois de ``restart_delay`` segundos, como o ``autorestart`` do pm2.
+
+Um script vira plugin definindo ``plugin_main(ctx)``: prepara o que precisa,
+chama ``ctx.mark_ready()`` com a hotkey armada e retorna depois que
+``ctx.stopping`` for sinalizado, liberando o que abriu.
+"""
+
+import argparse
+import importlib.util
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import metrics
+from .key_state import KeyboardEventSource
+from .notifications import NotificationDispatcher, default_sink
+from .transcriber import BACKENDS, DEFAULT_BACKEND, DEFAULT_MODEL, StubTranscriber, load_transcriber
+
+KeyCallback = Callable[[], None]
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+# nome -> (script relativo a scripts_ativos, hotkey)
+DEFAULT_PLUGINS: Dict[str, Tuple[str, str]] = {
+    "launcher": ("1_CC_Commands.py", "f8"),
+    "agent": ("4_personal_agent.py", "f12"),
+    "ptt": ("inativos/3_HoldtoTalk-Whisper.py", "f9"),
+}
+
+
+# ==================== TECLADO ====================
+
+class KeyHub:
+    """Multiplexa uma fonte de eventos: uma assinatura por tecla para todos os plugins."""
+
+    def __init__(self, source=None):
+        """
+        Args:
+            source: Fonte de eventos (padrão: ``KeyboardEventSource``)
+        """
+        self.source = source if source is not None else KeyboardEventSource()
+        self._lock = threading.Lock()
+        # tecla -> (handle na fonte, {handle local: (on_down, on_up)})
+        self._teclas: Dict[str, Tuple[Any, Dict[int, Tuple[KeyCallback, KeyCallback]]]] = {}
+        self._handles: Dict[int, str] = {}
+        self._proximo = 0
+
+    def subscribe(self, key: str, on_down: KeyCallback, on_up: KeyCallback) -> int:
+        key = key.lower()
+        with self._lock:
+            handle = self._proximo
+            self._proximo += 1
+            if key not in self._teclas:
+                base = self.source.subscribe(
+                    key, lambda: self._emit(key, True), lambda: self._emit(key, False)
+                )
+                self._teclas[key] = (base, {})
+            self._teclas[key][1][handle] = (on_down, on_up)
+            self._handles[handle] = key
+        return handle
+
+    def unsubscribe(self, handle: int) -> None:
+        base = None
+        with self._lock:
+            key = self._handles.pop(handle, None)
+            if key is None:
+                return
+            origem, assinantes = self._teclas[key]
+            assinantes.pop(handle, None)
+            if not assinantes:
+                # Último interessado na tecla: solta o hook na fonte
+                del self._teclas[key]
+                base = origem
+        if base is not None:
+            self.source.unsubscribe(base)
+
+    def is_pressed(self, key: str) -> bool:
+        return self.source.is_pressed(key)
+
+    def keys(self) -> List[str]:
+        """Teclas com ao menos uma assinatura."""
+        with self._lock:
+            return sorted(self._teclas)
+
+    def scope(self) -> "KeyScope":
+        """Visão do hub para um plugin (as assinaturas dele saem juntas em ``close``)."""
+        return KeyScope(self)
+
+    def close(self) -> None:
+        """Remove todas as assinaturas da fonte."""
+        with self._lock:
+            bases = [base for base, _ in self._teclas.values()]
+            self._teclas.clear()
+            self._handles.clear()
+        for base in bases:
+            self.source.unsubscribe(base)
+
+    def _emit(self, key: str, down: bool) -> None:
+        with self._lock:
+            _, assinantes = self._teclas.get(key, (None, {}))
+            callbacks = [(on_down if down else on_up) for on_down, on_up in assinantes.values()]
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                # Um plugin com defeito não derruba a hotkey dos outros
+                print(f"Aviso: erro no callback da tecla {key}: {e}", flush=True)
+
+
+class KeyScope:
+    """Fonte de eventos de um plugin, com a mesma interface de ``KeyboardEventSource``."""
+
+    def __init__(self, hub: KeyHub):
+        self.hub = hub
+        self._handles: List[int] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, key: str, on_down: KeyCallback, on_up: KeyCallback) -> int:
+        handle = self.hub.subscribe(key, on_down, on_up)
+        with self._lock:
+            self._handles.append(handle)
+        return handle
+
+    def unsubscribe(self, handle: int) -> None:
+        with self._lock:
+            if handle in self._handles:
+                self._handles.remove(handle)
+        self.hub.unsubscribe(handle)
+
+    def is_pressed(self, key: str) -> bool:
+        return self.hub.is_pressed(key)
+
+    def close(self) -> None:
+        """Remove todas as assinaturas feitas por este plugin."""
+        with self._lock:
+            handles, self._handles = self._handles, []
+        for handle in handles:
+            self.hub.unsubscribe(handle)
+
+
+# ==================== TRANSCRIÇÃO ====================
+
+class SharedTranscriber:
+    """
+    Backend de transcrição único, criado no primeiro uso.
+
+    Os plugins de voz transcrevem pelas suas próprias threads; como o Whisper
+    não é thread-safe, ``transcribe`` atende uma chamada por vez (o mesmo que
+    o servidor de transcrição faz).
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+            factory: Cria o backend (objeto com ``transcribe(audio, **kw)``)
+        """
+        self.factory = factory
+        self._backend: Any = None
+        self._lock = threading.Lock()  # Criação do backend
+        self._uso = threading.Lock()  # Uma transcrição por vez
+
+    @property
+    def started(self) -> bool:
+        return self._backend is not None
+
+    def get(self) -> Any:
+        """Retorna o backend, criando-o na primeira chamada."""
+        with self._lock:
+            if self._backend is None:
+                self._backend = self.factory()
+            return self._backend
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        backend = self.get()
+        with self._uso:
+            return backend.transcribe(audio, **kwargs)
+
+
+def transcription_backend(
+    backend: str = DEFAULT_BACKEND,
+    model: str = DEFAULT_MODEL,
+    model_dir: Optional[str] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    started_at: Optional[float] = None,
+):
+    """
+    Cria o backend como os scripts de voz fazem: servidor de transcrição se
+    estiver no ar, senão o modelo local carregado em background (também
+    usado se o servidor cair depois).
+
+    Args:
+        backend: Backend local (``whisper``, ``whisper-int8``, ``stub``)
+        model: Tamanho do modelo ou caminho do ``.pt``
+        model_dir: Diretório dos pesos (None = ``DEFAULT_MODEL_DIR``)
+        host: Servidor de transcrição (None = não tenta o servidor)
+        port: Porta do servidor
+        started_at: ``time.perf_counter()`` do início do processo, para os logs
+    """
+    from .model_loader import BackgroundModelLoader
+    from .transcription_server import TranscriptionClient
+
+    def local():
+        if backend == "stub":
+            return BackgroundModelLoader(StubTranscriber, started_at=started_at, name="stub")
+
+        def aquecer(modelo):
+            import numpy as np
+            modelo.transcribe(np.zeros(16000, dtype=np.float32), language="pt")
+
+        print(f"Carregando IA Whisper (modelo {model}, {backend}) em background...", flush=True)
+        return BackgroundModelLoader(lambda: load_transcriber(backend, model, model_dir), aquecer,
+                                     started_at=started_at)
+
+    if host:
+        # Se o servidor cair depois, o cliente passa a usar o modelo local
+        cliente = TranscriptionClient(host, port, fallback=local)
+        if cliente.ping():
+            print(f"Usando servidor de transcrição em {host}:{port}", flush=True)
+            return cliente
+        print("Aviso: servidor de transcrição não encontrado, carregando modelo local.", flush=True)
+    return local()
+
+
+# ==================== PLUGINS ====================
+
+@dataclass
+class PluginContext:
+    """O que o supervisor entrega a ``plugin_main``."""
+
+    name: str
+    keys: KeyScope  # Fonte de eventos para KeyWatcher/assinaturas do plugin
+    notifier: NotificationDispatcher
+    transcriber: SharedTranscriber
+    started_by_hotkey: bool = False  # Iniciado pelo primeiro pressionamento (tecla ainda valendo)
+    stopping: threading.Event = field(default_factory=threading.Event)
+    _on_ready: Optional[Callable[[], None]] = None
+    _on_stop: List[Callable[[], None]] = field(default_factory=list)
+
+    def mark_ready(self) -> None:
+        """Informa ao supervisor que a hotkey do plugin está armada."""
+        if self._on_ready:
+            self._on_ready()
+
+    def on_stop(self, callback: Callable[[], None]) -> None:
+        """
+        Registra uma função que acorda uma espera longa do plugin na parada.
+
+        Ex.: ``ctx.on_stop(watcher.cancel)``, para ``wait_release`` não segurar
+        a parada por até ``max_hold_seconds``. Se a parada já foi pedida, a
+        função é chamada na hora.
+        """
+        self._on_stop.append(callback)
+        if self.stopping.is_set():
+            callback()
+
+    def stop(self) -> None:
+        """Sinaliza ``stopping`` e chama as funções de ``on_stop``."""
+        self.stopping.set()
+        for callback in list(self._on_stop):
+            callback()
+
+
+class Plugin:
+    """Um script de ``scripts_ativos`` rodando dentro do supervisor."""
+
+    def __init__(self, name: str, script: Path, hotkey: Optional[str] = None, lazy: bool = True):
+        """
+        Args:
+            name: Nome curto (usado nos comandos ``restart <nome>``)
+            script: Arquivo do script, com ``plugin_main(ctx)``
+            hotkey: Tecla que inicia o plugin preguiçoso
+            lazy: Só importa o script no primeiro pressionamento de ``hotkey``
+        """
+        self.name = name
+        self.script = Path(script)
+        self.hotkey = hotkey
+        self.lazy = lazy and hotkey is not None
+        self.status = "idle"  # idle, armed, starting, running, stopping, stopped, failed
+        self.error: Optional[str] = None
+        self.module = None
+        self.starts = 0
+        self.failures = 0  # Falhas seguidas (zera quando o plugin fica pronto)
+        self.startup_seconds: Optional[float] = None  # Import + preparo até mark_ready
+        self.ready = threading.Event()
+        self._ctx: Optional[PluginContext] = None
+        self._thread: Optional[threading.Thread] = None
+        self._gatilho: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def load_module(self):
+        """Importa o script como um módulo novo (uma reinicialização não reaproveita estado)."""
+        self.starts += 1
+        nome = f"plugin_{self.name}_{self.starts}"
+        spec = importlib.util.spec_from_file_location(nome, self.script)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[nome] = module  # dataclasses do script resolvem o módulo por aqui
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(nome, None)
+            raise
+        if self.module is not None:
+            sys.modules.pop(self.module.__name__, None)
+        self.module = module
+        return module
+
+
+class Supervisor:
+    """Carrega, para e reinicia os plugins; dono dos serviços compartilhados."""
+
+    def __init__(
+        self,
+        plugins: List[Plugin],
+        keys: Optional[KeyHub] = None,
+        notifier: Optional[NotificationDispatcher] = None,
+        transcriber: Optional[SharedTranscriber] = None,
+        autorestart: bool = True,
+        restart_delay: float = 2.0,
+        max_failures: int = 5,
+    ):
+        """
+        Args:
+            plugins: Plugins supervisionados
+            keys: Hub de teclado (padrão: hook global do ``keyboard``)
+            notifier: Dispatcher de notificações (padrão: sink padrão)
+            transcriber: Backend de transcrição (padrão: ``transcription_backend()``)
+            autorestart: Reinicia um plugin que falhou
+            restart_delay: Segundos entre a falha e a nova tentativa
+            max_failures: Falhas seguidas até desistir do plugin
+        """
+        self.plugins: Dict[str, Plugin] = {p.name: p for p in plugins}
+        self.keys = keys if keys is not None else KeyHub()
+        self.notifier = notifier if notifier is not None else NotificationDispatcher()
+        self.transcriber = transcriber if transcriber is not None else SharedTranscriber(transcription_backend)
+        self.autorestart = autorestart
+        self.restart_delay = restart_delay
+        self.max_failures = max_failures
+        self._fechado = False
+
+    def start(self) -> None:
+        """Arma os plugins preguiçosos e inicia os demais."""
+        for plugin in self.plugins.values():
+            if plugin.lazy:
+                self._armar(plugin)
+            else:
+                self.start_plugin(plugin.name)
+
+    def _armar(self, plugin: Plugin) -> None:
+        """Assina a hotkey do plugin; o primeiro pressionamento o inicia."""
+        with plugin._lock:
+            if plugin._gatilho is not None:
+                return
+            plugin._gatilho = self.keys.subscribe(
+                plugin.hotkey, lambda: self._disparar(plugin), lambda: None
+            )
+            plugin.status = "armed"
+
+    def _disparar(self, plugin: Plugin) -> None:
+        # Roda no callback do teclado: o import do script vai para outra thread
+        threading.Thread(
+            target=self.start_plugin, args=(plugin.name, True),
+            name=f"start-{plugin.name}", daemon=True,
+        ).start()
+
+    def start_plugin(self, name: str, started_by_hotkey: bool = False) -> bool:
+        """
+        Inicia o plugin em uma thread própria (não espera ele ficar pronto).
+
+        Returns:
+            False se o plugin não existe ou o supervisor já foi encerrado
+        """
+        plugin = self.plugins.get(name)
+        if plugin is None or self._fechado:
+            return False
+        with plugin._lock:
+            if plugin.status in ("starting", "running"):
+                return True
+            if plugin._gatilho is not None:
+                self.keys.unsubscribe(plugin._gatilho)
+                plugin._gatilho = None
+            ctx = PluginContext(
+                name, self.keys.scope(), self.notifier, self.transcriber, started_by_hotkey,
+            )
+            plugin._ctx = ctx
+            plugin.status = "starting"
+            plugin.error = None
+            plugin.ready.clear()
+            plugin._thread = threading.Thread(
+                target=self._run, args=(plugin, ctx), name=f"plugin-{name}", daemon=True
+            )
+            plugin._thread.start()
+        return True
+
+    def _run(self, plugin: Plugin, ctx: PluginContext) -> None:
+        t0 = time.perf_counter()
+
+        def pronto():
+            with plugin._lock:
+                if plugin._ctx is not ctx:
+                    return
+                plugin.status = "running"
+                plugin.failures = 0
+                plugin.startup_seconds = time.perf_counter() - t0
+            plugin.ready.set()
+            print(f"✓ Plugin {plugin.name} pronto em {plugin.startup_seconds:.2f}s", flush=True)
+
+        ctx._on_ready = pronto
+        erro = None
+        try:
+            module = plugin.load_module()
+            plugin_main = getattr(module, "plugin_main", None)
+            if plugin_main is None:
+                raise AttributeError(f"{plugin.script.name} não define plugin_main(ctx)")
+            plugin_main(ctx)
+        except Exception as e:
+            erro = f"{type(e).__name__}: {e}"
+        finally:
+            ctx.keys.close()
+
+        with plugin._lock:
+            if plugin._ctx is not ctx:
+                return
+            plugin.ready.set()  # Ninguém fica esperando um plugin que já saiu
+            if erro is None:
+                plugin.status = "stopped"
+                return
+            plugin.status = "failed"
+            plugin.error = erro
+            plugin.failures += 1
+            tentar = self.autorestart and not self._fechado and plugin.failures < self.max_failures
+        print(f"✗ Plugin {plugin.name} falhou: {erro}", flush=True)
+        if tentar:
+            print(f"  Reiniciando {plugin.name} em {self.restart_delay:.0f}s...", flush=True)
+            timer = threading.Timer(self.restart_delay, self._reiniciar_se_falhou, args=(plugin, ctx))
+            timer.daemon = True
+            timer.start()
+
+    def _reiniciar_se_falhou(self, plugin: Plugin, ctx: PluginContext) -> None:
+        # Só se ninguém mexeu no plugin enquanto isso (stop/restart manual)
+        if plugin._ctx is ctx and plugin.status == "failed":
+            self.start_plugin(plugin.name)
+
+    def stop_plugin(self, name: str, timeout: float = 5.0) -> bool:
+        """
+        Sinaliza o plugin para parar (acordando as esperas registradas em
+        ``ctx.on_stop``) e espera a thread dele.
+
+        Returns:
+            False se o plugin não existe ou não parou dentro do timeout
+        """
+        plugin = self.plugins.get(name)
+        if plugin is None:
+            return False
+        with plugin._lock:
+            if plugin._gatilho is not None:
+                self.keys.unsubscribe(plugin._gatilho)
+                plugin._gatilho = None
+            ctx, thread = plugin._ctx, plugin._thread
+            if plugin.status in ("starting", "running"):
+                plugin.status = "stopping"
+        if ctx is not None:
+            ctx.stop()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+            if thread.is_alive():
+                print(f"Aviso: plugin {name} não parou em {timeout:.0f}s.", flush=True)
+                return False
+        with plugin._lock:
+            if plugin.status != "failed":
+                plugin.status = "stopped"
+        return True
+
+    def restart_plugin(self, name: str, timeout: float = 5.0) -> bool:
+        """Para e inicia de novo só este plugin (o script é reimportado)."""
+        if name not in self.plugins:
+            return False
+        self.stop_plugin(name, timeout)
+        self.plugins[name].failures = 0
+        return self.start_plugin(name)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Situação de cada plugin."""
+        return [
+            {
+                "name": p.name,
+                "hotkey": p.hotkey,
+                "status": p.status,
+                "starts": p.starts,
+                "startup_seconds": p.startup_seconds,
+                "error": p.error,
+            }
+            for p in self.plugins.values()
+        ]
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Para todos os plugins e os serviços compartilhados."""
+        self._fechado = True
+        for name in list(self.plugins):
+            self.stop_plugin(name, timeout)
+        self.keys.close()
+        self.notifier.close()
+
+
+# ==================== CLI ====================
+
+def _console(supervisor: Supervisor) -> None:
+    """Comandos no terminal: status, start/stop/restart <plugin>, quit."""
+    print("Comandos: status | start <plugin> | stop <plugin> | restart <plugin> | quit", flush=True)
+    for linha in sys.stdin:
+        partes = linha.split()
+        if not partes:
+            continue
+        comando, alvo = partes[0], (partes[1] if len(partes) > 1 else "")
+        if comando in ("quit", "sair", "exit"):
+            return
+        if comando == "status":
+            for info in supervisor.status():
+                tempo = f" ({info['startup_seconds']:.2f}s)" if info["startup_seconds"] is not None else ""
+                erro = f" - {info['error']}" if info["error"] else ""
+                print(f"  {info['name']:<10} [{(info['hotkey'] or '-').upper()}] "
+                      f"{info['status']}{tempo}{erro}", flush=True)
+            continue
+        acao = {"start": supervisor.start_plugin, "stop": supervisor.stop_plugin,
+                "restart": supervisor.restart_plugin}.get(comando)
+        if acao is None:
+            print(f"Comando desconhecido: {comando}", flush=True)
+        elif not acao(alvo):
+            print(f"Aviso: não foi possível executar '{comando} {alvo}'.", flush=True)
+    # stdin fechado (ex.: rodando pelo pm2): segue até CTRL+C
+    threading.Event().wait()
+
+
+def main(argv=None) -> None:
+    """Inicia o supervisor com os plugins escolhidos (bloqueia até CTRL+C/quit)."""
+    parser = argparse.ArgumentParser(description="Scripts de hotkey em um único processo")
+    parser.add_argument("--plugins", default=",".join(DEFAULT_PLUGINS),
+                        help=f"Plugins separados por vírgula ({', '.join(DEFAULT_PLUGINS)})")
+    parser.add_argument("--eager", action="store_true",
+                        help="Inicia todos os plugins já, sem esperar a primeira hotkey")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=list(BACKENDS),
+                        help="Backend local: whisper, whisper-int8 (quantizado) ou stub")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Modelo Whisper local (tiny, base, small...) ou .pt")
+    parser.add_argument("--model-dir", help="Diretório dos pesos (padrão: cache do Whisper)")
+    parser.add_argument("--stub", action="store_true", help="Usa modelo falso (o mesmo que --backend stub)")
+    parser.add_argument("--host", default="127.0.0.1", help="Servidor de transcrição")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--no-server", action="store_true", help="Não tenta o servidor de transcrição")
+    parser.add_argument("--notifications", default="", help="plyer, console ou none (vazio = plyer se instalado)")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics.configure(args)
+
+    started_at = time.perf_counter()
+    plugins = []
+    for nome in filter(None, (n.strip() for n in args.plugins.split(","))):
+        if nome not in DEFAULT_PLUGINS:
+            parser.error(f"plugin desconhecido: {nome}")
+        script, hotkey = DEFAULT_PLUGINS[nome]
+        plugins.append(Plugin(nome, SCRIPTS_DIR / script, hotkey, lazy=not args.eager))
+
+    backend = "stub" if args.stub else args.backend
+    host = None if args.no_server else args.host
+    supervisor = Supervisor(
+        plugins,
+        notifier=NotificationDispatcher(default_sink(args.notifications, app_name="Hotkeys")),
+        transcriber=SharedTranscriber(lambda: transcription_backend(
+            backend, args.model, args.model_dir, host, args.port, started_at,
+        )),
+    )
+    supervisor.start()
+    print(f">>> SUPERVISOR PRONTO! (hotkeys armadas em {time.perf_counter() - started_at:.2f}s)", flush=True)
+    for plugin in plugins:
+        modo = "carrega no primeiro uso" if plugin.lazy else "iniciado"
+        print(f">>> [{plugin.hotkey.upper()}] {plugin.name} ({modo})", flush=True)
+
+    try:
+        _console(supervisor)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n>>> Encerrando plugins...", flush=True)
+        supervisor.shutdown()
+        metrics.finish(args)
@@ -0,0 +1,198 @@
+"""
+Backends de transcrição intercambiáveis.
+
+Os scripts de voz, o streaming e o servidor de transcrição só dependem de
+``transcribe(audio, **kwargs) -> {"text": ...}``, a mesma assinatura do
+``whisper``. ``Transcriber`` formaliza essa interface e ``load_transcriber``
+escolhe o backend pela configuração:
+
+- ``whisper``: openai-whisper em precisão total (o comportamento de antes)
+- ``whisper-int8``: o mesmo modelo com as camadas lineares quantizadas
+  dinamicamente para int8 (``torch.ao.quantization.quantize_dynamic``). Na
+  CPU o decode é dominado pelas multiplicações de matriz dessas camadas;
+  os pesos int8 cortam a latência e a memória em troca de um pouco de
+  precisão (compare com ``benchmarks/transcriber.py``)
+- ``stub``: determinístico e sem pesos, para testes e benchmarks
+
+Os pesos vêm sempre de um arquivo local: ``model`` é um nome (``base``,
+procurado como ``<model_dir>/base.pt``) ou o caminho de um ``.pt``. Nada é
+baixado ao carregar, então os scripts funcionam offline; para buscar os pesos
+uma vez: ``python -m hotkey_core.transcriber --download base``.
+
+Configuração por variáveis de ambiente, valendo para todos os scripts:
+``HOTKEY_TRANSCRIBER`` (backend), ``HOTKEY_WHISPER_MODEL`` (tamanho) e
+``HOTKEY_WHISPER_DIR`` (diretório dos pesos; padrão o cache do Whisper).
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Type, Union
+
+SAMPLE_RATE = 16000
+
+DEFAULT_BACKEND = os.environ.get("HOTKEY_TRANSCRIBER", "whisper")
+DEFAULT_MODEL = os.environ.get("HOTKEY_WHISPER_MODEL", "base")
+# Mesmo diretório em que o whisper.load_model guarda os downloads
+DEFAULT_MODEL_DIR = Path(
+    os.environ.get("HOTKEY_WHISPER_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "whisper"
+)
+
+
+class Transcriber:
+    """Interface comum dos backends (chamada por uma thread por vez)."""
+
+    name = "base"
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        """
+        Transcreve áudio mono float32 a 16 kHz.
+
+        Args:
+            audio: Amostras (``np.ndarray``)
+            kwargs: Opções do Whisper (``language``, ``initial_prompt``...)
+
+        Returns:
+            Dicionário com ao menos ``text``
+        """
+        raise NotImplementedError
+
+
+class StubTranscriber(Transcriber):
+    """Modelo falso e determinístico, para testar sem os pesos do Whisper."""
+
+    name = "stub"
+
+    def __init__(self, model: str = "stub", model_dir: Optional[Path] = None):
+        self.model = model
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        segundos = len(audio) / SAMPLE_RATE
+        return {"text": f"stub {segundos:.2f}s", "language": kwargs.get("language")}
+
+
+def resolve_model_path(model: str, model_dir: Optional[Path] = None) -> Path:
+    """
+    Caminho local dos pesos de ``model`` (nome ou arquivo ``.pt``).
+
+    Raises:
+        FileNotFoundError: Se os pesos não estão no disco
+    """
+    caminho = Path(model)
+    if caminho.suffix != ".pt" and not caminho.is_file():
+        caminho = Path(model_dir or DEFAULT_MODEL_DIR) / f"{model}.pt"
+    if not caminho.is_file():
+        raise FileNotFoundError(
+            f"Pesos do Whisper não encontrados em {caminho} "
+            f"(baixe uma vez com: python -m hotkey_core.transcriber --download {model})"
+        )
+    return caminho
+
+
+class WhisperTranscriber(Transcriber):
+    """openai-whisper em precisão total, carregado de um arquivo local."""
+
+    name = "whisper"
+
+    def __init__(self, model: str = "base", model_dir: Optional[Path] = None, device: str = "cpu"):
+        """
+        Args:
+            model: Tamanho (``tiny``, ``base``, ``small``...) ou caminho de um ``.pt``
+            model_dir: Onde procurar ``<model>.pt`` (padrão ``DEFAULT_MODEL_DIR``)
+            device: ``cpu`` ou ``cuda``
+        """
+        self.model = model
+        self.path = resolve_model_path(model, model_dir)  # Antes do import: falha rápido sem pesos
+        self.device = device
+        import whisper  # Import pesado (torch) só quando o backend é criado
+        self._model = self._prepare(whisper.load_model(str(self.path), device=device))
+
+    def _prepare(self, modelo):
+        """Ajusta o modelo carregado (ponto de extensão das variantes)."""
+        return modelo
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        if self.device == "cpu":
+            kwargs.setdefault("fp16", False)  # Na CPU o Whisper cairia para fp32 com um aviso
+        return self._model.transcribe(audio, **kwargs)
+
+
+class QuantizedWhisperTranscriber(WhisperTranscriber):
+    """Whisper com as camadas lineares em int8 (quantização dinâmica, só CPU)."""
+
+    name = "whisper-int8"
+
+    def __init__(self, model: str = "base", model_dir: Optional[Path] = None, device: str = "cpu"):
+        if device != "cpu":
+            raise ValueError("A quantização dinâmica int8 só roda na CPU")
+        super().__init__(model, model_dir, device)
+
+    def _prepare(self, modelo):
+        import torch
+        import whisper.model
+
+        # whisper.model.Linear só converte o dtype dos pesos no forward (inútil
+        # em fp32 na CPU); como nn.Linear simples ele entra no mapeamento padrão
+        # da quantização dinâmica, que não aceita subclasses
+        for modulo in modelo.modules():
+            if isinstance(modulo, whisper.model.Linear):
+                modulo.__class__ = torch.nn.Linear
+        return torch.ao.quantization.quantize_dynamic(modelo, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+BACKENDS: Dict[str, Type[Transcriber]] = {
+    "whisper": WhisperTranscriber,
+    "whisper-int8": QuantizedWhisperTranscriber,
+    "stub": StubTranscriber,
+}
+
+
+def load_transcriber(
+    backend: str = DEFAULT_BACKEND,
+    model: str = DEFAULT_MODEL,
+    model_dir: Optional[Union[str, Path]] = None,
+) -> Transcriber:
+    """
+    Cria o backend pelo nome (``whisper``, ``whisper-int8``, ``stub``).
+
+    Raises:
+        ValueError: Backend desconhecido
+        FileNotFoundError: Pesos ausentes em ``model_dir``
+    """
+    classe = BACKENDS.get(backend)
+    if classe is None:
+        raise ValueError(f"Backend de transcrição desconhecido: {backend} (opções: {', '.join(BACKENDS)})")
+    return classe(model, Path(model_dir) if model_dir else None)
+
+
+def download_model(model: str, model_dir: Optional[Path] = None) -> Path:
+    """Baixa os pesos oficiais de ``model`` para ``model_dir`` (única etapa com rede)."""
+    import whisper
+
+    destino = Path(model_dir or DEFAULT_MODEL_DIR)
+    whisper.load_model(model, device="cpu", download_root=str(destino))
+    return resolve_model_path(model, destino)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Backends de transcrição (pesos locais)")
+    parser.add_argument("--download", metavar="MODELO", help="Baixa os pesos (tiny, base, small...)")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=list(BACKENDS))
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--model-dir", type=Path, help=f"Diretório dos pesos (padrão {DEFAULT_MODEL_DIR})")
+    args = parser.parse_args(argv)
+
+    if args.download:
+        print(f"✓ Pesos em {download_model(args.download, args.model_dir)}")
+        return
+
+    # Sem --download: confere se o backend configurado carrega offline
+    t0 = time.perf_counter()
+    transcriber = load_transcriber(args.backend, args.model, args.model_dir)
+    print(f"✓ {transcriber.name} ({args.model}) carregado em {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
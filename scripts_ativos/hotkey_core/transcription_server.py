@@ -0,0 +1,244 @@
+"""
+Servidor local de transcrição compartilhado.
+
+Um único processo mantém o modelo Whisper em memória e atende os scripts de
+hotkey via socket TCP em localhost (funciona igual no Windows e no Linux).
+As requisições são serializadas, já que o modelo não é thread-safe.
+
+Protocolo (uma requisição por conexão):
+    cliente → ``{"cmd": "transcribe", "samples": N, "kwargs": {...}}\\n``
+              seguido de N amostras float32 little-endian
+    cliente → ``{"cmd": "ping"}\\n``
+    servidor → uma linha JSON: ``{"ok": true, "text": "..."}`` ou
+               ``{"ok": false, "error": "..."}``
+
+Pedidos com mais de ``max_seconds`` de áudio são recusados antes de ler o
+PCM. Se o servidor cair, ``TranscriptionClient`` passa para o modelo local
+(``fallback``) ou levanta ``ConnectionError`` com uma mensagem clara.
+"""
+
+import argparse
+import json
+import logging
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from . import metrics
+from .event_log import log_event, setup_event_log
+from .model_loader import BackgroundModelLoader
+from .transcriber import BACKENDS, DEFAULT_BACKEND, DEFAULT_MODEL, StubTranscriber, load_transcriber
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SAMPLE_RATE = 16000
+MAX_AUDIO_SECONDS = 120  # MAX_RECORDING_SECONDS dos scripts de voz
+
+log = logging.getLogger("transcription")
+
+M_REQUESTS = metrics.counter("transcription_requests_total", "Requisições por comando e resultado")
+M_AUDIO = metrics.histogram("transcription_audio_seconds", "Duração do áudio recebido")
+M_FILA = metrics.histogram("transcription_queue_wait_seconds", "Espera pelo modelo (requisições concorrentes)")
+
+
+StubModel = StubTranscriber  # Nome antigo, usado pelos benchmarks
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Atende uma requisição: lê cabeçalho JSON + PCM e responde em JSON."""
+
+    def handle(self) -> None:
+        try:
+            cabecalho = json.loads(self.rfile.readline().decode("utf-8"))
+            cmd = cabecalho.get("cmd", "transcribe")
+
+            if cmd == "ping":
+                resposta = {"ok": True, "ready": self.server.model.ready}
+            elif cmd == "transcribe":
+                n = int(cabecalho["samples"])
+                if not 0 <= n <= self.server.max_samples:
+                    raise ValueError(f"Áudio de {n} amostras fora do limite "
+                                     f"(0 a {self.server.max_samples}, {self.server.max_seconds:g}s)")
+                dados = self.rfile.read(n * 4)
+                if len(dados) != n * 4:
+                    raise ValueError(f"Esperadas {n} amostras, recebidos {len(dados)} bytes")
+                audio = np.frombuffer(dados, dtype="<f4")
+                M_AUDIO.observe(n / SAMPLE_RATE)
+                chegada = time.perf_counter()
+                with self.server.lock:
+                    inicio = time.perf_counter()
+                    M_FILA.observe(inicio - chegada)
+                    with metrics.span("transcription_model"):
+                        resultado = self.server.model.transcribe(audio, **cabecalho.get("kwargs", {}))
+                    ms = (time.perf_counter() - inicio) * 1000
+                log_event(log, "transcribe", f"{n / SAMPLE_RATE:.1f}s de áudio em {ms:.0f}ms",
+                          audio_seconds=round(n / SAMPLE_RATE, 2), ms=round(ms, 1))
+                resposta = {
+                    "ok": True,
+                    "text": resultado.get("text", ""),
+                    "language": resultado.get("language"),
+                }
+            else:
+                resposta = {"ok": False, "error": f"Comando desconhecido: {cmd}"}
+            M_REQUESTS.inc(cmd=cmd, ok=resposta["ok"])
+        except Exception as e:
+            resposta = {"ok": False, "error": str(e)}
+            M_REQUESTS.inc(cmd="?", ok=False)
+            log_event(log, "request_failed", str(e), logging.ERROR)
+
+        self.wfile.write((json.dumps(resposta, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class TranscriptionServer(socketserver.ThreadingTCPServer):
+    """Servidor TCP que compartilha um modelo entre vários clientes."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, model: BackgroundModelLoader, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 max_seconds: float = MAX_AUDIO_SECONDS):
+        """
+        Args:
+            model: Loader do modelo (carregado em background)
+            host: Endereço de escuta (use apenas localhost)
+            port: Porta TCP (0 escolhe uma porta livre)
+            max_seconds: Maior áudio aceito por requisição
+        """
+        super().__init__((host, port), _Handler)
+        self.model = model
+        self.max_seconds = max_seconds
+        self.max_samples = int(max_seconds * SAMPLE_RATE)
+        self.lock = threading.Lock()  # Serializa o acesso ao modelo
+
+    @property
+    def address(self):
+        """(host, porta) efetivos do servidor."""
+        return self.server_address[:2]
+
+
+class TranscriptionClient:
+    """Cliente do servidor de transcrição, com a mesma interface de ``model.transcribe``."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: Optional[float] = 300,
+                 fallback: Optional[Callable[[], Any]] = None):
+        """
+        Args:
+            host: Endereço do servidor
+            port: Porta do servidor
+            timeout: Timeout de cada requisição em segundos
+            fallback: Cria o backend local (ex.: ``BackgroundModelLoader``) se
+                o servidor cair; None levanta ``ConnectionError``
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._fallback = fallback
+        self._local = None
+        self._lock = threading.Lock()
+
+    def _request(self, cabecalho: dict, payload: bytes = b"") -> dict:
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            sock.sendall((json.dumps(cabecalho) + "\n").encode("utf-8") + payload)
+            with sock.makefile("rb") as f:
+                linha = f.readline()
+        if not linha:
+            raise ConnectionError("Servidor de transcrição fechou a conexão")
+        resposta = json.loads(linha.decode("utf-8"))
+        if not resposta.get("ok"):
+            raise RuntimeError(f"Erro no servidor de transcrição: {resposta.get('error')}")
+        return resposta
+
+    def ping(self) -> bool:
+        """Retorna True se o servidor está no ar (mesmo com o modelo ainda carregando)."""
+        try:
+            self._request({"cmd": "ping"})
+            return True
+        except OSError:
+            return False
+
+    @property
+    def local(self) -> bool:
+        """True depois que o cliente passou a usar o modelo local."""
+        return self._local is not None
+
+    def _usar_local(self, erro: OSError) -> Any:
+        """Troca para o backend local (uma única vez, mesmo com várias threads)."""
+        with self._lock:
+            if self._local is None:
+                log_event(log, "fallback_local",
+                          f"Aviso: servidor de transcrição em {self.host}:{self.port} caiu ({erro}), "
+                          "carregando modelo local.", logging.WARNING)
+                self._local = self._fallback()
+            return self._local
+
+    def transcribe(self, audio, **kwargs) -> dict:
+        """
+        Envia o áudio (float32 mono 16 kHz) e retorna ``{"text": ...}``.
+
+        Raises:
+            ConnectionError: Servidor fora do ar e nenhum ``fallback`` configurado
+        """
+        if self._local is None:
+            pcm = np.ascontiguousarray(audio, dtype="<f4")
+            cabecalho = {"cmd": "transcribe", "samples": int(pcm.size), "kwargs": kwargs}
+            try:
+                return self._request(cabecalho, pcm.tobytes())
+            except OSError as e:
+                if self._fallback is None:
+                    raise ConnectionError(
+                        f"Servidor de transcrição em {self.host}:{self.port} indisponível ({e}); "
+                        "reinicie o 0_transcription_server.py"
+                    ) from e
+                self._usar_local(e)
+        return self._local.transcribe(audio, **kwargs)
+
+
+def main(argv=None) -> None:
+    """Inicia o servidor de transcrição (bloqueia até CTRL+C)."""
+    parser = argparse.ArgumentParser(description="Servidor local de transcrição Whisper")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=list(BACKENDS),
+                        help="whisper, whisper-int8 (quantizado, mais rápido na CPU) ou stub")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Modelo Whisper (tiny, base, small...) ou .pt")
+    parser.add_argument("--model-dir", help="Diretório dos pesos (padrão: cache do Whisper)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-seconds", type=float, default=MAX_AUDIO_SECONDS,
+                        help="Maior áudio aceito por requisição")
+    parser.add_argument("--stub", action="store_true", help="Usa modelo falso (o mesmo que --backend stub)")
+    metrics.add_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics.configure(args)
+
+    started_at = time.perf_counter()
+    setup_event_log("transcription", console=True)
+
+    backend = "stub" if args.stub else args.backend
+
+    def carregar():
+        return load_transcriber(backend, args.model, args.model_dir)
+
+    def aquecer(modelo):
+        modelo.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="pt")
+
+    loader = BackgroundModelLoader(carregar, None if backend == "stub" else aquecer,
+                                   started_at=started_at,
+                                   name="stub" if backend == "stub" else f"{args.model} ({backend})")
+
+    with TranscriptionServer(loader, args.host, args.port, args.max_seconds) as server:
+        host, port = server.address
+        log_event(log, "listening", f">>> Servidor de transcrição ouvindo em {host}:{port}",
+                  host=host, port=port, model=loader.name)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            log_event(log, "stopped", "\n>>> Servidor de transcrição encerrado.")
+        finally:
+            metrics.finish(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Detecção de atividade de voz (VAD) por energia e corte de silêncio.
+
+Calcula a energia RMS por frame de forma vetorizada e marca como fala os
+frames acima de um limiar adaptativo (piso de ruído + margem). Com isso:
+
+- Silêncio no início/fim (incluindo o warm-up do stream) é removido
+- Pausas longas no meio da fala são encurtadas
+- Clipes totalmente silenciosos são rejeitados antes do Whisper, evitando
+  alucinações que virariam comandos
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+Segment = Tuple[int, int]
+
+
+@dataclass
+class VadResult:
+    """Resultado do corte de silêncio."""
+
+    audio: np.ndarray
+    segments: List[Segment] = field(default_factory=list)
+    original_seconds: float = 0.0
+    kept_seconds: float = 0.0
+
+    @property
+    def is_silent(self) -> bool:
+        """True se nenhum trecho de fala foi detectado."""
+        return not self.segments
+
+    @property
+    def removed_seconds(self) -> float:
+        """Quantidade de áudio removida, em segundos."""
+        return self.original_seconds - self.kept_seconds
+
+
+def frame_energy_db(audio: np.ndarray, frame_len: int) -> np.ndarray:
+    """
+    Calcula a energia RMS (dBFS) de cada frame de ``frame_len`` amostras.
+
+    O último frame incompleto é descartado.
+    """
+    n_frames = len(audio) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = audio[:n_frames * frame_len].reshape(n_frames, frame_len)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+def detect_speech(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    frame_ms: int = 30,
+    margin_db: float = 12.0,
+    min_threshold_db: float = -50.0,
+    max_noise_floor_db: float = -45.0,
+    min_speech_ms: int = 120,
+    padding_ms: int = 150,
+    max_pause_ms: int = 600,
+) -> List[Segment]:
+    """
+    Detecta trechos de fala em um clipe mono.
+
+    Args:
+        audio: Amostras float32 mono
+        sample_rate: Taxa de amostragem
+        frame_ms: Tamanho do frame de análise
+        margin_db: Margem acima do piso de ruído para considerar fala
+        min_threshold_db: Limiar mínimo absoluto (clipes só com ruído baixo)
+        max_noise_floor_db: Teto do piso de ruído (clipes que são só fala)
+        min_speech_ms: Duração mínima de um trecho de fala
+        padding_ms: Margem preservada antes/depois de cada trecho
+        max_pause_ms: Pausas maiores que isso separam trechos
+
+    Returns:
+        Lista de (início, fim) em amostras, ordenada e sem sobreposição
+    """
+    frame_len = max(1, sample_rate * frame_ms // 1000)
+    energia = frame_energy_db(audio, frame_len)
+    if energia.size == 0:
+        return []
+
+    # Piso de ruído estimado pelos frames mais silenciosos do clipe; o teto
+    # evita que um clipe sem nenhuma pausa tenha a própria fala como piso
+    piso = min(float(np.percentile(energia, 10)), max_noise_floor_db)
+    limiar = max(piso + margin_db, min_threshold_db)
+    fala = energia > limiar
+    if not fala.any():
+        return []
+
+    # Bordas de subida/descida dos trechos ativos
+    bordas = np.diff(np.concatenate(([0], fala.astype(np.int8), [0])))
+    inicios = np.flatnonzero(bordas == 1)
+    fins = np.flatnonzero(bordas == -1)
+
+    max_pausa = max_pause_ms // frame_ms
+    min_fala = max(1, min_speech_ms // frame_ms)
+    pad = padding_ms // frame_ms
+
+    # Une trechos separados por pausas curtas
+    segmentos: List[List[int]] = []
+    for ini, fim in zip(inicios, fins):
+        if segmentos and ini - segmentos[-1][1] <= max_pausa:
+            segmentos[-1][1] = fim
+        else:
+            segmentos.append([ini, fim])
+
+    total_frames = len(energia)
+    resultado: List[Segment] = []
+    for ini, fim in segmentos:
+        if fim - ini < min_fala:
+            continue
+        ini = max(0, ini - pad)
+        fim = min(total_frames, fim + pad)
+        if resultado and ini * frame_len <= resultado[-1][1]:
+            resultado[-1] = (resultado[-1][0], int(fim) * frame_len)
+        else:
+            resultado.append((int(ini) * frame_len, int(fim) * frame_len))
+
+    # O último frame cobre também a sobra descartada no cálculo de energia
+    if resultado and resultado[-1][1] == total_frames * frame_len:
+        resultado[-1] = (resultado[-1][0], len(audio))
+    return resultado
+
+
+def trim_silence(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    keep_pause_ms: int = 300,
+    **kwargs,
+) -> VadResult:
+    """
+    Remove silêncio das bordas e encurta pausas longas de um clipe.
+
+    Args:
+        audio: Amostras float32 mono
+        sample_rate: Taxa de amostragem
+        keep_pause_ms: Silêncio inserido entre trechos separados por pausa longa
+        **kwargs: Parâmetros repassados a ``detect_speech``
+
+    Returns:
+        VadResult com o áudio resultante (view quando há um único trecho)
+    """
+    original = len(audio) / sample_rate
+    segmentos = detect_speech(audio, sample_rate, **kwargs)
+
+    if not segmentos:
+        return VadResult(audio[:0], [], original, 0.0)
+
+    if len(segmentos) == 1:
+        ini, fim = segmentos[0]
+        recortado = audio[ini:fim]
+    else:
+        pausa = np.zeros(sample_rate * keep_pause_ms // 1000, dtype=audio.dtype)
+        partes = []
+        for ini, fim in segmentos:
+            if partes:
+                partes.append(pausa)
+            partes.append(audio[ini:fim])
+        recortado = np.concatenate(partes)
+
+    return VadResult(recortado, segmentos, original, len(recortado) / sample_rate)
@@ -1,65 +1,187 @@
-import keyboard
+import time
+
+STARTED_AT = time.perf_counter()  # Início do processo, para medir o startup
+
 import sounddevice as sd
-import whisper
 import numpy as np
-import subprocess
 import os
+import sys
+from pathlib import Path
+
+# Permite importar o núcleo compartilhado em scripts_ativos/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from hotkey_core.audio_capture import AudioRingBuffer
+from hotkey_core.key_state import KeyWatcher
+from hotkey_core.model_loader import BackgroundModelLoader
+from hotkey_core.process_launcher import ProcessLauncher, claude_argv, default_backend
+from hotkey_core.streaming import StreamingTranscriber
+from hotkey_core.transcriber import DEFAULT_BACKEND, DEFAULT_MODEL, DEFAULT_MODEL_DIR, load_transcriber
+from hotkey_core.transcription_server import TranscriptionClient
+from hotkey_core.vad import trim_silence
 
 # --- CONFIGURAÇÃO ---
 HOTKEY = 'f9'         # Tecla que você vai segurar
-MODEL_TYPE = 'base'    # Modelo 'base' é rápido e excelente para PT-BR
+TRANSCRIBER_BACKEND = DEFAULT_BACKEND  # whisper, whisper-int8 (mais rápido na CPU) ou stub
+MODEL_TYPE = DEFAULT_MODEL    # 'base' é rápido e excelente para PT-BR
+MODEL_DIR = DEFAULT_MODEL_DIR  # Pesos locais (.pt), sem download
 SAMPLE_RATE = 16000   # Frequência nativa do Whisper
+MAX_RECORDING_SECONDS = 120  # Limite de segurança caso a tecla fique presa
+STREAMING = True      # Transcreve em janelas enquanto a tecla está pressionada
+STREAM_WINDOW_SECONDS = 5.0
+STREAM_OVERLAP_SECONDS = 1.0
+VAD = True            # Corta silêncio e ignora gravações sem fala
+USE_TRANSCRIPTION_SERVER = True  # Usa 0_transcription_server.py se estiver no ar
+TRANSCRIPTION_HOST = "127.0.0.1"
+TRANSCRIPTION_PORT = 8765
+TERMINAL_BACKEND = os.environ.get("CC_TERMINAL") or None  # Onde a sessão do Claude abre
+MAX_CONCURRENT_SESSIONS = 4
 # ---------------------
 
-print(f"Carregando IA Whisper (modelo {MODEL_TYPE})...")
-model = whisper.load_model(MODEL_TYPE)
-print(f"\n>>> SISTEMA PRONTO!")
-print(f">>> Segure [{HOTKEY.upper()}] em qualquer programa para falar com o Claude.")
+# Buffer de captura pré-alocado, reutilizado entre gravações
+audio_buffer = AudioRingBuffer(MAX_RECORDING_SECONDS, SAMPLE_RATE)
 
-def record_and_trigger():
-    recording = []
-    
-    # Callback para capturar o áudio continuamente
-    def callback(indata, frames, time, status):
-        recording.append(indata.copy())
+def carregar_modelo():
+    # Importa torch só na thread de carregamento
+    return load_transcriber(TRANSCRIBER_BACKEND, MODEL_TYPE, MODEL_DIR)
+
+def aquecer_modelo(modelo):
+    # Decode de 1s de silêncio para a primeira transcrição real não pagar o warm-up
+    modelo.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language="pt")
+
+def ao_encerrar_sessao(session):
+    if session.status == "failed":
+        print(f"Erro ao abrir Claude Code: {session.error}")
+
+# Sessões do Claude Code abertas em segundo plano (sem shell, argv em lista)
+process_launcher = ProcessLauncher(
+    default_backend(TERMINAL_BACKEND),
+    max_concurrent=MAX_CONCURRENT_SESSIONS,
+    on_exit=ao_encerrar_sessao,
+)
+
+def abrir_claude(text):
+    # O texto falado vai como um único argumento: &, | e aspas não viram
+    # sintaxe de shell, e a hotkey não espera a janela abrir
+    session = process_launcher.launch(claude_argv(text), title="Claude Code - Push-to-Talk")
+    if session is None:
+        print(f"Aviso: {MAX_CONCURRENT_SESSIONS} sessões do Claude Code já abertas, comando ignorado.")
+
+# Backend de transcrição, definido por iniciar_modelo() no startup
+model = None
+
+def modelo_local():
+    print(f"Carregando IA Whisper (modelo {MODEL_TYPE}, {TRANSCRIBER_BACKEND}) em background...")
+    return BackgroundModelLoader(carregar_modelo, aquecer_modelo, started_at=STARTED_AT)
+
+def iniciar_modelo():
+    global model
+    if USE_TRANSCRIPTION_SERVER:
+        # Se o servidor cair depois, o cliente passa a usar o modelo local
+        cliente = TranscriptionClient(TRANSCRIPTION_HOST, TRANSCRIPTION_PORT, fallback=modelo_local)
+        if cliente.ping():
+            print(f"Usando servidor de transcrição em {TRANSCRIPTION_HOST}:{TRANSCRIPTION_PORT}")
+            model = cliente
+            return
+        print("Aviso: servidor de transcrição não encontrado, carregando modelo local.")
+
+    model = modelo_local()
+
+def record_and_trigger(watcher):
+    streamer = None
+    audio_buffer.reset()
+    # Callback para capturar o áudio continuamente (escreve direto no buffer)
+    callback = audio_buffer.callback
+
+    # No modo streaming as janelas já são transcritas durante a gravação
+    if STREAMING:
+        streamer = StreamingTranscriber(
+            model.transcribe,
+            sample_rate=SAMPLE_RATE,
+            window_seconds=STREAM_WINDOW_SECONDS,
+            overlap_seconds=STREAM_OVERLAP_SECONDS,
+            language="pt",
+            ring=audio_buffer,
+            vad=VAD,
+        )
+        callback = streamer.callback
 
     print("\n[Ouvindo...] Solte a tecla para enviar.")
     
     # Inicia a captura do microfone
     with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, callback=callback):
-        while keyboard.is_pressed(HOTKEY):
-            pass # Fica aqui enquanto a tecla estiver pressionada
-            
-    print("[Processando...] Transcrevendo áudio...")
-    
-    # Converte a lista de áudio capturado para o formato da IA
-    if not recording:
-        print("Erro: Nenhum áudio capturado.")
+        # Bloqueia até a tecla ser solta (sem ocupar a CPU)
+        if not watcher.wait_release():
+            print(f"Aviso: gravação encerrada após {MAX_RECORDING_SECONDS}s.")
+
+    if watcher.cancelled:
+        # Plugin parando: a gravação incompleta não é transcrita
+        if streamer:
+            streamer.cancel()
         return
 
-    audio_data = np.concatenate(recording).flatten().astype(np.float32)
+    print("[Processando...] Transcrevendo áudio...")
     
-    # Transcrição (Whisper detecta automaticamente que é português)
-    result = model.transcribe(audio_data, language="pt")
-    text = result["text"].strip()
+    if streamer:
+        # Resta apenas a última janela
+        text = streamer.finish()
+        if VAD:
+            print(f"[VAD] {streamer.vad_removed_seconds:.1f}s de silêncio ignorados.")
+    else:
+        if not len(audio_buffer):
+            print("Erro: Nenhum áudio capturado.")
+            return
+
+        # View contígua do áudio capturado, já no formato da IA (float32)
+        audio_data = audio_buffer.view()
+
+        # Remove silêncio das bordas; clipes sem fala não vão para o Whisper
+        if VAD:
+            vad = trim_silence(audio_data, SAMPLE_RATE)
+            if vad.is_silent:
+                print("Aviso: Nenhuma fala detectada.")
+                return
+            print(f"[VAD] {vad.removed_seconds:.1f}s de silêncio removidos "
+                  f"({vad.original_seconds:.1f}s -> {vad.kept_seconds:.1f}s).")
+            audio_data = vad.audio
+        
+        # Transcrição (Whisper detecta automaticamente que é português)
+        result = model.transcribe(audio_data, language="pt")
+        text = result["text"].strip()
     
     if text:
         print(f"[Comando Identificado]: \"{text}\"")
         print("[Executando] Abrindo Claude Code em nova janela...")
-        
-        # Comando para abrir uma NOVA janela de CMD e rodar o Claude
-        # O 'start cmd /k' garante que a janela não feche após o comando
-        # Usa --dangerously-skip-permissions para execução direta sem prompts de permissão
-        full_command = f'start cmd /k "claude --dangerously-skip-permissions \"{text}\""'
-        subprocess.run(full_command, shell=True)
+        abrir_claude(text)
     else:
         print("Aviso: Não entendi o que você disse.")
 
 def main():
+    iniciar_modelo()
+    watcher = KeyWatcher(HOTKEY, max_hold_seconds=MAX_RECORDING_SECONDS)
+    print(f"\n>>> SISTEMA PRONTO! (hotkey armada em {time.perf_counter() - STARTED_AT:.2f}s)")
+    print(f">>> Segure [{HOTKEY.upper()}] em qualquer programa para falar com o Claude.")
     while True:
         # Espera o próximo pressionamento da tecla configurada
-        keyboard.wait(HOTKEY)
-        record_and_trigger()
+        watcher.wait_press()
+        record_and_trigger(watcher)
+        watcher.wait_idle()
+
+def plugin_main(ctx):
+    # Dentro do supervisor (5_supervisor.py): teclado e Whisper compartilhados
+    global model
+    model = ctx.transcriber
+    ctx.transcriber.get()
+    watcher = KeyWatcher(HOTKEY, source=ctx.keys, max_hold_seconds=MAX_RECORDING_SECONDS)
+    ctx.on_stop(watcher.cancel)  # Parar no meio de uma gravação não espera a tecla
+    ctx.mark_ready()
+    try:
+        while not ctx.stopping.is_set():
+            if not watcher.wait_press(timeout=0.5):
+                continue
+            record_and_trigger(watcher)
+            watcher.wait_idle()
+    finally:
+        watcher.close()
 
 if __name__ == "__main__":
     try: